@@ -0,0 +1,87 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Fix import path (run from anywhere: python benchmarks/bench_agent_log_sink.py)
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+# Throwaway database; must be set before src.database.db is imported
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+
+from sqlalchemy import func, select
+
+from src.database.db import AgentLog, AsyncSessionLocal, Base, async_engine, engine
+from src.services.agent_log_service import AgentLogSink, BatchedAgentLogSink
+from src.zynd.interceptors import AgentCallRecord
+
+EMERGENCIES = 250
+CALLS_PER_EMERGENCY = 4   # triage, hospital, routing, notification
+
+
+def make_record(emergency_id: int, n: int) -> AgentCallRecord:
+    return AgentCallRecord(
+        did="did:zynd:agent_triage_abc123",
+        agent_type="triage",
+        agent_name="Triage Agent",
+        emergency_id=emergency_id,
+        action="execute",
+        input_data={"symptoms": "chest pain", "age": "60+", "n": n},
+        output_data={"severity": "RED", "priority": 1},
+        processing_time_ms=0.4,
+        success=True,
+    )
+
+
+async def count_rows() -> int:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(func.count(AgentLog.id)))).scalar_one()
+
+
+async def run(sink, label: str) -> dict:
+    before = await count_rows()
+    if hasattr(sink, "start"):
+        await sink.start()
+
+    emit_s = 0.0
+    started = time.perf_counter()
+    for emergency_id in range(EMERGENCIES):
+        for n in range(CALLS_PER_EMERGENCY):
+            t = time.perf_counter()
+            await sink.emit(make_record(emergency_id, n))
+            emit_s += time.perf_counter() - t
+
+    if hasattr(sink, "stop"):
+        await sink.stop()
+    total_s = time.perf_counter() - started
+    calls = EMERGENCIES * CALLS_PER_EMERGENCY
+    return {
+        "label": label,
+        "emit_us": emit_s / calls * 1e6,
+        "total_ms": total_s * 1000,
+        "rows": await count_rows() - before,
+    }
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    calls = EMERGENCIES * CALLS_PER_EMERGENCY
+    print(f"📝 Agent log sinks: {EMERGENCIES} emergencies x {CALLS_PER_EMERGENCY} agent calls = {calls} rows")
+    print("=" * 70)
+    print(f"{'sink':<26} | {'emit() per call':>15} | {'all rows durable':>16} | {'rows':>5}")
+    print("-" * 70)
+    results = [
+        await run(AgentLogSink(), "row per call (commit each)"),
+        await run(BatchedAgentLogSink(batch_size=200, flush_interval_ms=50), "batched (200 rows / 50ms)"),
+    ]
+    for r in results:
+        print(f"{r['label']:<26} | {r['emit_us']:>12.1f} µs | {r['total_ms']:>13.1f} ms | {r['rows']:>5}")
+    print(f"\n⚡ Caller-side cost per agent call: {results[0]['emit_us'] / results[1]['emit_us']:.0f}x lower when batched")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
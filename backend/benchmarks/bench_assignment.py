@@ -0,0 +1,86 @@
+import os
+import sys
+import random
+
+import numpy as np
+
+# Fix import path (run from anywhere: python benchmarks/bench_assignment.py)
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from src.services.assignment_solver import plan_assignments
+from src.services.distance_engine import DistanceEngine
+
+SPECIALISTS = ["cardiologist", "emergency_physician", "trauma_surgeon", "general_physician", "neurologist"]
+NEEDS = {
+    "RED": [["trauma_surgeon"], ["cardiologist", "emergency_physician"]],
+    "YELLOW": [["general_physician"]],
+    "GREEN": [["general_physician"]],
+}
+
+
+def make_hospitals(n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    hospitals = []
+    for i in range(n):
+        specialists = {"general_physician"} | set(rng.sample(SPECIALISTS, rng.randint(1, 4)))
+        hospitals.append({
+            "id": f"h{i}",
+            "lat": rng.uniform(28.45, 28.85),
+            "lng": rng.uniform(76.95, 77.40),
+            "icu_beds_available": rng.randint(0, 6),
+            "emergency_beds_available": rng.randint(2, 15),
+            "specialists": sorted(specialists),
+        })
+    return hospitals
+
+
+def make_patients(n: int, seed: int, site=(28.63, 77.21)) -> tuple:
+    """A mass-casualty site: everyone within ~1.5 km, mostly RED/YELLOW."""
+    rng = random.Random(seed)
+    patients, points = [], []
+    for _ in range(n):
+        severity = rng.choices(["RED", "YELLOW", "GREEN"], weights=[4, 4, 2])[0]
+        patients.append({"severity": severity, "recommended_specialists": rng.choice(NEEDS[severity])})
+        points.append((site[0] + rng.uniform(-0.01, 0.01), site[1] + rng.uniform(-0.01, 0.01)))
+    return patients, points
+
+
+def describe(plan) -> str:
+    eta = plan.eta_min[~np.isnan(plan.eta_min)]
+    p95 = np.percentile(eta, 95) if eta.size else float("nan")
+    return (f"{len(eta):>4} placed | total {plan.total_eta_min:>8.0f} min | "
+            f"mean {eta.mean() if eta.size else float('nan'):>5.1f} | p95 {p95:>5.1f} | {plan.solve_ms:>7.1f} ms")
+
+
+def run():
+    print("🧮 Mass-casualty placement: per-emergency greedy vs global min-cost assignment")
+    print("   (straight-line ETAs; patients in arrival order, RED needs ICU, YELLOW an emergency bed)")
+    print("=" * 96)
+
+    for n_patients, n_hospitals in ((50, 20), (200, 40), (500, 60)):
+        hospitals = make_hospitals(n_hospitals, seed=n_hospitals)
+        patients, points = make_patients(n_patients, seed=n_patients)
+        engine = DistanceEngine(hospitals)
+        eta = engine.batch_distances_km(points) / engine.avg_speed_kmh * 60
+
+        greedy = plan_assignments(patients, hospitals, eta, method="greedy")
+        optimal = plan_assignments(patients, hospitals, eta, method="min_cost")
+
+        icu = sum(h["icu_beds_available"] for h in hospitals)
+        red = sum(p["severity"] == "RED" for p in patients)
+        print(f"{n_patients} patients x {n_hospitals} hospitals ({red} RED for {icu} ICU beds)")
+        print(f"   greedy   {describe(greedy)}")
+        print(f"   min-cost {describe(optimal)}")
+        saved = greedy.total_eta_min - optimal.total_eta_min
+        print(f"   -> {optimal.unassigned - greedy.unassigned:+d} unplaced, "
+              f"{saved:,.0f} patient-minutes saved over greedy")
+
+        # The solver never places fewer patients, and never costs more for the same count
+        assert optimal.unassigned <= greedy.unassigned
+        if optimal.unassigned == greedy.unassigned:
+            assert optimal.total_eta_min <= greedy.total_eta_min + 1e-6
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,120 @@
+import os
+import sys
+import asyncio
+import statistics
+import tempfile
+import time
+
+# Fix import path (run from anywhere: python benchmarks/bench_db_event_loop.py)
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database.db import Base, Emergency
+
+REQUESTS = 200          # simulated requests, each: insert + commit + read back
+CONCURRENCY = 20        # requests in flight at once
+TICK_S = 0.001          # heartbeat interval used to measure event-loop lag
+
+
+def new_emergency(i: int) -> Emergency:
+    return Emergency(
+        latitude=28.6 + i * 1e-4,
+        longitude=77.2,
+        symptoms=["chest pain"],
+        age_group="60+",
+        status="REGISTERED",
+    )
+
+
+async def heartbeat(lags: list, stop: asyncio.Event):
+    """Sleeps TICK_S repeatedly; any extra delay is time the loop was blocked."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append(time.perf_counter() - start - TICK_S)
+
+
+async def sync_request(SessionLocal, i: int):
+    # What the routes did before: sync Session calls inside `async def`
+    db = SessionLocal()
+    try:
+        emergency = new_emergency(i)
+        db.add(emergency)
+        db.commit()
+        db.refresh(emergency)
+        db.get(Emergency, emergency.id)
+    finally:
+        db.close()
+    await asyncio.sleep(0)
+
+
+async def async_request(AsyncSessionLocal, i: int):
+    async with AsyncSessionLocal() as db:
+        emergency = new_emergency(i)
+        db.add(emergency)
+        await db.commit()
+        await db.refresh(emergency)
+        await db.get(Emergency, emergency.id)
+
+
+async def run_case(name: str, request_fn, factory) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(i):
+        async with semaphore:
+            await request_fn(factory, i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "name": name,
+        "elapsed_s": elapsed,
+        "ticks": len(lags),
+        "lag_p50": statistics.median(lags_ms),
+        "lag_p99": lags_ms[int(len(lags_ms) * 0.99) - 1 if len(lags_ms) > 1 else 0],
+        "lag_max": lags_ms[-1],
+    }
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=sync_engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+        SessionLocal = sessionmaker(bind=sync_engine, autoflush=False)
+        AsyncSessionLocal = async_sessionmaker(
+            async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+
+        results = [
+            await run_case("sync Session (before)", sync_request, SessionLocal),
+            await run_case("AsyncSession (after)", async_request, AsyncSessionLocal),
+        ]
+        await async_engine.dispose()
+        sync_engine.dispose()
+
+    print(f"⏱️  Event-loop lag with {REQUESTS} DB requests, {CONCURRENCY} in flight")
+    print("=" * 78)
+    print(f"{'case':<24} | {'total':>8} | {'ticks':>6} | {'lag p50':>9} | {'lag p99':>9} | {'lag max':>9}")
+    print("-" * 78)
+    for r in results:
+        print(f"{r['name']:<24} | {r['elapsed_s']:>6.2f} s | {r['ticks']:>6} | "
+              f"{r['lag_p50']:>6.2f} ms | {r['lag_p99']:>6.2f} ms | {r['lag_max']:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
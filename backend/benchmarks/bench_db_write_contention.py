@@ -0,0 +1,88 @@
+import os
+import sys
+import multiprocessing as mp
+import tempfile
+import time
+
+# Fix import path (run from anywhere: python benchmarks/bench_db_write_contention.py)
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.database.db import Base, Emergency, create_db_engine
+
+WORKERS = 4             # simulated uvicorn worker processes
+DURATION_S = 3.0
+WRITE_SHARE = 0.5       # half the requests are /api/triage inserts, half status-poll updates
+
+
+def worker(url: str, profile: str, worker_id: int, results):
+    engine = create_db_engine(url, profile)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    commits = locked = 0
+    deadline = time.perf_counter() + DURATION_S
+    i = 0
+
+    while time.perf_counter() < deadline:
+        i += 1
+        db = SessionLocal()
+        try:
+            if (i % 100) / 100 < WRITE_SHARE:
+                db.add(Emergency(
+                    latitude=28.6, longitude=77.2, symptoms=["fever"],
+                    age_group="19-60", status="REGISTERED",
+                ))
+            else:
+                # Status poll: read the latest row and bump its status
+                emergency = db.query(Emergency).order_by(Emergency.id.desc()).first()
+                if emergency is not None:
+                    emergency.status = "PROCESSING"
+            db.commit()
+            commits += 1
+        except OperationalError:
+            db.rollback()
+            locked += 1
+        finally:
+            db.close()
+
+    engine.dispose()
+    results.put((worker_id, commits, locked))
+
+
+def run_profile(profile: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        setup = create_db_engine(url, profile)
+        Base.metadata.create_all(bind=setup)
+        setup.dispose()
+
+        results = mp.Queue()
+        procs = [
+            mp.Process(target=worker, args=(url, profile, n, results))
+            for n in range(WORKERS)
+        ]
+        for p in procs:
+            p.start()
+        rows = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+
+    commits = sum(r[1] for r in rows)
+    locked = sum(r[2] for r in rows)
+    return {"profile": profile, "commits": commits, "locked": locked,
+            "per_s": commits / DURATION_S}
+
+
+if __name__ == "__main__":
+    print(f"🔒 SQLite write contention: {WORKERS} processes, {DURATION_S:.0f}s each")
+    print("=" * 64)
+    print(f"{'profile':<12} | {'commits':>8} | {'commits/s':>10} | {'lock errors':>11}")
+    print("-" * 64)
+    baseline = None
+    for profile in ("development", "production"):
+        r = run_profile(profile)
+        baseline = baseline or r["per_s"]
+        print(f"{r['profile']:<12} | {r['commits']:>8} | {r['per_s']:>10.0f} | {r['locked']:>11}"
+              + (f"   ({r['per_s'] / baseline:.1f}x)" if r["profile"] != "development" else ""))
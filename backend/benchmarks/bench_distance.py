@@ -0,0 +1,72 @@
+import os
+import sys
+import random
+import time
+
+# Fix import path (run from anywhere: python benchmarks/bench_distance.py)
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from src.api.routes import calculate_distance, calculate_eta
+from src.services.distance_engine import DistanceEngine
+
+
+def make_hospitals(n: int) -> list:
+    rng = random.Random(n)
+    return [
+        {"id": i, "lat": rng.uniform(28.4, 28.9), "lng": rng.uniform(76.8, 77.5)}
+        for i in range(n)
+    ]
+
+
+def loop_nearest(hospitals: list, lat: float, lng: float, k: int) -> list:
+    """The old per-request loop from routes.py: scalar haversine + ETA, then sort."""
+    results = []
+    for hospital in hospitals:
+        distance = calculate_distance(lat, lng, hospital["lat"], hospital["lng"])
+        results.append((distance, calculate_eta(distance), hospital["id"]))
+    results.sort(key=lambda x: x[0])
+    return results[:k]
+
+
+def engine_nearest(engine: DistanceEngine, lat: float, lng: float, k: int):
+    idx, distances = engine.nearest(lat, lng, k)
+    return idx, engine.eta_minutes(distances)
+
+
+def timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run():
+    lat, lng, k = 28.6289, 77.2065, 5
+    print("📏 Distance/ETA: per-hospital loop vs vectorized engine (top-5)")
+    print("=" * 72)
+    print(f"{'hospitals':>10} | {'loop':>12} | {'engine':>12} | {'speed-up':>8} | {'batch 100 pts':>14}")
+    print("-" * 72)
+
+    for n in (10, 1_000, 100_000):
+        hospitals = make_hospitals(n)
+        engine = DistanceEngine(hospitals)
+        repeat = max(3, 20_000 // n)
+
+        loop_s = timeit(lambda: loop_nearest(hospitals, lat, lng, k), repeat)
+        engine_s = timeit(lambda: engine_nearest(engine, lat, lng, k), repeat)
+
+        points = [(lat + i * 1e-3, lng - i * 1e-3) for i in range(100)]
+        batch_s = timeit(lambda: engine.batch_nearest(points, k), max(1, repeat // 10))
+
+        print(f"{n:>10,} | {loop_s * 1e3:>9.3f} ms | {engine_s * 1e3:>9.3f} ms | "
+              f"{loop_s / engine_s:>7.1f}x | {batch_s * 1e3:>11.3f} ms")
+
+        # Sanity check: same top-k distances (the loop rounds to 0.1 km, so ids may tie)
+        loop_km = [d for d, _, _ in loop_nearest(hospitals, lat, lng, k)]
+        engine_km = [round(float(d), 1) for d in engine.nearest(lat, lng, k)[1]]
+        assert loop_km == engine_km, (loop_km, engine_km)
+
+
+if __name__ == "__main__":
+    run()
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict
 
 
 class Settings(BaseSettings):
@@ -9,6 +10,92 @@ class Settings(BaseSettings):
     
     # OSRM (Maps)
     osrm_server: str = "http://router.project-osrm.org"
+    routing_backend: str = "osrm"            # "osrm" or "local" (offline, in-process)
+    local_osm_path: str = ""                 # .osm / .osm.gz / .osm.bz2 extract
+    local_graph_path: str = "./routing_graph.pickle"  # preprocessed graph cache
+
+    # Outbound HTTP (shared client used by MapsService)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_s: float = 30.0
+    http2_enabled: bool = False              # needs the `h2` package
+    http_connect_timeout_s: float = 3.0
+    osrm_timeout_s: float = 5.0
+    nominatim_timeout_s: float = 5.0
+
+    # Per-candidate routing fan-out (used when a /table request is unavailable)
+    route_fanout_concurrency: int = 5        # max in-flight route requests per emergency
+    route_call_timeout_s: float = 4.0        # slower candidates are dropped
+
+    # Route cache (origin snapped to a grid, destination exact)
+    route_cache_enabled: bool = True
+    route_cache_grid_deg: float = 0.001      # ~110 m
+    route_cache_ttl_s: float = 300.0         # keep traffic-sensitive results short-lived
+    route_cache_max_entries: int = 10000
+
+    # Reverse-geocode cache (in-memory LRU in front of a shared SQLite file)
+    geocode_cache_enabled: bool = True
+    geocode_cache_path: str = "./geocode_cache.db"
+    geocode_cache_precision: int = 8         # geohash chars, ~38 m x 19 m cells
+    geocode_cache_memory_entries: int = 5000
+    geocode_cache_ttl_s: float = 30 * 24 * 3600
+
+    # Hospital search
+    hospital_index_cell_deg: float = 0.05   # spatial grid cell size (~5 km)
+    hospital_search_k: int = 10             # nearest eligible hospitals sent to routing
+    hospital_registry_poll_s: float = 5.0   # snapshot staleness check; 0 disables polling
+
+    # Bed reservations
+    bed_reservation_ttl_s: float = 900      # hold released if not confirmed in time
+    bed_reservation_max_retries: int = 5    # optimistic-update attempts on version conflict
+    bed_reservation_sweep_s: float = 30     # expired-hold sweep interval; 0 disables
+
+    # Triage rules (YAML/JSON); empty path = bundled src/agents/triage_rules.yaml
+    triage_rules_path: str = ""
+    symptom_lexicon_path: str = ""          # empty = bundled src/agents/symptom_lexicon.yaml
+    triage_rules_reload_s: float = 2.0      # rules/lexicon mtime check interval; 0 disables hot reload
+
+    # Batch triage: place the whole batch on hospitals with the global assignment solver
+    batch_assignment_enabled: bool = True
+    batch_eta_concurrency: int = 20         # table requests in flight while building the ETA matrix
+    batch_plan_timeout_s: float = 10.0      # past this, patients are dispatched without a plan
+
+    # Orchestrator scheduler
+    scheduler_workers: int = 8              # emergencies orchestrated concurrently
+    scheduler_severity_concurrency: Dict[str, int] = {"RED": 8, "YELLOW": 4, "GREEN": 2}
+    scheduler_aging_s: float = 30           # waiting this long promotes a job one priority level
+    scheduler_drain_timeout_s: float = 10   # shutdown grace period for queued jobs
+
+    # Agent transports: where each DID's handler runs ("inline", "thread", "process", "bus")
+    agent_transports: Dict[str, str] = {}   # e.g. {"did:zynd:agent_triage_abc123": "process"}
+    agent_thread_workers: int = 4
+    agent_process_workers: int = 2
+
+    # Local Zynd bus (python -m src.zynd.bus broker|worker) for the "bus" transport
+    zynd_bus_socket: str = "/tmp/zynd-bus.sock"
+    zynd_bus_heartbeat_s: float = 2.0       # worker -> broker liveness ping
+    zynd_bus_worker_timeout_s: float = 6.0  # broker drops workers silent for this long
+    zynd_bus_call_timeout_s: float = 30.0
+
+    # WebSocket hub (/ws/emergency, /ws/hospital, /ws/dispatcher)
+    ws_send_queue_size: int = 100           # pending messages per connection (soft limit, see WebSocketHub)
+    ws_send_queue_hard_limit: int = 1000    # pending messages that mark a client slow however fresh they are
+    ws_send_timeout_s: float = 5.0          # a single send stalled this long evicts the client
+    ws_slow_consumer: str = "evict"         # full queue: "evict" (close 1013) or "drop_oldest"
+
+    # Agent call logging (agent_logs table)
+    agent_log_enabled: bool = True
+    agent_log_queue_size: int = 10000       # pending rows before the overflow policy applies
+    agent_log_batch_size: int = 200         # rows per bulk INSERT
+    agent_log_flush_ms: float = 250         # max delay before a partial batch is written
+    agent_log_overflow: str = "drop"        # "drop", "block" or "sample"
+    agent_log_sample_every: int = 10        # "sample": keep 1 in N rows while the queue is over half full
+
+    # Emergency pipeline: per-stage timeouts in seconds (missing = no timeout)
+    pipeline_stage_timeout_s: Dict[str, float] = {
+        "triage": 5, "geocode": 8, "prefilter": 8,
+        "hospital": 10, "routing": 15, "notify": 30,
+    }
     
     # Email Settings (Gmail)
     smtp_server: str = "smtp.gmail.com"
@@ -1,6 +1,17 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from src.api import routes
+from src.services.maps_service import maps_service
+from src.services.hospital_registry import hospital_registry
+from src.orchestrator.scheduler import scheduler
+from src.services.agent_log_service import batched_agent_log_sink
+from src.zynd.mock_zynd import timing_interceptor, zynd_registry
+from config import get_settings
+from src.database.db import async_engine, init_db
+from src.services.metrics import HTTP_LATENCY, HTTP_REQUESTS, install_db_commit_metrics, metrics
 import uvicorn
 
 # Import websocket only if it exists
@@ -11,10 +22,41 @@ except ImportError:
     HAS_WEBSOCKET = False
     print("⚠️  WebSocket module not found, skipping...")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client per process for OSRM / Nominatim
+    await maps_service.startup()
+    # Tables and columns added since the DB file was created (hospitals.version,
+    # bed_reservations); without them the registry can't load or hold beds
+    await asyncio.to_thread(init_db)
+    # Hospital snapshot every endpoint/agent reads instead of querying the DB
+    await hospital_registry.start()
+    # Per-agent latency/outcome rows for every registry call, written in batches
+    if get_settings().agent_log_enabled:
+        await batched_agent_log_sink.start()
+        timing_interceptor.add_sink(batched_agent_log_sink)
+    # Priority worker pool that runs orchestrator work off the request path
+    await scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop(get_settings().scheduler_drain_timeout_s)
+        timing_interceptor.remove_sink(batched_agent_log_sink)
+        await batched_agent_log_sink.stop()
+        zynd_registry.shutdown()
+        if HAS_WEBSOCKET:
+            await websocket.hub.shutdown()
+        await hospital_registry.stop()
+        await maps_service.shutdown()
+        await async_engine.dispose()
+
+
 app = FastAPI(
     title="Golden Hour Response System",
     description="AI-powered emergency response backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS - Allow frontend to connect
@@ -26,6 +68,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Commit latency for every ORM session (sync scripts and async routes)
+install_db_commit_metrics()
+
+
+def _route_template(request: Request) -> str:
+    """Matched route as a template, e.g. /api/hospitals/{emergency_id}."""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Included routers may report their path without the include prefix
+    rendered = route.path_format.format(**request.scope.get("path_params", {}))
+    path = request.scope["path"]
+    prefix = path[: -len(rendered)] if rendered and path.endswith(rendered) else ""
+    return prefix + route.path
+
+
+# Latency/status per route template (not raw path, to keep label cardinality bounded)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = _route_template(request)
+        HTTP_LATENCY.observe(time.perf_counter() - started, request.method, route)
+        HTTP_REQUESTS.inc(request.method, route, str(status))
+
+
 # Include REST API routes - FIXED: Changed prefix to /api (removing /v1)
 app.include_router(routes.router, prefix="/api")
 
@@ -41,6 +114,10 @@ async def root():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health():
     return {
@@ -51,6 +128,11 @@ async def health():
             "ambulance": "/api/ambulance/{emergency_id}",
             "selected_hospital": "/api/hospitals/{emergency_id}/selected",
             "status": "/api/status/{emergency_id}",
+            "scheduler": "/api/scheduler/stats",
+            "ws_emergency": "/ws/emergency/{emergency_id}",
+            "ws_hospital": "/ws/hospital/{hospital_id}",
+            "ws_dispatcher": "/ws/dispatcher",
+            "ws_stats": "/ws/stats",
             "notify": "/api/notify"
         }
     }
@@ -1,7 +1,12 @@
+from config import get_settings
 from src.agents.base_agent import BaseAgent
+from src.services.hospital_registry import hospital_registry
 from src.services.maps_service import maps_service
+from src.services.spatial_index import HospitalIndex, hospital_coords
 from src.zynd.mock_zynd import zynd_registry
 
+settings = get_settings()
+
 
 class HospitalAgent(BaseAgent):
     """Agent to select hospitals based on severity, availability, and distance."""
@@ -12,40 +17,53 @@ class HospitalAgent(BaseAgent):
             name="Hospital Agent"
         )
 
+    @staticmethod
+    def _is_eligible(hospital: dict, severity: str, required_specialists: list) -> bool:
+        if severity == "RED" and hospital.get("icu_beds_available", 0) < 1:
+            return False
+        elif severity == "YELLOW" and hospital.get("emergency_beds_available", 0) < 1:
+            return False
+
+        return all(
+            spec in hospital.get("specialists", [])
+            for spec in required_specialists
+        )
+
     async def find_suitable_hospitals(
         self,
         severity: str,
         location: tuple,
         required_specialists: list,
-        hospital_db: list,
+        hospital_db: list = None,
     ):
-        suitable_hospitals = []
+        # An explicit hospital_db gets a throwaway index; otherwise the current
+        # registry snapshot (no DB round-trip) is searched.
+        index = hospital_registry.snapshot.index if hospital_db is None else HospitalIndex(
+            hospital_db, cell_size_deg=settings.hospital_index_cell_deg
+        )
+        candidates = index.nearest(
+            location,
+            k=settings.hospital_search_k,
+            predicate=lambda h: self._is_eligible(h, severity, required_specialists),
+        )
 
-        for hospital in hospital_db:
-            if severity == "RED" and hospital.get("icu_beds_available", 0) < 1:
-                continue
-            elif severity == "YELLOW" and hospital.get("emergency_beds_available", 0) < 1:
-                continue
+        # One /table request for every candidate instead of a route call each.
+        route_matrix = await maps_service.get_route_matrix(
+            location, [hospital_coords(h) for _, h in candidates]
+        )
 
-            has_specialists = all(
-                spec in hospital.get("specialists", [])
-                for spec in required_specialists
-            )
-            if not has_specialists:
-                continue
+        suitable_hospitals = []
 
-            route_info = await maps_service.get_route_details(
-                location, hospital["coords"]
-            )
+        for (_, hospital), route_info in zip(candidates, route_matrix):
             if not route_info:
                 continue
 
-            hospital_copy = hospital.copy()
+            hospital_copy = dict(hospital)
             hospital_copy.update(
                 {
                     "distance_km": route_info["distance_km"],
                     "eta_minutes": route_info["duration_min"],
-                    "has_specialists": has_specialists,
+                    "has_specialists": True,
                 }
             )
 
@@ -66,7 +84,7 @@ class HospitalAgent(BaseAgent):
             severity=payload["severity"],
             location=payload["location"],
             required_specialists=payload["required_specialists"],
-            hospital_db=payload["hospital_db"],
+            hospital_db=payload.get("hospital_db"),
         )
 
 
@@ -76,4 +94,4 @@ hospital_agent = HospitalAgent()
 async def _hospital_handler(payload: dict):
     return await hospital_agent.execute(payload)
 
-zynd_registry.register_agent(hospital_agent.did, _hospital_handler)
+zynd_registry.register_agent(hospital_agent.did, _hospital_handler, name=hospital_agent.name)
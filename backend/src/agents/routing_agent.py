@@ -1,30 +1,47 @@
+import asyncio
+
+from config import get_settings
 from src.services.maps_service import maps_service
 from src.zynd.mock_zynd import zynd_registry
 
+settings = get_settings()
+
 
 class RoutingAgent:
     did = "did:zynd:agent_routing_def456"
     name = "Routing Agent"
 
     async def find_best_hospital(self, emergency_location: tuple, hospitals: list):
-        evaluated_hospitals = []
+        route_matrix = await maps_service.get_route_matrix(
+            emergency_location, [hospital["coords"] for hospital in hospitals]
+        )
 
-        for hospital in hospitals:
-            route_info = await maps_service.get_route_details(
-                emergency_location, hospital["coords"]
-            )
+        ranked = sorted(
+            (
+                (route_info["duration_min"], index)
+                for index, route_info in enumerate(route_matrix)
+                if route_info
+            ),
+        )
 
+        # Full geometry is only needed for the winner; fall through to the
+        # next-fastest hospital if its route lookup fails or times out.
+        for _, index in ranked:
+            hospital = hospitals[index]
+            try:
+                route_info = await asyncio.wait_for(
+                    maps_service.get_route_details(emergency_location, hospital["coords"]),
+                    settings.route_call_timeout_s,
+                )
+            except asyncio.TimeoutError:
+                print(f"⏱️  Route to {hospital.get('name', hospital.get('id'))} timed out")
+                continue
             if route_info:
                 hospital_data = hospital.copy()
                 hospital_data["route_info"] = route_info
-                evaluated_hospitals.append(hospital_data)
-
-        evaluated_hospitals.sort(key=lambda x: x["route_info"]["duration_min"])
-
-        if not evaluated_hospitals:
-            return None
+                return hospital_data
 
-        return evaluated_hospitals[0]
+        return None
 
     async def execute(self, payload: dict):
         return await self.find_best_hospital(
@@ -37,4 +54,4 @@ routing_agent = RoutingAgent()
 async def _routing_handler(payload: dict):
     return await routing_agent.execute(payload)
 
-zynd_registry.register_agent(routing_agent.did, _routing_handler)
+zynd_registry.register_agent(routing_agent.did, _routing_handler, name=routing_agent.name)
@@ -0,0 +1,209 @@
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+import yaml
+from pydantic import BaseModel, Field
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TOKEN = re.compile(r"[a-z0-9]+|[.,;:!?\n]")
+# A comma also ends a negation's scope: "no idea what happened, chest pain"
+_CLAUSE_BREAK = frozenset(".,;:!?\n")
+
+# automaton payload kinds
+SYMPTOM, NEG_PRE, NEG_POST, PSEUDO, TERMINATOR = "symptom", "pre", "post", "pseudo", "terminator"
+
+
+def symptom_code(text: str) -> str:
+    """"Chest-Pain" / "chest pain" / "chest_pain" -> "chest_pain"."""
+    return "_".join(_WORD.findall(text.lower()))
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    return tuple(_WORD.findall(text.lower()))
+
+
+# ---------------------------------------------------------------- schema
+
+class NegationConfig(BaseModel):
+    pre: List[str] = []           # "no chest pain"
+    post: List[str] = []          # "chest pain ruled out"
+    pseudo: List[str] = []        # look like triggers but negate nothing: "not sure", "no idea"
+    terminators: List[str] = []   # end a negation's scope: "no fever but chest pain"
+    window: int = Field(5, ge=1)  # words a trigger reaches
+
+
+class SymptomLexicon(BaseModel):
+    negation: NegationConfig = NegationConfig()
+    symptoms: Dict[str, List[str]]   # canonical code -> phrases
+
+
+# ---------------------------------------------------------------- automaton
+
+class _WordAutomaton:
+    """
+    Aho-Corasick over words rather than characters: phrases can only match
+    on word boundaries, and a scan is one pass over the text's words no
+    matter how many phrases are loaded.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, str]]] = [[]]   # (phrase length, kind, value)
+
+    def add(self, words: Tuple[str, ...], kind: str, value: str):
+        node = 0
+        for word in words:
+            nxt = self._goto[node].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if all(existing[1:] != (kind, value) for existing in self._out[node]):
+            self._out[node].append((len(words), kind, value))
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(word, 0)
+                self._fail[child] = target if target != child else 0   # depth-1 nodes fail to root
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, words: List[str]) -> List[Tuple[int, int, str, str]]:
+        """All matches as (start, end, kind, value); end is exclusive."""
+        matches = []
+        node = 0
+        for i, word in enumerate(words):
+            while node and word not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(word, 0)
+            for length, kind, value in self._out[node]:
+                matches.append((i + 1 - length, i + 1, kind, value))
+        return matches
+
+
+# ---------------------------------------------------------------- matcher
+
+@dataclass(frozen=True)
+class SymptomMention:
+    code: str
+    text: str
+    negated: bool
+
+
+@dataclass(frozen=True)
+class SymptomMatch:
+    codes: FrozenSet[str]        # reported (at least one non-negated mention)
+    negated: FrozenSet[str]      # only ever mentioned as absent
+    mentions: Tuple[SymptomMention, ...]
+
+
+class SymptomMatcher:
+    """
+    Turns free-text symptoms into canonical codes. Overlapping phrases
+    resolve leftmost-longest ("crushing chest pain" beats "chest pain").
+    Negation follows NegEx: a pre-trigger ("no", "denies") negates symptoms
+    in the next `window` words and a post-trigger ("ruled out") the ones
+    before it, in both cases stopping at a clause break (including a comma)
+    or terminator. Pseudo-triggers ("not sure", "no idea") win over the
+    shorter triggers inside them and negate nothing. Scope errs towards
+    reporting: in "no fever, chest pain" only fever is negated.
+    """
+
+    def __init__(self, lexicon: SymptomLexicon, extra_codes: Iterable[str] = ()):
+        self.window = lexicon.negation.window
+        self.codes = frozenset(symptom_code(c) for c in list(lexicon.symptoms) + list(extra_codes))
+        self._automaton = _WordAutomaton()
+        for code, phrases in lexicon.symptoms.items():
+            code = symptom_code(code)
+            for phrase in [code, *phrases]:
+                self._add(phrase, SYMPTOM, code)
+        for code in extra_codes:
+            self._add(code, SYMPTOM, symptom_code(code))
+        for kind, phrases in (
+            (NEG_PRE, lexicon.negation.pre),
+            (NEG_POST, lexicon.negation.post),
+            (PSEUDO, lexicon.negation.pseudo),
+            (TERMINATOR, lexicon.negation.terminators),
+        ):
+            for phrase in phrases:
+                self._add(phrase, kind, phrase)
+        self._automaton.build()
+
+    def _add(self, phrase: str, kind: str, value: str):
+        words = _words(phrase)
+        if words:
+            self._automaton.add(words, kind, value)
+
+    @classmethod
+    def from_file(cls, path: str, extra_codes: Iterable[str] = ()) -> "SymptomMatcher":
+        with open(path, encoding="utf-8") as f:
+            return cls(SymptomLexicon.model_validate(yaml.safe_load(f)), extra_codes)
+
+    def match(self, symptoms: Any) -> SymptomMatch:
+        """`symptoms` is free text or a list of phrases (each its own clause)."""
+        if symptoms is None:
+            symptoms = ""
+        elif not isinstance(symptoms, str):
+            symptoms = ".\n".join(str(s) for s in symptoms)
+
+        words: List[str] = []
+        clause_of: List[int] = []
+        clause = 0
+        for token in _TOKEN.findall(symptoms.lower().replace("_", " ")):
+            if token in _CLAUSE_BREAK:
+                clause += 1
+            else:
+                words.append(token)
+                clause_of.append(clause)
+
+        spans = _leftmost_longest(self._automaton.scan(words))
+        # terminators split clauses too
+        breaks = [0] * (len(words) + 1)
+        for start, _, kind, _ in spans:
+            if kind == TERMINATOR:
+                breaks[start] += 1
+        shift = 0
+        for i in range(len(words)):
+            shift += breaks[i]
+            clause_of[i] += shift
+
+        pre = [(end, clause_of[start]) for start, end, kind, _ in spans if kind == NEG_PRE]
+        post = [(start, clause_of[start]) for start, _, kind, _ in spans if kind == NEG_POST]
+
+        mentions = []
+        for start, end, kind, code in spans:
+            if kind != SYMPTOM:
+                continue
+            where = clause_of[start]
+            negated = any(
+                c == where and 0 <= start - trigger_end < self.window for trigger_end, c in pre
+            ) or any(
+                c == where and 0 <= trigger_start - end < self.window for trigger_start, c in post
+            )
+            mentions.append(SymptomMention(code, " ".join(words[start:end]), negated))
+
+        present = frozenset(m.code for m in mentions if not m.negated)
+        absent = frozenset(m.code for m in mentions if m.negated) - present
+        return SymptomMatch(present, absent, tuple(mentions))
+
+
+def _leftmost_longest(matches: List[Tuple[int, int, str, str]]) -> List[Tuple[int, int, str, str]]:
+    """Non-overlapping spans; every match on a chosen span is kept ("denied" is pre and post)."""
+    chosen, taken_until = [], 0
+    for match in sorted(matches, key=lambda m: (m[0], -(m[1] - m[0]))):
+        if match[0] >= taken_until or (chosen and match[:2] == chosen[-1][:2]):
+            chosen.append(match)
+            taken_until = match[1]
+    return chosen
@@ -1,5 +1,5 @@
 from src.agents.base_agent import BaseAgent
-from src.models.schemas import TriageInput
+from src.agents.triage_rules import triage_rules
 from src.zynd.mock_zynd import zynd_registry
 
 
@@ -11,42 +11,18 @@ class TriageAgent(BaseAgent):
         )
 
     def execute(self, payload: dict) -> dict:
-        data = TriageInput(**payload)
-
-        symptoms = data.symptoms
-        vitals = data.vitals
-        age = data.age
-
-        severity = "GREEN"
-        priority = 3
-        risk = "Routine issue"
-        specialists = ["general_physician"]
-
-        if "chest_pain" in symptoms and age >= 60:
-            severity = "RED"
-            priority = 1
-            risk = "CRITICAL - Possible cardiac event"
-            specialists = ["cardiologist", "emergency_physician"]
-
-        elif "severe_bleeding" in symptoms or "fracture" in symptoms:
-            severity = "RED"
-            priority = 1
-            risk = "CRITICAL - Trauma"
-            specialists = ["trauma_surgeon"]
-
-        elif "fever" in symptoms or "moderate_pain" in symptoms:
-            severity = "YELLOW"
-            priority = 2
-            risk = "Urgent but stable"
-            specialists = ["general_physician"]
-
-        return {
-            **self._meta(),
-            "severity": severity,
-            "priority": priority,
-            "estimated_risk": risk,
-            "recommended_specialists": specialists,
-        }
+        """Rules live in triage_rules.yaml; see src/agents/triage_rules.py."""
+        if "patients" in payload:
+            return self.execute_batch(payload["patients"])
+        return {**self._meta(), **triage_rules.classify(payload)}
+
+    def execute_batch(self, patients: list) -> list:
+        """Triage a mass-casualty batch; None for patients that couldn't be classified."""
+        meta = self._meta()
+        return [
+            {**meta, **result} if result is not None else None
+            for result in triage_rules.classify_batch(patients)
+        ]
 
     def classify_emergency(self, payload: dict) -> dict:
         return self.execute(payload)
@@ -55,4 +31,4 @@ class TriageAgent(BaseAgent):
 triage_agent = TriageAgent()
 
 # 🔗 Register with mock Zynd registry
-zynd_registry.register_agent(triage_agent.did, triage_agent.execute)
+zynd_registry.register_agent(triage_agent.did, triage_agent.execute, name=triage_agent.name)
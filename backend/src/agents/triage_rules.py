@@ -0,0 +1,293 @@
+import operator
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, List, Literal, Optional, Tuple
+
+import yaml
+from pydantic import BaseModel, Field, field_validator
+
+from config import get_settings
+from src.agents.symptom_matcher import SymptomMatcher, symptom_code
+
+settings = get_settings()
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "triage_rules.yaml")
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "symptom_lexicon.yaml")
+
+_AGE = re.compile(r"\d+")
+_OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+
+# payload vitals key -> canonical name (frontend camelCase and legacy snake_case)
+VITAL_ALIASES = {
+    "heartRate": "heart_rate", "heart_rate": "heart_rate", "hr": "heart_rate",
+    "oxygenLevel": "oxygen_level", "oxygen_level": "oxygen_level", "spo2": "oxygen_level",
+    "systolic_bp": "systolic_bp", "diastolic_bp": "diastolic_bp",
+}
+BLOOD_PRESSURE_KEYS = ("bloodPressure", "blood_pressure", "bp")
+
+
+# ---------------------------------------------------------------- schema
+
+class VitalCondition(BaseModel):
+    vital: Literal["heart_rate", "oxygen_level", "systolic_bp", "diastolic_bp"]
+    op: Literal["<", "<=", ">", ">=", "=="]
+    value: float
+
+
+class TriageOutcome(BaseModel):
+    severity: Literal["RED", "YELLOW", "GREEN"]
+    priority: int = Field(ge=1, le=3)
+    risk: str
+    specialists: List[str]
+
+
+class TriageRule(TriageOutcome):
+    id: str
+    symptoms: List[str] = []
+    vitals: List[VitalCondition] = []
+    min_age: Optional[int] = None
+    max_age: Optional[int] = None
+
+    @field_validator("symptoms")
+    @classmethod
+    def normalize_symptoms(cls, symptoms: List[str]) -> List[str]:
+        return [symptom_code(s) for s in symptoms]
+
+
+class TriageRuleSet(BaseModel):
+    version: int = 1
+    default: TriageOutcome
+    rules: List[TriageRule]
+
+    @field_validator("rules")
+    @classmethod
+    def unique_ids(cls, rules: List[TriageRule]) -> List[TriageRule]:
+        ids = [rule.id for rule in rules]
+        duplicates = sorted({i for i in ids if ids.count(i) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule ids: {duplicates}")
+        return rules
+
+
+# ---------------------------------------------------------------- payload parsing
+
+def parse_age(age: Any) -> Optional[int]:
+    """65 -> 65, "40-45" -> 40, "60+" -> 60; the lower bound of a range."""
+    if isinstance(age, (int, float)):
+        return int(age)
+    match = _AGE.search(str(age or ""))
+    return int(match.group()) if match else None
+
+
+def parse_vitals(vitals: Any) -> Dict[str, float]:
+    if hasattr(vitals, "model_dump"):
+        vitals = vitals.model_dump()
+    parsed: Dict[str, float] = {}
+    for key, value in (vitals or {}).items():
+        if value is None:
+            continue
+        if key in BLOOD_PRESSURE_KEYS:
+            numbers = _AGE.findall(str(value))
+            if len(numbers) >= 2:
+                parsed["systolic_bp"], parsed["diastolic_bp"] = float(numbers[0]), float(numbers[1])
+        elif key in VITAL_ALIASES:
+            try:
+                parsed[VITAL_ALIASES[key]] = float(value)
+            except (TypeError, ValueError):
+                pass
+    return parsed
+
+
+# ---------------------------------------------------------------- compiled form
+
+@dataclass(frozen=True)
+class CompiledRule:
+    index: int
+    rule_id: str
+    min_age: Optional[int]
+    max_age: Optional[int]
+    # (vital, bound comparison) pairs; a missing vital fails the condition
+    predicates: Tuple[Tuple[str, Callable[[float], bool]], ...]
+    outcome: Dict[str, Any]
+
+    def matches(self, age: Optional[int], vitals: Dict[str, float]) -> bool:
+        if self.min_age is not None and (age is None or age < self.min_age):
+            return False
+        if self.max_age is not None and (age is None or age > self.max_age):
+            return False
+        for vital, predicate in self.predicates:
+            value = vitals.get(vital)
+            if value is None or not predicate(value):
+                return False
+        return True
+
+
+def _predicate(condition: VitalCondition) -> Callable[[float], bool]:
+    compare, bound = _OPERATORS[condition.op], condition.value
+    return lambda value: compare(value, bound)
+
+
+def _outcome(outcome: TriageOutcome) -> Dict[str, Any]:
+    return {
+        "severity": outcome.severity,
+        "priority": outcome.priority,
+        "estimated_risk": outcome.risk,
+        "recommended_specialists": list(outcome.specialists),
+    }
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """
+    Rules indexed by symptom code. Only rules whose symptoms were reported
+    (plus symptom-less rules) are checked, in file order, so a call costs
+    the rules that could match rather than the whole rule file.
+    """
+    version: int
+    default: Dict[str, Any]
+    by_symptom: Dict[str, Tuple[CompiledRule, ...]]
+    unconditional: Tuple[CompiledRule, ...]
+    matcher: SymptomMatcher
+    rule_count: int
+
+    @classmethod
+    def compile(cls, rule_set: TriageRuleSet, lexicon_path: str) -> "CompiledRuleSet":
+        by_symptom: Dict[str, List[CompiledRule]] = {}
+        unconditional = []
+        for index, rule in enumerate(rule_set.rules):
+            compiled = CompiledRule(
+                index=index,
+                rule_id=rule.id,
+                min_age=rule.min_age,
+                max_age=rule.max_age,
+                predicates=tuple((c.vital, _predicate(c)) for c in rule.vitals),
+                outcome=_outcome(rule),
+            )
+            if rule.symptoms:
+                for token in set(rule.symptoms):
+                    by_symptom.setdefault(token, []).append(compiled)
+            else:
+                unconditional.append(compiled)
+        return cls(
+            version=rule_set.version,
+            default=_outcome(rule_set.default),
+            by_symptom={token: tuple(rules) for token, rules in by_symptom.items()},
+            unconditional=tuple(unconditional),
+            matcher=SymptomMatcher.from_file(lexicon_path, extra_codes=by_symptom),
+            rule_count=len(rule_set.rules),
+        )
+
+    def candidates(self, codes: FrozenSet[str]) -> List[CompiledRule]:
+        found = {rule.index: rule for rule in self.unconditional}
+        for code in codes:
+            for rule in self.by_symptom.get(code, ()):
+                found[rule.index] = rule
+        return [found[i] for i in sorted(found)]
+
+    def evaluate(self, codes: FrozenSet[str], age: Optional[int], vitals: Dict[str, float]) -> Dict[str, Any]:
+        for rule in self.candidates(codes):
+            if rule.matches(age, vitals):
+                return rule.outcome
+        return self.default
+
+
+# ---------------------------------------------------------------- engine
+
+def load_rule_set(path: str) -> TriageRuleSet:
+    """YAML or JSON (JSON is valid YAML); raises ValueError on schema errors."""
+    with open(path, encoding="utf-8") as f:
+        return TriageRuleSet.model_validate(yaml.safe_load(f))
+
+
+class TriageRuleEngine:
+    """
+    Holds the compiled rule set (rules plus symptom lexicon) and swaps in a
+    new one when either file changes. Their mtimes are checked at most every
+    `reload_s` seconds from `classify` itself, so this works the same in the
+    API, a process pool or a bus worker. Files that fail validation are
+    reported and the previous rules stay in force.
+    """
+
+    def __init__(self, path: str, lexicon_path: str, reload_s: float):
+        self.path = path
+        self.lexicon_path = lexicon_path
+        self.reload_s = reload_s
+        self._compiled: Optional[CompiledRuleSet] = None
+        self._mtimes: Optional[Tuple[float, float]] = None
+        self._next_check = 0.0
+
+    @property
+    def rules(self) -> CompiledRuleSet:
+        if self._compiled is None:
+            self.load()
+        return self._compiled
+
+    def _file_mtimes(self) -> Tuple[float, float]:
+        return os.path.getmtime(self.path), os.path.getmtime(self.lexicon_path)
+
+    def load(self):
+        mtimes = self._file_mtimes()
+        self._compiled = CompiledRuleSet.compile(load_rule_set(self.path), self.lexicon_path)
+        self._mtimes = mtimes
+        print(f"🩺 Loaded {self._compiled.rule_count} triage rules (v{self._compiled.version}) from {self.path}")
+
+    def reload_if_changed(self) -> bool:
+        try:
+            mtimes = self._file_mtimes()
+        except OSError as e:
+            print(f"❌ Triage rules file unavailable, keeping previous rules: {e}")
+            return False
+        if mtimes == self._mtimes:
+            return False
+        try:
+            self.load()
+            return True
+        except Exception as e:
+            print(f"❌ Triage rules reload failed, keeping previous rules: {e}")
+            self._mtimes = mtimes   # don't re-parse the same broken files until they are edited again
+            return False
+
+    def _current(self) -> CompiledRuleSet:
+        if self.reload_s > 0 and self._compiled is not None:
+            now = time.monotonic()
+            if now >= self._next_check:
+                self._next_check = now + self.reload_s
+                self.reload_if_changed()
+        return self.rules
+
+    @staticmethod
+    def _classify(rules: CompiledRuleSet, payload: dict) -> Dict[str, Any]:
+        outcome = rules.evaluate(
+            rules.matcher.match(payload.get("symptoms")).codes,
+            parse_age(payload.get("age")),
+            parse_vitals(payload.get("vitals")),
+        )
+        return {**outcome, "recommended_specialists": list(outcome["recommended_specialists"])}
+
+    def classify(self, payload: dict) -> Dict[str, Any]:
+        """severity, priority, estimated_risk and recommended_specialists for one patient."""
+        return self._classify(self._current(), payload)
+
+    def classify_batch(self, payloads: List[dict]) -> List[Optional[Dict[str, Any]]]:
+        """
+        One rule set for the whole batch (a reload can't land mid-incident).
+        A patient whose payload can't be classified gets None instead of
+        failing the others.
+        """
+        rules = self._current()
+        results = []
+        for payload in payloads:
+            try:
+                results.append(self._classify(rules, payload))
+            except Exception as e:
+                print(f"⚠️  Triage failed for batch patient: {e}")
+                results.append(None)
+        return results
+
+triage_rules = TriageRuleEngine(
+    settings.triage_rules_path or DEFAULT_RULES_PATH,
+    settings.symptom_lexicon_path or DEFAULT_LEXICON_PATH,
+    settings.triage_rules_reload_s,
+)
@@ -1,19 +1,37 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List
 from datetime import datetime
-from sqlalchemy.orm import Session
+import asyncio
+import json
+from sqlalchemy.ext.asyncio import AsyncSession
 import math
 import random
 
+import numpy as np
+
 
 # Import schemas and orchestrator
-from src.models.schemas import TriageInput, EmergencyRequest, LocationData
+from src.models.schemas import TriageInput, TriageBatchRequest, EmergencyRequest, LocationData
 from src.orchestrator.orchestrator import orchestrator
-from src.database.db import get_db, Emergency
+from src.orchestrator.event_handler import orchestrator as event_orchestrator
+from src.orchestrator.scheduler import scheduler
+from src.agents.triage_agent import triage_agent
+from src.zynd.context import EmergencyContext
+from src.zynd.mock_zynd import zynd_registry
+from src.database.db import get_async_db, Emergency
+from src.services.hospital_registry import hospital_registry
+from src.services.assignment_solver import eta_matrix, plan_assignments
+from src.api.websocket import DISPATCHER, hub
+from config import get_settings
 
 
 router = APIRouter()
+settings = get_settings()
+
+# Batch dispatch tasks, referenced here so they outlive a dropped response
+_batch_dispatches: set = set()
 
 
 
@@ -59,15 +77,47 @@ def calculate_eta(distance_km: float) -> int:
 # =====================
 
 
+def _triage_payload(request: TriageInput) -> dict:
+    location = request.location
+    return {
+        "patientName": request.patientName,
+        "age": request.age,
+        "gender": request.gender,
+        "contact": request.contact,
+        "symptoms": request.symptoms,
+        "vitals": request.vitals.dict(),
+        "location": {"lat": location.lat, "lng": location.lng} if location else None,
+    }
+
+
+def _emergency_row(request: TriageInput, triage: dict) -> Emergency:
+    lat = request.location.lat if request.location else None
+    lng = request.location.lng if request.location else None
+    return Emergency(
+        location=f"Lat: {lat}, Lng: {lng}",
+        latitude=lat,
+        longitude=lng,
+        symptoms=[request.symptoms],  # Store as JSON array
+        age_group=request.age,  # "40-45" format
+        vitals={
+            "bloodPressure": request.vitals.bloodPressure,
+            "heartRate": request.vitals.heartRate,
+            "oxygenLevel": request.vitals.oxygenLevel
+        },
+        severity=triage.get("severity"),
+        priority=triage.get("priority"),
+        status="REGISTERED"
+    )
+
+
 @router.post("/triage")
 async def triage_emergency(
     request: TriageInput,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Receives emergency from new frontend form.
-    Saves to DB and triggers orchestrator.
+    Triages it, saves to DB and queues the orchestrator by priority.
     """
     print(f"🚨 Received Emergency: {request.patientName}")
     print(f"   Age: {request.age}, Gender: {request.gender}")
@@ -75,43 +125,43 @@ async def triage_emergency(
     print(f"   Location: ({request.location.lat}, {request.location.lng})")
     
     try:
+        # Prepare payload for orchestrator
+        payload = _triage_payload(request)
+
+        # Triage up front: its priority decides where the case is queued.
+        # An untriaged case is queued as most urgent and retried by the orchestrator.
+        context = EmergencyContext()
+        try:
+            context.triage = await zynd_registry.call(triage_agent.did, payload, context=context)
+        except Exception as e:
+            print(f"⚠️  Triage failed, queueing as highest priority: {e}")
+        triage = context.triage or {}
+
         # Create database entry
-        emergency = Emergency(
-            location=f"Lat: {request.location.lat}, Lng: {request.location.lng}",
-            latitude=request.location.lat,
-            longitude=request.location.lng,
-            symptoms=[request.symptoms],  # Store as JSON array
-            age_group=request.age,  # "40-45" format
-            vitals={
-                "bloodPressure": request.vitals.bloodPressure,
-                "heartRate": request.vitals.heartRate,
-                "oxygenLevel": request.vitals.oxygenLevel
-            },
-            status="REGISTERED"
-        )
+        emergency = _emergency_row(request, triage)
         
         db.add(emergency)
-        db.commit()
-        db.refresh(emergency)
+        await db.commit()
+        await db.refresh(emergency)
         
         print(f"✅ Emergency saved with ID: {emergency.id}")
-        
-        # Prepare payload for orchestrator
-        payload = {
-            "patientName": request.patientName,
-            "age": request.age,
-            "gender": request.gender,
-            "contact": request.contact,
-            "symptoms": request.symptoms,
-            "vitals": request.vitals.dict(),
-            "location": {"lat": request.location.lat, "lng": request.location.lng}
-        }
-        
-        # Trigger orchestrator in background - FIXED: pass as positional args
-        background_tasks.add_task(
-            orchestrator.handle_emergency,
-            emergency.id,  # First positional argument
-            payload        # Second positional argument
+        hub.publish(DISPATCHER, {
+            "type": "emergency.registered",
+            "emergencyId": emergency.id,
+            "severity": emergency.severity,
+            "priority": emergency.priority,
+        })
+        
+        # Orchestrate on the scheduler's worker pool, most urgent first
+        context.emergency_id = emergency.id
+        await scheduler.submit(
+            event_orchestrator.handle_emergency,
+            emergency.id,
+            payload,
+            context=context,
+            priority=triage.get("priority"),
+            severity=triage.get("severity"),
+            name=f"emergency-{emergency.id}",
         )
         
         return {
@@ -119,6 +169,8 @@ async def triage_emergency(
             "emergencyId": emergency.id,
             "message": "Emergency registered successfully",
             "status": "PROCESSING",
+            "severity": triage.get("severity"),
+            "priority": triage.get("priority"),
             "location": {"lat": request.location.lat, "lng": request.location.lng}
         }
         
@@ -126,9 +178,182 @@ async def triage_emergency(
         print(f"❌ Error in /triage: {str(e)}")
         import traceback
         traceback.print_exc()
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _plan_batch(triages: list, emergencies: list, payloads: list) -> dict:
+    """
+    Place every located patient of a batch on a hospital at once (min-cost
+    assignment over live bed counts) instead of each emergency greedily
+    taking the nearest. The chosen hospital becomes the patient's routing
+    candidate; the orchestrator searches as usual when it has no bed or
+    route left by then, and for unplaced patients.
+    Returns {patient index: stream fields} plus a "summary" entry.
+    """
+    located = [i for i, e in enumerate(emergencies) if e.latitude is not None and e.longitude is not None]
+    snapshot = hospital_registry.snapshot
+    if not located or not snapshot.hospitals:
+        return {"summary": {"solver": "min_cost", "assigned": 0, "unassigned": len(located)}}
+
+    eta = await eta_matrix(
+        [(emergencies[i].latitude, emergencies[i].longitude) for i in located], snapshot
+    )
+    # The solve is pure CPU (hundreds of ms for large batches): keep it off the event loop
+    plan = await asyncio.to_thread(
+        plan_assignments, [triages[i] or {} for i in located], snapshot.hospitals, eta
+    )
+
+    result = {}
+    for row, i in enumerate(located):
+        j = int(plan.hospital_index[row])
+        if j < 0:
+            continue
+        hospital = snapshot.hospitals[j]
+        payloads[i]["candidate_hospitals"] = [dict(hospital)]
+        result[i] = {"assignedHospitalId": hospital["id"], "etaMin": round(float(plan.eta_min[row]), 1)}
+    result["summary"] = {
+        "solver": plan.method,
+        "assigned": len(located) - plan.unassigned,
+        "unassigned": plan.unassigned,
+        "totalEtaMin": round(plan.total_eta_min, 1),
+        "solveMs": plan.solve_ms,
+    }
+    print(f"🧮 Batch assignment: {result['summary']}")
+    return result
+
+
+async def _try_plan_batch(triages: list, emergencies: list, payloads: list) -> dict:
+    """_plan_batch within batch_plan_timeout_s; on failure every patient gets the normal search."""
+    try:
+        return await asyncio.wait_for(
+            _plan_batch(triages, emergencies, payloads), settings.batch_plan_timeout_s
+        )
+    except Exception as e:
+        reason = f"timed out after {settings.batch_plan_timeout_s}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+        print(f"⚠️  Batch assignment failed, using per-emergency search: {reason}")
+        for payload in payloads:
+            payload.pop("candidate_hospitals", None)
+        return {"summary": {"solver": None, "error": reason}}
+
+
+async def _dispatch_batch(triages: list, emergencies: list, payloads: list, order: list,
+                          lines: asyncio.Queue):
+    """
+    Queue every located patient of a batch on the scheduler, most urgent
+    first, putting one NDJSON line per patient on `lines`, then the summary
+    line and None.
+    """
+    try:
+        counts = {}
+        plan = await _try_plan_batch(triages, emergencies, payloads) if settings.batch_assignment_enabled else None
+        registered = []
+        for i in order:
+            emergency = emergencies[i]
+            severity = emergency.severity or "UNTRIAGED"
+            counts[severity] = counts.get(severity, 0) + 1
+            line = {
+                "index": i,
+                "emergencyId": emergency.id,
+                "severity": emergency.severity,
+                "priority": emergency.priority,
+                "status": "PROCESSING",
+            }
+            if plan is not None and plan.get(i):
+                line.update(plan[i])
+            if emergency.latitude is None or emergency.longitude is None:
+                # Registered and triaged, but there is nothing to route to yet
+                line["status"] = "AWAITING_LOCATION"
+            registered.append(line)
+
+        # One dispatcher event for the whole batch rather than a burst of one per patient
+        hub.publish(DISPATCHER, {
+            "type": "emergency.batch_registered",
+            "total": len(registered),
+            "bySeverity": counts,
+            "emergencies": registered,
+        })
+
+        for line in registered:
+            i = line["index"]
+            if line["status"] == "PROCESSING":
+                emergency = emergencies[i]
+                try:
+                    await scheduler.submit(
+                        event_orchestrator.handle_emergency,
+                        emergency.id,
+                        payloads[i],
+                        context=EmergencyContext(emergency_id=emergency.id, triage=triages[i]),
+                        priority=emergency.priority,
+                        severity=emergency.severity,
+                        name=f"emergency-{emergency.id}",
+                    )
+                except Exception as e:
+                    line = {**line, "status": "NOT_QUEUED", "error": str(e)}
+            lines.put_nowait(line)
+        summary = {"summary": True, "total": len(order), "bySeverity": counts}
+        if plan is not None:
+            summary["assignment"] = plan["summary"]
+        lines.put_nowait(summary)
+    finally:
+        lines.put_nowait(None)
+
+
+@router.post("/triage/batch")
+async def triage_batch(
+    request: TriageBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mass-casualty registration. The whole list is triaged in one agent call
+    and inserted in one transaction, then placed on hospitals together (see
+    _plan_batch). The response streams one NDJSON line per patient (most
+    urgent first) as each is queued for orchestration, then a summary line.
+    """
+    patients = request.patients
+    print(f"🚨 Received batch of {len(patients)} emergencies")
+
+    payloads = [_triage_payload(patient) for patient in patients]
+    try:
+        triages = await zynd_registry.call(
+            triage_agent.did, {"patients": payloads}, action="execute_batch"
+        )
+    except Exception as e:
+        print(f"⚠️  Batch triage failed, queueing all as highest priority: {e}")
+        triages = [None] * len(patients)
+
+    emergencies = [
+        _emergency_row(patient, triage or {}) for patient, triage in zip(patients, triages)
+    ]
+    try:
+        db.add_all(emergencies)
+        await db.commit()
+    except Exception as e:
+        print(f"❌ Error in /triage/batch: {str(e)}")
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+    print(f"✅ Saved {len(emergencies)} emergencies ({emergencies[0].id}..{emergencies[-1].id})")
+
+    # Most urgent first; untriaged patients (priority None) count as most urgent
+    order = sorted(
+        range(len(patients)),
+        key=lambda i: ((triages[i] or {}).get("priority") or 0, i),
+    )
+
+    # Every row is committed as REGISTERED, so dispatch runs in its own task:
+    # a client dropping mid-stream must not leave patients unqueued.
+    lines: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_dispatch_batch(triages, emergencies, payloads, order, lines))
+    _batch_dispatches.add(task)
+    task.add_done_callback(_batch_dispatches.discard)
+
+    async def stream():
+        while (line := await lines.get()) is not None:
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 
 
 # =====================
@@ -139,7 +364,7 @@ async def triage_emergency(
 @router.get("/hospitals/{emergency_id}")
 async def get_hospital_for_emergency(
     emergency_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get assigned hospital for an emergency with calculated distances
@@ -148,7 +373,7 @@ async def get_hospital_for_emergency(
         print(f"🏥 Fetching hospitals for Emergency ID: {emergency_id}")
         
         # Fetch emergency from database
-        emergency = db.query(Emergency).filter(Emergency.id == emergency_id).first()
+        emergency = await db.get(Emergency, emergency_id)
         
         if not emergency:
             raise HTTPException(status_code=404, detail="Emergency not found")
@@ -163,115 +388,36 @@ async def get_hospital_for_emergency(
         if emergency.status == "REGISTERED":
             emergency.status = "ASSIGNED"
             emergency.severity = "HIGH"
-            db.commit()
-            db.refresh(emergency)
+            await db.commit()
+            await db.refresh(emergency)
             print(f"✅ Updated emergency status to ASSIGNED")
         
-        # Hospital coordinates (actual locations in Delhi/NCR)
-        hospitals_data = [
-            {
-                "id": 1,
-                "name": "All India Institute of Medical Sciences (AIIMS)",
-                "address": "Ansari Nagar, New Delhi - 110029",
-                "lat": 28.5672,
-                "lng": 77.2100,
-                "phone": "+91-11-2658-8500",
-                "specialties": ["Emergency Medicine", "Cardiology", "Trauma", "ICU"],
-                "bedsAvailable": 15
-            },
-            {
-                "id": 2,
-                "name": "Fortis Hospital",
-                "address": "Sector 62, Noida, Uttar Pradesh",
-                "lat": 28.6066,
-                "lng": 77.3572,
-                "phone": "+91-120-500-3333",
-                "specialties": ["Emergency Medicine", "Neurology", "Orthopedics"],
-                "bedsAvailable": 10
-            },
-            {
-                "id": 3,
-                "name": "Max Super Specialty Hospital",
-                "address": "Saket, New Delhi - 110017",
-                "lat": 28.5244,
-                "lng": 77.2066,
-                "phone": "+91-11-2651-5050",
-                "specialties": ["Emergency Medicine", "General Surgery", "ICU"],
-                "bedsAvailable": 8
-            },
-            {
-                "id": 4,
-                "name": "Apollo Hospital",
-                "address": "Mathura Road, Sarita Vihar, Delhi",
-                "lat": 28.5355,
-                "lng": 77.2952,
-                "phone": "+91-11-2692-5858",
-                "specialties": ["Emergency Medicine", "Cardiology", "Pulmonology"],
-                "bedsAvailable": 6
-            },
-            {
-                "id": 5,
-                "name": "Safdarjung Hospital",
-                "address": "Ring Road, New Delhi - 110029",
-                "lat": 28.5678,
-                "lng": 77.2065,
-                "phone": "+91-11-2673-0000",
-                "specialties": ["Emergency Medicine", "Trauma", "General Medicine"],
-                "bedsAvailable": 12
-            },
-            {
-                "id": 6,
-                "name": "Fortis Hospital Shalimar Bagh",
-                "address": "A Block, Shalimar Bagh, Delhi - 110088",
-                "lat": 28.7194,
-                "lng": 77.1642,
-                "phone": "+91-11-4714-4444",
-                "specialties": ["Emergency Medicine", "Cardiology", "Orthopedics"],
-                "bedsAvailable": 9
-            },
-            {
-                "id": 7,
-                "name": "Batra Hospital",
-                "address": "Tughlakabad, New Delhi - 110062",
-                "lat": 28.5005,
-                "lng": 77.2806,
-                "phone": "+91-11-2995-5555",
-                "specialties": ["Emergency Medicine", "Cardiology", "Neurology"],
-                "bedsAvailable": 7
-            },
-            {
-                "id": 8,
-                "name": "Max Hospital Pitampura",
-                "address": "Pitampura, Delhi - 110034",
-                "lat": 28.6952,
-                "lng": 77.1312,
-                "phone": "+91-11-4040-4040",
-                "specialties": ["Emergency Medicine", "Neurology", "Orthopedics"],
-                "bedsAvailable": 11
-            }
-        ]
-        
-        # Calculate distance and ETA for each hospital
+        # Hospitals and live bed counts come from the registry snapshot
+        snapshot = hospital_registry.snapshot
+        engine = snapshot.distance_engine
+        if not len(engine):
+            raise HTTPException(status_code=404, detail="No hospitals found")
+
+        # Distance and ETA to every hospital in one vectorized pass, nearest first
+        order, distances = engine.nearest(user_lat, user_lng, k=len(engine))
+        distances = np.round(distances, 1)
+        etas = engine.eta_minutes(distances)
+
         hospitals_with_distance = []
-        for hospital in hospitals_data:
-            distance = calculate_distance(user_lat, user_lng, hospital["lat"], hospital["lng"])
-            eta = calculate_eta(distance)
-            
+        for index, distance, eta in zip(order.tolist(), distances.tolist(), etas.tolist()):
+            hospital = snapshot.hospitals[index]
             hospitals_with_distance.append({
                 "id": hospital["id"],
                 "name": hospital["name"],
                 "address": hospital["address"],
                 "distance": distance,
                 "eta": eta,
-                "bedsAvailable": hospital["bedsAvailable"],
+                "bedsAvailable": hospital["beds_available"],
                 "phone": hospital["phone"],
-                "specialties": hospital["specialties"],
+                "specialties": list(hospital["specialties"]),
                 "isRecommended": False  # Will be set for nearest hospital
             })
         
-        # Sort by distance (nearest first)
-        hospitals_with_distance.sort(key=lambda x: x["distance"])
-        
         # Mark nearest hospital as recommended
         if hospitals_with_distance:
             hospitals_with_distance[0]["isRecommended"] = True
@@ -279,7 +425,7 @@ async def get_hospital_for_emergency(
             # Update emergency with nearest hospital info
             emergency.assigned_hospital_id = hospitals_with_distance[0]["id"]
             emergency.estimated_arrival_time = f"{hospitals_with_distance[0]['eta']} minutes"
-            db.commit()
+            await db.commit()
         
         print(f"✅ Returning {len(hospitals_with_distance)} hospitals sorted by distance")
         print(f"   Nearest: {hospitals_with_distance[0]['name']} ({hospitals_with_distance[0]['distance']} km, {hospitals_with_distance[0]['eta']} min)")
@@ -309,7 +455,7 @@ async def get_hospital_for_emergency(
 @router.get("/ambulance/{emergency_id}")
 async def get_ambulance_location(
     emergency_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current ambulance location for an emergency.
@@ -319,7 +465,7 @@ async def get_ambulance_location(
         print(f"🚑 Fetching ambulance location for Emergency ID: {emergency_id}")
         
         # Fetch emergency from database
-        emergency = db.query(Emergency).filter(Emergency.id == emergency_id).first()
+        emergency = await db.get(Emergency, emergency_id)
         
         if not emergency:
             raise HTTPException(status_code=404, detail="Emergency not found")
@@ -372,7 +518,7 @@ async def get_ambulance_location(
 @router.get("/hospitals/{emergency_id}/selected")
 async def get_selected_hospital(
     emergency_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the selected/nearest hospital for an emergency.
@@ -382,7 +528,7 @@ async def get_selected_hospital(
         print(f"🏥 Fetching selected hospital for Emergency ID: {emergency_id}")
         
         # Fetch emergency from database
-        emergency = db.query(Emergency).filter(Emergency.id == emergency_id).first()
+        emergency = await db.get(Emergency, emergency_id)
         
         if not emergency:
             raise HTTPException(status_code=404, detail="Emergency not found")
@@ -390,61 +536,21 @@ async def get_selected_hospital(
         user_lat = emergency.latitude
         user_lng = emergency.longitude
         
-        # Get nearest hospital (reuse hospital data from get_hospital_for_emergency)
-        hospitals_data = [
-            {
-                "id": 1,
-                "name": "AIIMS Delhi",
-                "address": "Ansari Nagar, New Delhi - 110029",
-                "lat": 28.5672,
-                "lng": 77.2100,
-                "phone": "+91-11-2658-8500"
-            },
-            {
-                "id": 2,
-                "name": "Fortis Hospital Noida",
-                "address": "Sector 62, Noida",
-                "lat": 28.6066,
-                "lng": 77.3572,
-                "phone": "+91-120-500-3333"
-            },
-            {
-                "id": 3,
-                "name": "Max Hospital Saket",
-                "address": "Saket, New Delhi",
-                "lat": 28.5244,
-                "lng": 77.2066,
-                "phone": "+91-11-2651-5050"
-            },
-            {
-                "id": 4,
-                "name": "Apollo Hospital Delhi",
-                "address": "Sarita Vihar, Delhi",
-                "lat": 28.5355,
-                "lng": 77.2952,
-                "phone": "+91-11-2692-5858"
-            }
-        ]
-        
-        # Calculate distances and find nearest
-        nearest_hospital = None
-        min_distance = float('inf')
-        
-        for hospital in hospitals_data:
-            distance = calculate_distance(user_lat, user_lng, hospital["lat"], hospital["lng"])
-            if distance < min_distance:
-                min_distance = distance
-                nearest_hospital = hospital
-        
-        if not nearest_hospital:
+        # Nearest hospital from the registry snapshot's distance engine
+        snapshot = hospital_registry.snapshot
+        if not len(snapshot.distance_engine):
             raise HTTPException(status_code=404, detail="No hospitals found")
+
+        order, distances = snapshot.distance_engine.nearest(user_lat, user_lng, k=1)
+        nearest_hospital = snapshot.hospitals[int(order[0])]
+        min_distance = round(float(distances[0]), 1)
         
         eta_minutes = calculate_eta(min_distance)
         
         # Update emergency record with selected hospital
         emergency.assigned_hospital_id = nearest_hospital["id"]
         emergency.estimated_arrival_time = f"{eta_minutes} minutes"
-        db.commit()
+        await db.commit()
         
         print(f"✅ Selected Hospital: {nearest_hospital['name']}")
         print(f"   Distance: {min_distance} km, ETA: {eta_minutes} min")
@@ -454,12 +560,12 @@ async def get_selected_hospital(
             "hospitalId": nearest_hospital["id"],
             "name": nearest_hospital["name"],
             "address": nearest_hospital["address"],
-            "latitude": nearest_hospital["lat"],
-            "longitude": nearest_hospital["lng"],
+            "latitude": nearest_hospital["latitude"],
+            "longitude": nearest_hospital["longitude"],
             "phone": nearest_hospital["phone"],
             "distance": round(min_distance, 1),
             "eta": f"{eta_minutes} minutes",
-            "bedsAvailable": random.randint(5, 15),
+            "bedsAvailable": nearest_hospital["beds_available"],
             "isSelected": True
         }
         
@@ -479,11 +585,11 @@ async def get_selected_hospital(
 
 
 @router.get("/status/{emergency_id}")
-async def get_agent_status(emergency_id: int, db: Session = Depends(get_db)):
+async def get_agent_status(emergency_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get emergency processing status"""
     print(f"📊 Status check for Emergency ID: {emergency_id}")
     
-    emergency = db.query(Emergency).filter(Emergency.id == emergency_id).first()
+    emergency = await db.get(Emergency, emergency_id)
     
     if not emergency:
         raise HTTPException(status_code=404, detail="Emergency not found")
@@ -492,8 +598,8 @@ async def get_agent_status(emergency_id: int, db: Session = Depends(get_db)):
     if emergency.status == "REGISTERED":
         emergency.status = "PROCESSING"
         emergency.severity = "HIGH"
-        db.commit()
-        db.refresh(emergency)
+        await db.commit()
+        await db.refresh(emergency)
         print(f"✅ Updated status to PROCESSING")
     
     return {
@@ -526,6 +632,30 @@ async def notify_hospital(data: dict):
 
 
 
+@router.post("/reservations/{reservation_id}/confirm")
+async def confirm_bed_reservation(reservation_id: str):
+    """Hospital admitted the patient: keep the held bed"""
+    if not await hospital_registry.confirm_reservation(reservation_id):
+        raise HTTPException(status_code=404, detail="No active reservation found")
+    return {"success": True, "reservationId": reservation_id, "status": "CONFIRMED"}
+
+
+@router.post("/reservations/{reservation_id}/release")
+async def release_bed_reservation(reservation_id: str):
+    """Patient diverted or cancelled: give the held bed back"""
+    if not await hospital_registry.release_reservation(reservation_id):
+        raise HTTPException(status_code=404, detail="No active reservation found")
+    return {"success": True, "reservationId": reservation_id, "status": "RELEASED"}
+
+
+
+@router.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """Orchestrator queue depth, running jobs and wait times per severity"""
+    return scheduler.stats()
+
+
+
 # =====================
 # Legacy Endpoint (Backward compatibility)
 # =====================
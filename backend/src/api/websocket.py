@@ -1,43 +1,232 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from src.orchestrator.orchestrator import orchestrator
+from src.services.metrics import (
+    WS_CONNECTIONS,
+    WS_EVICTIONS,
+    WS_MESSAGES,
+    WS_QUEUE_DEPTH,
+    WS_SEND_LATENCY,
+)
+from config import get_settings
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple, Union
+import asyncio
 import json
+import time
 
 router = APIRouter()
+settings = get_settings()
 
-class ConnectionManager:
-    """Manages active WebSocket connections"""
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
+DISPATCHER = "dispatcher"
 
-    async def connect(self, websocket: WebSocket):
+
+def emergency_topic(emergency_id) -> str:
+    return f"emergency:{emergency_id}"
+
+
+def hospital_topic(hospital_id) -> str:
+    return f"hospital:{hospital_id}"
+
+
+class _Connection:
+    """One socket: its topics, pending (queued_at, text) messages and the task draining them."""
+    __slots__ = ("websocket", "channel", "topics", "pending", "ready", "sender", "dropped")
+
+    def __init__(self, websocket: WebSocket, channel: str):
+        self.websocket = websocket
+        self.channel = channel
+        self.topics: Set[str] = set()
+        self.pending: Deque[Tuple[float, str]] = deque()
+        self.ready = asyncio.Event()
+        self.sender: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
+class WebSocketHub:
+    """
+    Topic-based fan-out ("emergency:<id>", "hospital:<id>", "dispatcher").
+
+    `publish` encodes a message once and only enqueues it, so it never waits
+    on a socket; each connection's own task sends from its queue. A client
+    is slow when `max_queue` messages are pending and the oldest has waited
+    `send_timeout_s` (a burst the server publishes in one go is queued in
+    full), when `hard_limit` messages are pending however fresh they are,
+    or when a single send stalls `send_timeout_s`. Slow clients are handled
+    by `slow_consumer`: "evict" closes it with 1013 (try again later),
+    "drop_oldest" discards its oldest pending message.
+    """
+
+    def __init__(
+        self,
+        max_queue: int,
+        send_timeout_s: float,
+        slow_consumer: str = "evict",
+        hard_limit: Optional[int] = None,
+    ):
+        if slow_consumer not in ("evict", "drop_oldest"):
+            raise ValueError(f"Unknown slow consumer policy {slow_consumer!r}")
+        self.max_queue = max_queue
+        self.hard_limit = max(hard_limit or max_queue * 10, max_queue)
+        self.send_timeout_s = send_timeout_s
+        self.slow_consumer = slow_consumer
+        self._connections: Dict[WebSocket, _Connection] = {}
+        self._topics: Dict[str, Set[_Connection]] = {}
+        self._closing: Set[asyncio.Task] = set()
+
+    async def connect(self, websocket: WebSocket, *topics: str, channel: str) -> _Connection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = _Connection(websocket, channel)
+        self._connections[websocket] = connection
+        for topic in topics:
+            self.subscribe(websocket, topic)
+        connection.sender = asyncio.create_task(self._send_loop(connection))
+        WS_CONNECTIONS.inc(channel)
+        return connection
+
+    def subscribe(self, websocket: WebSocket, topic: str):
+        connection = self._connections[websocket]
+        connection.topics.add(topic)
+        self._topics.setdefault(topic, set()).add(connection)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        """Idempotent; pending messages for this socket are discarded."""
+        connection = self._connections.pop(websocket, None)
+        if connection is None:
+            return
+        for topic in connection.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self._topics[topic]
+        if connection.sender is not None:
+            connection.sender.cancel()
+        WS_CONNECTIONS.dec(connection.channel)
+
+    @staticmethod
+    def encode(message: dict) -> str:
+        return json.dumps(message, default=str)
+
+    def publish(self, topics: Union[str, Iterable[str]], message: dict) -> int:
+        """Queue `message` for every subscriber of any of `topics` (each socket once)."""
+        if isinstance(topics, str):
+            topics = (topics,)
+        targets = set()
+        for topic in topics:
+            targets.update(self._topics.get(topic, ()))
+        if targets:
+            text = self.encode(message)
+            for connection in targets:
+                self._enqueue(connection, text)
+        return len(targets)
+
+    def send(self, websocket: WebSocket, message: dict):
+        """Reply to one socket, in order with its topic messages."""
+        connection = self._connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, self.encode(message))
+
+    def _enqueue(self, connection: _Connection, text: str):
+        pending = connection.pending
+        WS_QUEUE_DEPTH.observe(len(pending))
+        now = time.perf_counter()
+        if len(pending) >= self.hard_limit or (
+            len(pending) >= self.max_queue and now - pending[0][0] >= self.send_timeout_s
+        ):
+            if self.slow_consumer == "drop_oldest":
+                pending.popleft()
+                connection.dropped += 1
+                WS_MESSAGES.inc("dropped")
+            else:
+                WS_MESSAGES.inc("dropped", amount=len(pending) + 1)
+                self._evict(connection, "queue_full")
+                return
+        pending.append((now, text))
+        connection.ready.set()
 
-    async def send_message(self, websocket: WebSocket, message: dict):
-        await websocket.send_text(json.dumps(message))
+    async def _send_loop(self, connection: _Connection):
+        while True:
+            while not connection.pending:
+                connection.ready.clear()
+                await connection.ready.wait()
+            queued_at, text = connection.pending.popleft()
+            try:
+                await asyncio.wait_for(connection.websocket.send_text(text), self.send_timeout_s)
+            except asyncio.TimeoutError:
+                self._evict(connection, "send_timeout")
+                return
+            except Exception:
+                WS_MESSAGES.inc("failed")
+                self.disconnect(connection.websocket)
+                return
+            WS_MESSAGES.inc("sent")
+            WS_SEND_LATENCY.observe(time.perf_counter() - queued_at)
+
+    def _evict(self, connection: _Connection, reason: str):
+        print(f"⚠️  Evicting slow WebSocket client ({connection.channel}, {reason})")
+        WS_EVICTIONS.inc(reason)
+        self.disconnect(connection.websocket)
+        task = asyncio.create_task(self._close(connection.websocket, 1013))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    async def shutdown(self):
+        """Close every socket with 1001 (going away)."""
+        websockets = list(self._connections)
+        for websocket in websockets:
+            self.disconnect(websocket)
+        await asyncio.gather(*(self._close(ws, 1001) for ws in websockets))
+
+    def stats(self) -> dict:
+        by_channel: Dict[str, int] = {}
+        for connection in self._connections.values():
+            by_channel[connection.channel] = by_channel.get(connection.channel, 0) + 1
+        return {
+            "connections": len(self._connections),
+            "byChannel": by_channel,
+            "topics": len(self._topics),
+            "queued": sum(len(c.pending) for c in self._connections.values()),
+            "maxQueue": self.max_queue,
+            "hardLimit": self.hard_limit,
+            "slowConsumer": self.slow_consumer,
+        }
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_text(json.dumps(message))
 
-manager = ConnectionManager()
+hub = WebSocketHub(
+    settings.ws_send_queue_size,
+    settings.ws_send_timeout_s,
+    settings.ws_slow_consumer,
+    settings.ws_send_queue_hard_limit,
+)
+
+
+async def _hold_open(websocket: WebSocket):
+    """Keep a subscribe-only socket open; answers "ping" with "pong"."""
+    while True:
+        if (await websocket.receive_text()).strip() == "ping":
+            hub.send(websocket, {"type": "pong"})
+
 
 @router.websocket("/ws/emergency/{emergency_id}")
 async def emergency_websocket(websocket: WebSocket, emergency_id: str):
     """
     WebSocket endpoint for real-time emergency updates
     """
-    await manager.connect(websocket)
+    await hub.connect(websocket, emergency_topic(emergency_id), channel="emergency")
 
     try:
         while True:
             data = await websocket.receive_text()
             request_data = json.loads(data)
 
-            await manager.send_message(websocket, {
+            hub.send(websocket, {
                 "status": "received",
                 "message": f"Emergency request received for {emergency_id}"
             })
@@ -60,11 +249,43 @@ async def emergency_websocket(websocket: WebSocket, emergency_id: str):
                 background_tasks=None
             )
 
-            await manager.send_message(websocket, {
+            # Everyone watching this emergency, plus dispatchers
+            hub.publish([emergency_topic(emergency_id), DISPATCHER], {
                 "status": "completed",
+                "emergencyId": emergency_id,
                 "data": response
             })
 
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
         print(f"WebSocket disconnected: {emergency_id}")
+    finally:
+        hub.disconnect(websocket)
+
+
+@router.websocket("/ws/hospital/{hospital_id}")
+async def hospital_websocket(websocket: WebSocket, hospital_id: str):
+    """Incoming patients assigned to one hospital"""
+    await hub.connect(websocket, hospital_topic(hospital_id), channel="hospital")
+    try:
+        await _hold_open(websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.disconnect(websocket)
+
+
+@router.websocket("/ws/dispatcher")
+async def dispatcher_websocket(websocket: WebSocket):
+    """Every registration, dispatch and failure"""
+    await hub.connect(websocket, DISPATCHER, channel="dispatcher")
+    try:
+        await _hold_open(websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.disconnect(websocket)
+
+
+@router.get("/ws/stats")
+async def websocket_stats():
+    return hub.stats()
@@ -1,8 +1,10 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy import create_engine, event, inspect, select, text, update, Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import uuid
 
 
 # ============================================
@@ -19,15 +21,93 @@ DEFAULT_DATABASE_URL = f"sqlite:///{DB_FILE_PATH}"
 
 DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_DATABASE_URL)
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-)
+# "development" keeps SQLite defaults; "production" switches SQLite to WAL
+# with tuned pragmas and sizes the pool for several uvicorn workers.
+DB_PROFILE = os.getenv("DB_PROFILE", "development")
+
+# Applied to every new SQLite connection in the production profile.
+# WAL lets status-poll reads run alongside /api/triage writes, and
+# busy_timeout makes a second writer wait for the lock instead of failing.
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",                 # durable at checkpoints; safe with WAL
+    "busy_timeout": int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64000,                    # negative = KiB, i.e. ~64 MB
+    "temp_store": "MEMORY",
+}
+
+# Per-process pool; every uvicorn worker gets its own. SQLite allows one
+# writer at a time, so a few connections per worker is enough.
+PRODUCTION_POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRODUCTION_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _engine_options(url: str, profile: str) -> dict:
+    options = {}
+    if url.startswith("sqlite") and "+aiosqlite" not in url:
+        options["connect_args"] = {"check_same_thread": False}
+    if profile == "production" and ":memory:" not in url:
+        options.update(PRODUCTION_POOL_OPTIONS)
+    return options
+
+
+def create_db_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE):
+    """Sync engine for `url` configured for the given DB profile."""
+    db_engine = create_engine(url, **_engine_options(url, profile))
+    if profile == "production" and url.startswith("sqlite"):
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+def create_async_db_engine(url: str, profile: str = DB_PROFILE):
+    """Async engine for `url` configured for the given DB profile."""
+    db_engine = create_async_engine(url, **_engine_options(url, profile))
+    if profile == "production" and url.startswith("sqlite"):
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def _async_url(url: str) -> str:
+    """Same database, async driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+# Used by the FastAPI routes so DB I/O never blocks the event loop.
+# Scripts (seeding, verification) keep using the sync SessionLocal.
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+
+# expire_on_commit=False: attributes stay loaded after commit, since lazy
+# refreshes are not allowed outside an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
 # ============================================
 # TABLE 1: EMERGENCIES
 # ============================================
@@ -137,17 +217,160 @@ class Hospital(Base):
 
     # Metadata
     last_updated = Column(DateTime, default=datetime.utcnow)
+    # Bumped on every bed-count change; reservations compare-and-decrement on it
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     def __repr__(self):
         return f"<Hospital(id={self.id}, name={self.name})>"
 
+    @classmethod
+    def reserve_bed(cls, db, hospital_id: str, bed_type: str = "icu", emergency_id=None,
+                    ttl_s: float = 900, max_retries: int = 5):
+        """
+        Take one bed with an optimistic compare-and-decrement:
+
+            UPDATE hospitals SET beds = beds - 1, version = version + 1
+            WHERE id = ? AND version = ? AND beds >= 1
+
+        A concurrent reservation bumps `version` first, so our UPDATE matches
+        no row; we re-read and retry. Returns the BedReservation (flushed, not
+        committed) or None when no bed is left.
+        """
+        column = BED_TYPE_COLUMNS[bed_type]
+        for _ in range(max_retries):
+            current = db.execute(
+                select(cls.version, column).where(cls.id == hospital_id)
+            ).one_or_none()
+            if current is None or (current[1] or 0) < 1:
+                return None
+
+            now = datetime.utcnow()
+            result = db.execute(
+                update(cls)
+                .where(cls.id == hospital_id, cls.version == current[0], column >= 1)
+                .values({column: column - 1, cls.version: cls.version + 1, cls.last_updated: now})
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                reservation = BedReservation(
+                    hospital_id=hospital_id,
+                    emergency_id=None if emergency_id is None else str(emergency_id),
+                    bed_type=bed_type,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=ttl_s),
+                )
+                db.add(reservation)
+                db.flush()
+                return reservation
+        return None
+
+    @classmethod
+    def release_reservation(cls, db, reservation_id: str, status: str = "RELEASED") -> bool:
+        """
+        Give an ACTIVE reservation's bed back. The status flip is itself a
+        conditional UPDATE, so a bed is returned at most once even if expiry
+        and an explicit release race.
+        """
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(BedReservation)
+            .where(BedReservation.id == reservation_id, BedReservation.status == "ACTIVE")
+            .values(status=status, released_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            return False
+
+        reservation = db.get(BedReservation, reservation_id)
+        column = BED_TYPE_COLUMNS[reservation.bed_type]
+        db.execute(
+            update(cls)
+            .where(cls.id == reservation.hospital_id)
+            .values({column: column + 1, cls.version: cls.version + 1, cls.last_updated: now})
+            .execution_options(synchronize_session=False)
+        )
+        return True
+
+    @classmethod
+    def confirm_reservation(cls, db, reservation_id: str) -> bool:
+        """Patient admitted: the bed stays taken and the hold no longer expires."""
+        result = db.execute(
+            update(BedReservation)
+            .where(BedReservation.id == reservation_id, BedReservation.status == "ACTIVE")
+            .values(status="CONFIRMED", released_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @classmethod
+    def release_expired_reservations(cls, db, now: datetime = None) -> list:
+        """Return beds held past their expiry; gives the affected hospital ids."""
+        now = now or datetime.utcnow()
+        expired = db.execute(
+            select(BedReservation.id, BedReservation.hospital_id).where(
+                BedReservation.status == "ACTIVE", BedReservation.expires_at <= now
+            )
+        ).all()
+        return sorted({
+            hospital_id for reservation_id, hospital_id in expired
+            if cls.release_reservation(db, reservation_id, status="EXPIRED")
+        })
+
+
+# ============================================
+# TABLE 4: BED RESERVATIONS
+# ============================================
+class BedReservation(Base):
+    """Temporary hold on a hospital bed for an emergency in transit"""
+    __tablename__ = "bed_reservations"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    hospital_id = Column(String(100), nullable=False, index=True)
+    emergency_id = Column(String(100), nullable=True, index=True)
+    bed_type = Column(String(20), nullable=False)      # "icu" or "general"
+
+    # ACTIVE -> CONFIRMED (admitted) | RELEASED (cancelled) | EXPIRED (swept)
+    status = Column(String(20), nullable=False, default="ACTIVE", index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    released_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<BedReservation(id={self.id}, hospital={self.hospital_id}, status={self.status})>"
+
+
+BED_TYPE_COLUMNS = {
+    "icu": Hospital.icu_beds_available,
+    "general": Hospital.general_beds_available,
+}
+
 
 # ============================================
 # DATABASE HELPER FUNCTIONS
 # ============================================
+# Columns added after the first release; create_all() does not alter
+# existing tables, so init_db() adds them to older database files.
+ADDED_COLUMNS = {
+    "hospitals": {"version": "INTEGER NOT NULL DEFAULT 0"},
+}
+
+
+def _add_missing_columns(db_engine):
+    inspector = inspect(db_engine)
+    with db_engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    print(f"🔧 Added column {table}.{name}")
+
+
 def init_db():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(engine)
     print("✅ Database tables created successfully!")
 
 
@@ -160,6 +383,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Get async database session (for FastAPI dependency injection)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def drop_all_tables():
     """WARNING: Deletes all data! Use only for testing"""
     Base.metadata.drop_all(bind=engine)
@@ -182,6 +411,7 @@ if __name__ == "__main__":
     print("   1. emergencies - Stores emergency incidents")
     print("   2. agent_logs - Tracks agent actions with DIDs")
     print("   3. hospitals - Hospital information and availability")
+    print("   4. bed_reservations - Temporary bed holds for incoming patients")
     print()
     print("✅ Database setup complete!")
     print(f"💾 Database file: {DB_FILE_PATH}")
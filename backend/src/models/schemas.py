@@ -26,6 +26,11 @@ class TriageInput(BaseModel):
     location: Optional[LocationData] = None
 
 
+class TriageBatchRequest(BaseModel):
+    """Mass-casualty registration: many patients from one incident"""
+    patients: List[TriageInput] = Field(..., min_length=1, max_length=1000)
+
+
 class EmergencyRequest(BaseModel):
     """Legacy schema for backward compatibility"""
     location: LocationData
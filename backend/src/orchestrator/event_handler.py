@@ -2,61 +2,69 @@
 
 from typing import Dict, Any
 
-from src.agents.triage_agent import triage_agent
-from src.agents.routing_agent import routing_agent
-from src.agents.notification_agent import notification_agent
-from src.zynd.mock_zynd import zynd_registry
+from src.api.websocket import DISPATCHER, emergency_topic, hospital_topic, hub
+from src.orchestrator.orchestrator import orchestrator as emergency_orchestrator
+from src.zynd.context import EmergencyContext
 
 
 class EmergencyOrchestrator:
     """
-    Lightweight Zynd-style orchestrator for simple event-based flows.
-    Uses DIDs + registry instead of direct .execute() calls.
+    Event-based entry point (scheduler jobs from /api/triage) onto the same
+    stage graph as the request-driven orchestrator.
     """
 
-    def __init__(self):
-        self.triage_did = triage_agent.did
-        self.routing_did = routing_agent.did
-        self.notification_did = notification_agent.did
-
-    async def handle_emergency(self, emergency_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def handle_emergency(
+        self,
+        emergency_id: int,
+        payload: Dict[str, Any],
+        context: EmergencyContext = None,
+    ) -> Dict[str, Any]:
         """
         Handle emergency with emergency_id and payload.
         """
         print(f"🚨 Orchestrator processing Emergency ID: {emergency_id}")
+        context = context or EmergencyContext(emergency_id=emergency_id)
+        location = payload.get("location") or {}
 
-        # 1️⃣ TRIAGE via Zynd
-        triage_result = await zynd_registry.call(self.triage_did, payload)
-
-        # 2️⃣ ROUTING via Zynd
-        routing_result = await zynd_registry.call(
-            self.routing_did,
-            {
-                "emergency_location": payload.get("location"),
-                "hospitals": payload.get("candidate_hospitals", []),
-            },
-        )
-
-        # 3️⃣ NOTIFICATION via Zynd
-        notification_result = await zynd_registry.call(
-            self.notification_did,
-            {
-                "emergency_data": {
-                    "severity": triage_result["severity"],
-                    "priority": triage_result["priority"],
+        try:
+            run = await emergency_orchestrator.run_pipeline(
+                {
+                    "triage_input": payload,
+                    "location": (location.get("lat"), location.get("lng")),
                     "description": payload.get("description", ""),
                     "address": payload.get("address", ""),
                     "contact_email": payload.get("contact_email"),
+                    "candidate_hospitals": payload.get("candidate_hospitals"),
                 },
-                "hospital_data": routing_result,
-            },
-        )
+                context,
+            )
+        except Exception as e:
+            hub.publish([emergency_topic(emergency_id), DISPATCHER], {
+                "type": "emergency.failed",
+                "emergencyId": emergency_id,
+                "error": getattr(e, "detail", None) or str(e) or type(e).__name__,
+            })
+            raise
+        reservation = run.results["routing"]["reservation"]
+        hospital = run.results["routing"]["hospital"]
+        route_info = hospital.get("route_info") or {}
+        hub.publish([emergency_topic(emergency_id), hospital_topic(hospital["id"]), DISPATCHER], {
+            "type": "emergency.dispatched",
+            "emergencyId": emergency_id,
+            "severity": (run.results["triage"] or {}).get("severity"),
+            "hospitalId": hospital["id"],
+            "hospitalName": hospital.get("name"),
+            "etaMin": route_info.get("duration_min"),
+            "bedReservationId": reservation.id if reservation else None,
+        })
 
         return {
             "emergency_id": emergency_id,
-            "triage": triage_result,
-            "routing": routing_result,
-            "notification": notification_result,
+            "triage": run.results["triage"],
+            "routing": run.results["routing"]["hospital"],
+            "bed_reservation_id": reservation.id if reservation else None,
+            "notification": run.results["notify"],
+            "stage_timings_ms": run.timings_ms,
         }
 
 
@@ -1,20 +1,70 @@
 from fastapi import HTTPException
 import uuid
 
+from config import get_settings
+
 from src.agents.triage_agent import triage_agent
 from src.agents.hospital_agent import hospital_agent
 from src.agents.routing_agent import routing_agent
 from src.agents.notification_agent import notification_agent
+from src.orchestrator.pipeline import Pipeline, PipelineRun, Stage
+from src.services.hospital_registry import hospital_registry
 from src.services.maps_service import maps_service
-from src.database.db import MOCK_HOSPITALS
+from src.services.spatial_index import hospital_coords
+from src.zynd.context import EmergencyContext
 from src.zynd.mock_zynd import zynd_registry
 
+settings = get_settings()
+
+# Bed held at the chosen hospital while the patient is in transit
+BED_TYPE_BY_SEVERITY = {"RED": "icu", "YELLOW": "general"}
+
+
+async def route_and_reserve(routing_did: str, emergency_coords: tuple, candidates: list,
+                            severity: str, context: EmergencyContext = None):
+    """
+    Ask the routing agent for the fastest hospital, then hold a bed there.
+    If another emergency took the last bed first, drop that hospital and
+    re-route over the rest (routes are already memoized in the context).
+    Returns (best_hospital, reservation); reservation is None when the
+    severity needs no bed or capacity is not tracked in the database.
+    """
+    bed_type = BED_TYPE_BY_SEVERITY.get(severity) if hospital_registry.tracks_capacity else None
+    emergency_id = context.emergency_id if context else None
+    remaining = list(candidates)
+
+    while remaining:
+        best_hospital = await zynd_registry.call(
+            routing_did,
+            {"emergency_location": emergency_coords, "hospitals": remaining},
+            context=context,
+        )
+        if not best_hospital or bed_type is None:
+            return best_hospital, None
+
+        reservation = await hospital_registry.reserve_bed(
+            best_hospital["id"], bed_type, emergency_id
+        )
+        if reservation is not None:
+            return best_hospital, reservation
+
+        print(f"🛏️  No {bed_type} bed left at {best_hospital['name']}, re-routing")
+        remaining = [h for h in remaining if h["id"] != best_hospital["id"]]
+
+    return None, None
+
 
 class EmergencyOrchestrator:
     """
-    Central coordinator that manages the emergency workflow:
-    Triage → Hospital → Routing → Notification
-    Now routed through a Zynd-style registry.
+    Central coordinator that manages the emergency workflow as a stage graph,
+    routed through a Zynd-style registry:
+
+        triage ─────────────┐
+        prefilter ──────────┴─> hospital ─> routing ─┐
+        geocode ─────────────────────────────────────┴─> notify
+
+    Triage, address lookup and the nearby-hospital route prefetch have no
+    dependencies and run concurrently.
     """
 
     def __init__(self):
@@ -23,85 +73,152 @@ class EmergencyOrchestrator:
         self.routing_did = routing_agent.did
         self.notification_did = notification_agent.did
 
-    async def handle_emergency(self, request, background_tasks):
-        request_id = str(uuid.uuid4())
-
-        # 1️⃣ TRIAGE via Zynd
-        triage_input = {
-            "symptoms": request.symptoms,
-            "vitals": request.vitals,
-            "age": request.age,
-        }
-        triage_result = await zynd_registry.call(self.triage_did, triage_input)
-
-        # 2️⃣ Address from maps_service
-        address = await maps_service.get_location_address(
-            request.location.lat, request.location.lng
-        )
-        emergency_coords = (request.location.lat, request.location.lng)
-
-        # 3️⃣ HOSPITALS via Zynd
-        top_hospitals = await zynd_registry.call(
+        timeouts = settings.pipeline_stage_timeout_s
+        self.pipeline = Pipeline("emergency", [
+            Stage("triage", self._triage, timeout_s=timeouts.get("triage")),
+            Stage("geocode", self._geocode, timeout_s=timeouts.get("geocode"), optional=True),
+            Stage("prefilter", self._prefilter, timeout_s=timeouts.get("prefilter"), optional=True),
+            Stage("hospital", self._hospital, deps=("triage", "prefilter"),
+                  timeout_s=timeouts.get("hospital")),
+            Stage("routing", self._routing, deps=("hospital",), timeout_s=timeouts.get("routing")),
+            Stage("notify", self._notify, deps=("routing", "geocode"),
+                  timeout_s=timeouts.get("notify"), optional=True),
+        ])
+
+    # ------------------------------------------------------------------
+    # Stages. Inputs: triage_input, location (lat, lng), description,
+    # contact_email, optional candidate_hospitals / background_tasks.
+    # ------------------------------------------------------------------
+    async def _triage(self, run: PipelineRun):
+        # Skipped if the caller already triaged
+        if run.context.triage is None:
+            run.context.triage = await zynd_registry.call(
+                self.triage_did, run.inputs["triage_input"], context=run.context
+            )
+        return run.context.triage
+
+    async def _geocode(self, run: PipelineRun):
+        lat, lng = run.inputs["location"]
+        return await maps_service.get_location_address(lat, lng)
+
+    async def _prefilter(self, run: PipelineRun):
+        """
+        Nearest hospitals regardless of severity, with their routes fetched
+        into the context while triage and geocoding are still running.
+        """
+        if run.inputs.get("candidate_hospitals"):
+            return None
+        location = run.inputs["location"]
+        nearby = hospital_registry.snapshot.index.nearest(location, k=settings.hospital_search_k)
+        await maps_service.get_route_matrix(location, [hospital_coords(h) for _, h in nearby])
+        return [h["id"] for _, h in nearby]
+
+    async def _search_hospitals(self, run: PipelineRun) -> list:
+        triage_result = run.results["triage"]
+        return await zynd_registry.call(
             self.hospital_did,
             {
                 "severity": triage_result["severity"],
-                "location": emergency_coords,
+                "location": run.inputs["location"],
                 "required_specialists": triage_result["recommended_specialists"],
-                "hospital_db": MOCK_HOSPITALS,
             },
-        )
+            context=run.context,
+        ) or []
 
+    async def _hospital(self, run: PipelineRun):
+        if run.inputs.get("candidate_hospitals"):
+            return run.inputs["candidate_hospitals"]
+
+        top_hospitals = await self._search_hospitals(run)
         if not top_hospitals:
-            raise HTTPException(
-                status_code=404, detail="No suitable hospitals found"
-            )
+            raise HTTPException(status_code=404, detail="No suitable hospitals found")
+        return top_hospitals
 
+    async def _route(self, run: PipelineRun, hospitals: list):
         routing_candidates = [
-            {"id": h["id"], "name": h["name"], "coords": h["coords"]}
-            for h in top_hospitals
+            {"id": h["id"], "name": h["name"], "coords": hospital_coords(h)}
+            for h in hospitals
         ]
-
-        # 4️⃣ ROUTING via Zynd
-        best_hospital = await zynd_registry.call(
+        # Reuses the routes prefilter/HospitalAgent left in the context,
+        # plus an optimistic bed hold at the winner
+        return await route_and_reserve(
             self.routing_did,
-            {
-                "emergency_location": emergency_coords,
-                "hospitals": routing_candidates,
-            },
+            run.inputs["location"],
+            routing_candidates,
+            run.results["triage"]["severity"],
+            context=run.context,
         )
 
+    async def _routing(self, run: PipelineRun):
+        best_hospital, reservation = await self._route(run, run.results["hospital"])
+        if not best_hospital and run.inputs.get("candidate_hospitals"):
+            # The caller's hospitals (a batch plan) lost their bed or route
+            # since they were chosen: search the rest as usual
+            tried = {h["id"] for h in run.results["hospital"]}
+            print("🔁 Supplied hospitals unavailable, falling back to hospital search")
+            fallback = [h for h in await self._search_hospitals(run) if h["id"] not in tried]
+            if fallback:
+                best_hospital, reservation = await self._route(run, fallback)
         if not best_hospital:
-            raise HTTPException(
-                status_code=404, detail="No reachable hospitals found"
-            )
+            raise HTTPException(status_code=404, detail="No reachable hospitals found")
+        return {"hospital": best_hospital, "reservation": reservation}
 
-        # 5️⃣ NOTIFICATION via Zynd (background)
-        emergency_data = {
-            "severity": triage_result["severity"],
-            "priority": triage_result["priority"],
-            "description": request.description,
-            "address": address,
-            "contact_email": request.contact_email,
+    async def _notify(self, run: PipelineRun):
+        triage_result = run.results["triage"]
+        payload = {
+            "emergency_data": {
+                "severity": triage_result["severity"],
+                "priority": triage_result["priority"],
+                "description": run.inputs.get("description", ""),
+                "address": run.results.get("geocode") or run.inputs.get("address", ""),
+                "contact_email": run.inputs.get("contact_email"),
+            },
+            "hospital_data": run.results["routing"]["hospital"],
         }
+        # Request-driven callers answer first and send the alert afterwards
+        background_tasks = run.inputs.get("background_tasks")
+        if background_tasks is not None:
+            background_tasks.add_task(
+                zynd_registry.call, self.notification_did, payload, context=run.context
+            )
+            return {"status": "queued"}
+        return await zynd_registry.call(self.notification_did, payload, context=run.context)
+
+    async def run_pipeline(self, inputs: dict, context: EmergencyContext) -> PipelineRun:
+        return await self.pipeline.run(inputs, context)
+
+    async def handle_emergency(self, request, background_tasks, context: EmergencyContext = None):
+        request_id = str(uuid.uuid4())
+        # Shared by every stage so no route/address is fetched twice
+        context = context or EmergencyContext(emergency_id=request_id)
 
-        background_tasks.add_task(
-            zynd_registry.call,
-            self.notification_did,
+        run = await self.run_pipeline(
             {
-                "emergency_data": emergency_data,
-                "hospital_data": best_hospital,
+                "triage_input": {
+                    "symptoms": request.symptoms,
+                    "vitals": request.vitals,
+                    "age": request.age,
+                },
+                "location": (request.location.lat, request.location.lng),
+                "description": request.description,
+                "contact_email": request.contact_email,
+                "background_tasks": background_tasks,
             },
+            context,
         )
+        best_hospital = run.results["routing"]["hospital"]
+        reservation = run.results["routing"]["reservation"]
 
-        # 6️⃣ RESPONSE
         return {
             "request_id": request_id,
             "status": "success",
-            "triage_result": triage_result,
+            "triage_result": run.results["triage"],
             "assigned_hospital": best_hospital["name"],
+            "bed_reservation_id": reservation.id if reservation else None,
             "eta_minutes": best_hospital["route_info"]["duration_min"],
-            "top_hospitals": top_hospitals,
-            "detected_address": address,
+            "top_hospitals": run.results["hospital"],
+            "detected_address": run.results["geocode"],
+            "stage_timings_ms": run.timings_ms,
         }
 
 
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.services.metrics import STAGE_LATENCY, STAGE_RUNS
+from src.zynd.context import EmergencyContext, use_context
+
+
+class StageTimeout(Exception):
+    """A stage ran past its timeout."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline. `fn(run)` reads upstream results from
+    `run.results[dep]`. A failing optional stage yields None and its
+    dependents still run; a failing required stage fails the whole run.
+    """
+    name: str
+    fn: Callable[["PipelineRun"], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    timeout_s: Optional[float] = None
+    optional: bool = False
+
+
+@dataclass
+class PipelineRun:
+    inputs: Dict[str, Any]
+    context: Optional[EmergencyContext] = None
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+
+class Pipeline:
+    """
+    Declarative stage graph. Every stage whose dependencies have finished is
+    started at once, so independent work (address lookup, hospital
+    pre-filtering, triage) overlaps instead of running back to back.
+    """
+
+    def __init__(self, name: str, stages: Iterable[Stage]):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        self._check_graph()
+
+    def _check_graph(self):
+        """Every dependency names a stage, and there are no cycles."""
+        for stage in self.stages.values():
+            missing = [d for d in stage.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown {missing}")
+
+        done, visiting = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name!r}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def _run_stage(self, stage: Stage, run: PipelineRun):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with use_context(run.context):
+                if stage.timeout_s is None:
+                    result = await stage.fn(run)
+                else:
+                    try:
+                        result = await asyncio.wait_for(stage.fn(run), stage.timeout_s)
+                    except asyncio.TimeoutError:
+                        outcome = "timeout"
+                        raise StageTimeout(
+                            f"Stage {stage.name!r} timed out after {stage.timeout_s}s"
+                        ) from None
+            outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            run.timings_ms[stage.name] = round(elapsed * 1000, 2)
+            STAGE_LATENCY.observe(elapsed, self.name, stage.name)
+            STAGE_RUNS.inc(self.name, stage.name, outcome)
+
+    async def run(self, inputs: Dict[str, Any], context: EmergencyContext = None) -> PipelineRun:
+        """
+        Execute the graph. Raises the original exception of the first
+        required stage that fails, after cancelling whatever is still running.
+        """
+        run = PipelineRun(inputs=inputs, context=context)
+        waiting = {name: set(stage.deps) for name, stage in self.stages.items()}
+        running: Dict[asyncio.Task, str] = {}
+        started = time.perf_counter()
+
+        def start_ready():
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                task = asyncio.create_task(self._run_stage(self.stages[name], run))
+                running[task] = name
+
+        try:
+            start_ready()
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    stage = self.stages[name]
+                    try:
+                        run.results[name] = task.result()
+                    except Exception as e:
+                        if not stage.optional:
+                            run.errors[name] = str(e) or type(e).__name__
+                            raise
+                        print(f"⚠️  Optional stage {name} failed: {e}")
+                        run.errors[name] = str(e) or type(e).__name__
+                        run.results[name] = None
+                    for deps in waiting.values():
+                        deps.discard(name)
+                start_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            run.total_ms = round((time.perf_counter() - started) * 1000, 2)
+            print(f"⏱️  {self.name} pipeline {run.total_ms} ms: {run.timings_ms}")
+
+        return run
@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import get_settings
+
+settings = get_settings()
+
+# Triage priorities: 1 = RED (most urgent) ... 3 = GREEN
+PRIORITY_LEVELS = (1, 2, 3)
+PRIORITY_BY_SEVERITY = {"RED": 1, "YELLOW": 2, "GREEN": 3}
+WAIT_SAMPLES = 1000  # recent wait times kept per severity for percentiles
+
+
+@dataclass
+class ScheduledJob:
+    seq: int
+    priority: int
+    severity: str
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+
+    def effective_priority(self, now: float, aging_s: float) -> float:
+        """Priority improves by one level for every `aging_s` spent waiting."""
+        if aging_s <= 0:
+            return self.priority
+        return self.priority - (now - self.enqueued_at) / aging_s
+
+
+class PriorityScheduler:
+    """
+    Runs orchestrator work off the request path, most urgent first.
+
+    Jobs wait in one FIFO per triage priority. A free worker takes the head
+    with the best *effective* priority (triage priority minus time waited /
+    aging_s, ties broken by arrival), so RED goes first but a GREEN case
+    that has waited long enough still gets through. Each severity can be
+    capped so a flood of one kind cannot take every worker.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        severity_limits: Optional[Dict[str, int]] = None,
+        aging_s: float = 30.0,
+    ):
+        self.workers = max(1, workers)
+        self.severity_limits = dict(severity_limits or {})
+        self.aging_s = aging_s
+
+        self._queues: Dict[int, deque] = {level: deque() for level in PRIORITY_LEVELS}
+        self._running: Dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self._cond: Optional[asyncio.Condition] = None
+        self._tasks: list = []
+        self._accepting = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._waits: Dict[str, deque] = defaultdict(lambda: deque(maxlen=WAIT_SAMPLES))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self):
+        if self._tasks:
+            return
+        self._cond = asyncio.Condition()
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"scheduler-worker-{i}")
+            for i in range(self.workers)
+        ]
+        print(f"🗓️  Scheduler started with {self.workers} workers")
+
+    async def stop(self, drain_timeout_s: float = 10.0):
+        """Stop taking work, let queued jobs finish (up to the timeout), then cancel."""
+        if not self._tasks:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._drained(), drain_timeout_s)
+        except asyncio.TimeoutError:
+            print(f"⚠️  Scheduler stopped with {self.queue_depth()} jobs still queued")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _drained(self):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self.queue_depth() == 0 and not any(self._running.values())
+            )
+
+    # ------------------------------------------------------------------
+    # Submission / dispatch
+    # ------------------------------------------------------------------
+    async def submit(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        priority: Optional[int] = None,
+        severity: Optional[str] = None,
+        name: Optional[str] = None,
+        **kwargs,
+    ) -> ScheduledJob:
+        """Queue `await fn(*args, **kwargs)`; priority defaults from severity."""
+        if not self._tasks:
+            await self.start()
+        if not self._accepting:
+            raise RuntimeError("Scheduler is shutting down")
+
+        severity = (severity or "UNKNOWN").upper()
+        if priority is None:
+            priority = PRIORITY_BY_SEVERITY.get(severity, PRIORITY_LEVELS[0])
+        priority = min(max(int(priority), PRIORITY_LEVELS[0]), PRIORITY_LEVELS[-1])
+
+        job = ScheduledJob(
+            seq=next(self._seq),
+            priority=priority,
+            severity=severity,
+            name=name or getattr(fn, "__qualname__", "job"),
+            fn=fn,
+            args=args,
+            kwargs=kwargs,
+        )
+        async with self._cond:
+            self._queues[priority].append(job)
+            self.submitted += 1
+            self._cond.notify()
+        return job
+
+    def _has_capacity(self, severity: str) -> bool:
+        limit = self.severity_limits.get(severity)
+        return limit is None or self._running[severity] < limit
+
+    def _pick(self) -> Optional[ScheduledJob]:
+        """
+        Best eligible job by effective priority. Each queue offers its oldest
+        job whose severity still has a free slot, so jobs held back by a
+        severity cap don't block the ones behind them.
+        """
+        now = time.monotonic()
+        best_key, best_job, best_queue = None, None, None
+        for queue in self._queues.values():
+            # First job in this queue whose severity still has a free slot
+            job = next((j for j in queue if self._has_capacity(j.severity)), None)
+            if job is None:
+                continue
+            key = (job.effective_priority(now, self.aging_s), job.seq)
+            if best_key is None or key < best_key:
+                best_key, best_job, best_queue = key, job, queue
+        if best_job is not None:
+            best_queue.remove(best_job)
+        return best_job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            async with self._cond:
+                job = self._pick()
+                while job is None:
+                    await self._cond.wait()
+                    job = self._pick()
+                self._running[job.severity] += 1
+
+            job.started_at = time.monotonic()
+            self._waits[job.severity].append(job.started_at - job.enqueued_at)
+            try:
+                await job.fn(*job.args, **job.kwargs)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Scheduled job {job.name} ({job.severity}) failed: {e}")
+            finally:
+                async with self._cond:
+                    self._running[job.severity] -= 1
+                    self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    @staticmethod
+    def _wait_summary(samples) -> dict:
+        if not samples:
+            return {"count": 0}
+        ordered = sorted(samples)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+        return {
+            "count": len(ordered),
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "workers": self.workers,
+            "queue_depth": {str(level): len(q) for level, q in self._queues.items()},
+            "oldest_wait_ms": {
+                str(level): round((now - q[0].enqueued_at) * 1000, 1) if q else 0.0
+                for level, q in self._queues.items()
+            },
+            "running": {k: v for k, v in self._running.items() if v},
+            "severity_limits": self.severity_limits,
+            "wait_time": {sev: self._wait_summary(w) for sev, w in self._waits.items()},
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+scheduler = PriorityScheduler(
+    workers=settings.scheduler_workers,
+    severity_limits=settings.scheduler_severity_concurrency,
+    aging_s=settings.scheduler_aging_s,
+)
@@ -0,0 +1,214 @@
+import asyncio
+import json
+from typing import Any, List, Optional
+
+from sqlalchemy import insert
+
+from config import get_settings
+from src.database.db import AgentLog, AsyncSessionLocal
+from src.zynd.interceptors import AgentCallRecord
+
+settings = get_settings()
+
+OVERFLOW_POLICIES = ("drop", "block", "sample")
+
+# agent_logs.emergency_id is NOT NULL; calls outside an emergency (or keyed
+# by a request UUID) are logged against 0.
+NO_EMERGENCY_ID = 0
+
+
+def _jsonable(value: Any) -> Any:
+    """Agent payloads hold tuples, mapping proxies, datetimes: coerce to JSON."""
+    if value is None:
+        return None
+    return json.loads(json.dumps(value, default=lambda o: dict(o) if hasattr(o, "keys") else str(o)))
+
+
+def _emergency_id(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return NO_EMERGENCY_ID
+
+
+def record_to_row(record: AgentCallRecord) -> dict:
+    """AgentCallRecord -> agent_logs column values."""
+    return {
+        "agent_id": record.did,
+        "agent_type": record.agent_type,
+        "agent_name": record.agent_name,
+        "emergency_id": _emergency_id(record.emergency_id),
+        "action": record.action,
+        "input_data": _jsonable(record.input_data),
+        "output_data": _jsonable(record.output_data),
+        "processing_time_ms": int(round(record.processing_time_ms)),
+        "success": "SUCCESS" if record.success else "FAILED",
+        "error_message": record.error_message,
+        "timestamp": record.timestamp,
+    }
+
+
+class AgentLogSink:
+    """Persists every agent call record to `agent_logs`, one row per call."""
+
+    async def emit(self, record: AgentCallRecord):
+        async with AsyncSessionLocal() as db:
+            db.add(AgentLog(**record_to_row(record)))
+            await db.commit()
+
+
+class BatchedAgentLogSink:
+    """
+    Keeps agent_logs writes off the request path.
+
+    `emit` only enqueues the record on a bounded queue; a background writer
+    drains it and bulk-inserts up to `batch_size` rows in one transaction,
+    at least every `flush_interval_ms` while records are waiting. When the
+    queue is full, the overflow policy decides:
+
+      drop   - discard the new record (counted)
+      block  - wait for room (back-pressure on the caller)
+      sample - above half full keep 1 in `sample_every` records, drop when full
+
+    `stop()` drains and writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: float = 250,
+        overflow: str = "drop",
+        sample_every: int = 10,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_ms / 1000
+        self.overflow = overflow
+        self.sample_every = max(1, sample_every)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._sample_counter = 0
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="agent-log-writer")
+
+    async def stop(self, timeout_s: float = 10.0):
+        """Flush everything queued, then stop the writer."""
+        if self._task is None:
+            return
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._task, timeout_s)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            print(f"⚠️  Agent log writer stopped with {self._queue.qsize()} rows unwritten")
+        self._task = None
+
+    # ------------------------------------------------------------------
+    # Producer side (called from the interceptor on every agent call)
+    # ------------------------------------------------------------------
+    async def emit(self, record: AgentCallRecord):
+        if self._task is None:
+            if self._closing:
+                self.dropped += 1
+                return
+            await self.start()
+        queue = self._queue
+
+        if self.overflow == "sample" and queue.qsize() >= self.max_queue // 2:
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_every:
+                self.dropped += 1
+                return
+
+        if self.overflow == "block":
+            await queue.put(record)
+        else:
+            try:
+                queue.put_nowait(record)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return
+        self.enqueued += 1
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+    async def _run(self):
+        while not (self._closing and self._queue.empty()):
+            batch = await self._collect()
+            if batch:
+                await self._write(batch)
+
+    async def _collect(self) -> List[AgentCallRecord]:
+        """Up to batch_size records, waiting at most one flush interval."""
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval_s
+        batch = []
+        while len(batch) < self.batch_size:
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            if len(batch) >= self.batch_size or self._closing:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: List[AgentCallRecord]):
+        try:
+            rows = [record_to_row(record) for record in batch]
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(AgentLog), rows)
+                await db.commit()
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"❌ Failed to write {len(batch)} agent log rows: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "overflow_policy": self.overflow,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+agent_log_sink = AgentLogSink()
+
+# Used by the app: one bulk INSERT per batch instead of a commit per call
+batched_agent_log_sink = BatchedAgentLogSink(
+    max_queue=settings.agent_log_queue_size,
+    batch_size=settings.agent_log_batch_size,
+    flush_interval_ms=settings.agent_log_flush_ms,
+    overflow=settings.agent_log_overflow,
+    sample_every=settings.agent_log_sample_every,
+)
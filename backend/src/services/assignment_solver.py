@@ -0,0 +1,219 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import get_settings
+from src.services.concurrency import gather_bounded
+from src.services.maps_service import maps_service
+from src.services.spatial_index import hospital_coords
+
+settings = get_settings()
+
+# Bed pool a severity competes for (same fields HospitalAgent checks);
+# severities without a pool need no bed and are never capacity-limited.
+CAPACITY_FIELD_BY_SEVERITY = {"RED": "icu_beds_available", "YELLOW": "emergency_beds_available"}
+
+# Straight-line ETAs stand in for pairs outside each patient's road-routed
+# nearest hospitals; scale them up so they don't look better than real roads.
+ROAD_DETOUR_FACTOR = 1.4
+
+
+def min_cost_assignment(cost: np.ndarray, capacity: Sequence[int]) -> np.ndarray:
+    """
+    Assign each row (patient) to at most one column (bed pool) without
+    exceeding column capacities, assigning as many rows as possible and, among
+    those assignments, minimizing total cost. `inf` marks a forbidden pair.
+    Returns the column per row, -1 where no column could take it.
+
+    Successive shortest augmenting paths with Johnson potentials (a
+    capacitated Hungarian method): rows are added one at a time and may bump
+    earlier rows to other columns when that lowers the total. Each search is
+    a dense Dijkstra whose row scans are single NumPy expressions, and it
+    stops at the first column with spare capacity.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n_rows, n_cols = cost.shape
+    if n_rows == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Overflow column: any real assignment beats it, so the search never fails
+    finite = cost[np.isfinite(cost)]
+    penalty = (float(finite.max()) if finite.size else 0.0) * (n_rows + 1) + 1.0
+    cost = np.hstack([cost, np.full((n_rows, 1), penalty)])
+    capacity = np.append(np.asarray(capacity, dtype=np.int64), n_rows)
+    overflow = n_cols
+
+    pi_row = np.zeros(n_rows)
+    pi_col = np.zeros(n_cols + 1)
+    assigned = np.full(n_rows, -1, dtype=np.int64)
+    load = np.zeros(n_cols + 1, dtype=np.int64)
+    members: List[set] = [set() for _ in range(n_cols + 1)]
+
+    for source in range(n_rows):
+        dist_row = np.full(n_rows, np.inf)
+        dist_col = np.full(n_cols + 1, np.inf)
+        open_row = np.ones(n_rows, dtype=bool)
+        open_col = np.ones(n_cols + 1, dtype=bool)
+        prev_col = np.full(n_cols + 1, -1, dtype=np.int64)   # row each column was reached from
+        dist_row[source] = 0.0
+
+        while True:
+            masked_row = np.where(open_row, dist_row, np.inf)
+            masked_col = np.where(open_col, dist_col, np.inf)
+            i, j = int(masked_row.argmin()), int(masked_col.argmin())
+            if masked_row[i] <= masked_col[j]:
+                d = masked_row[i]
+                open_row[i] = False
+                candidate = d + cost[i] + pi_row[i] - pi_col
+                better = open_col & (candidate < dist_col)
+                dist_col[better] = candidate[better]
+                prev_col[better] = i
+            else:
+                d = masked_col[j]
+                open_col[j] = False
+                if load[j] < capacity[j]:
+                    target, shortest = j, d
+                    break
+                # Residual edges back to the rows already in this column
+                for k in members[j]:
+                    if open_row[k]:
+                        candidate = d - cost[k, j] + pi_col[j] - pi_row[k]
+                        if candidate < dist_row[k]:
+                            dist_row[k] = candidate
+
+        pi_row += np.minimum(dist_row, shortest)
+        pi_col += np.minimum(dist_col, shortest)
+
+        # Walk the path back: each row moves into the column that reached it
+        j = target
+        while True:
+            i = int(prev_col[j])
+            previous = int(assigned[i])
+            assigned[i] = j
+            members[j].add(i)
+            load[j] += 1
+            if i == source:
+                break
+            members[previous].discard(i)
+            load[previous] -= 1
+            j = previous
+
+    assigned[assigned == overflow] = -1
+    return assigned
+
+
+def greedy_assignment(cost: np.ndarray, capacity: Sequence[int]) -> np.ndarray:
+    """Rows in order, each takes its cheapest column with room left (per-emergency behaviour)."""
+    cost = np.asarray(cost, dtype=np.float64)
+    remaining = np.asarray(capacity, dtype=np.int64).copy()
+    assigned = np.full(cost.shape[0], -1, dtype=np.int64)
+    for i in range(cost.shape[0]):
+        options = np.where(remaining > 0, cost[i], np.inf)
+        j = int(options.argmin()) if options.size else -1
+        if j >= 0 and np.isfinite(options[j]):
+            assigned[i] = j
+            remaining[j] -= 1
+    return assigned
+
+
+SOLVERS = {"min_cost": min_cost_assignment, "greedy": greedy_assignment}
+
+
+@dataclass
+class AssignmentPlan:
+    hospital_index: np.ndarray      # per patient, -1 = no eligible hospital with a free bed
+    eta_min: np.ndarray             # per patient, nan where unassigned
+    method: str
+    solve_ms: float
+
+    @property
+    def unassigned(self) -> int:
+        return int((self.hospital_index < 0).sum())
+
+    @property
+    def total_eta_min(self) -> float:
+        return float(np.nansum(self.eta_min))
+
+
+def plan_assignments(
+    patients: Sequence[dict],
+    hospitals: Sequence[dict],
+    eta: np.ndarray,
+    method: str = "min_cost",
+) -> AssignmentPlan:
+    """
+    Place triaged patients (`severity`, `recommended_specialists`) on
+    hospitals given a (patients x hospitals) ETA matrix in minutes. A
+    hospital is eligible when it has every required specialist; RED and
+    YELLOW patients also compete for the hospital's ICU / emergency beds.
+    Each bed pool is an independent problem, so they are solved separately.
+    """
+    started = time.perf_counter()
+    solve = SOLVERS[method]
+    eta = np.asarray(eta, dtype=np.float64).reshape(len(patients), len(hospitals))
+    specialists = [frozenset(h.get("specialists", ())) for h in hospitals]
+    eligible_cache: Dict[frozenset, np.ndarray] = {}
+
+    def eligible(required) -> np.ndarray:
+        key = frozenset(required or ())
+        if key not in eligible_cache:
+            eligible_cache[key] = np.array([key <= s for s in specialists], dtype=bool)
+        return eligible_cache[key]
+
+    groups: Dict[Optional[str], List[int]] = {}
+    for i, patient in enumerate(patients):
+        groups.setdefault(CAPACITY_FIELD_BY_SEVERITY.get(patient.get("severity")), []).append(i)
+
+    hospital_index = np.full(len(patients), -1, dtype=np.int64)
+    for field, rows in groups.items():
+        if field is None:
+            capacity = np.full(len(hospitals), len(rows), dtype=np.int64)
+        else:
+            capacity = np.array([max(int(h.get(field) or 0), 0) for h in hospitals], dtype=np.int64)
+        mask = np.array([eligible(patients[i].get("recommended_specialists")) for i in rows])
+        mask = mask.reshape(len(rows), len(hospitals))
+        cost = np.where(mask, eta[rows], np.inf)
+        hospital_index[rows] = solve(cost, capacity)
+
+    assigned = hospital_index >= 0
+    eta_min = np.full(len(patients), np.nan)
+    eta_min[assigned] = eta[np.flatnonzero(assigned), hospital_index[assigned]]
+    return AssignmentPlan(
+        hospital_index=hospital_index,
+        eta_min=eta_min,
+        method=method,
+        solve_ms=round((time.perf_counter() - started) * 1000, 2),
+    )
+
+
+async def eta_matrix(points: Sequence[tuple], snapshot) -> np.ndarray:
+    """
+    (patients x hospitals) ETA in minutes. Road durations for each patient's
+    nearest `hospital_search_k` hospitals (one table request each, cached),
+    straight-line estimates scaled by ROAD_DETOUR_FACTOR for the rest.
+    """
+    engine = snapshot.distance_engine
+    if not len(points) or not len(engine):
+        return np.zeros((len(points), len(engine)))
+    distances = engine.batch_distances_km(points)
+    eta = distances / engine.avg_speed_kmh * 60 * ROAD_DETOUR_FACTOR
+    nearest, _ = engine.batch_nearest(points, settings.hospital_search_k)
+
+    async def road_row(i):
+        hospitals = [engine.hospitals[j] for j in nearest[i]]
+        return await maps_service.get_route_matrix(
+            tuple(points[i]), [hospital_coords(h) for h in hospitals]
+        )
+
+    rows = await gather_bounded(
+        [lambda i=i: road_row(i) for i in range(len(points))],
+        limit=settings.batch_eta_concurrency,
+        timeout_s=settings.route_call_timeout_s,
+    )
+    for i, routes in enumerate(rows):
+        for j, route_info in zip(nearest[i], routes or ()):
+            if route_info:
+                eta[i, j] = route_info["duration_min"]
+    return eta
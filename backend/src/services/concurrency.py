@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+async def gather_bounded(
+    factories: List[Callable[[], Awaitable[Any]]],
+    limit: int,
+    timeout_s: Optional[float] = None,
+) -> List[Any]:
+    """
+    Run coroutine factories concurrently with at most `limit` in flight.
+
+    Results are returned in input order. A call that raises or exceeds
+    `timeout_s` yields None instead of failing the whole batch.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(factory):
+        async with semaphore:
+            try:
+                if timeout_s is None:
+                    return await factory()
+                return await asyncio.wait_for(factory(), timeout_s)
+            except asyncio.TimeoutError:
+                print(f"⏱️  Call timed out after {timeout_s}s, dropping it")
+            except Exception as e:
+                print(f"Concurrent call failed: {e}")
+            return None
+
+    return await asyncio.gather(*(run(factory) for factory in factories))
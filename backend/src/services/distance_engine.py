@@ -0,0 +1,81 @@
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from src.services.spatial_index import EARTH_RADIUS_KM, hospital_coords
+
+
+class DistanceEngine:
+    """
+    Vectorized straight-line distance / ETA over a fixed set of hospitals.
+
+    Coordinates are stored once as contiguous float64 arrays (radians), so one
+    emergency against N hospitals, or M emergencies against N hospitals, is a
+    single NumPy expression instead of a Python loop of scalar `math` calls.
+    """
+
+    def __init__(
+        self,
+        hospitals: Iterable[dict],
+        avg_speed_kmh: float = 40.0,
+        min_eta_minutes: int = 5,
+    ):
+        self.hospitals: List[dict] = list(hospitals)
+        coords = np.array(
+            [hospital_coords(h) for h in self.hospitals], dtype=np.float64
+        ).reshape(-1, 2)
+        self.lat_rad = np.ascontiguousarray(np.radians(coords[:, 0]))
+        self.lon_rad = np.ascontiguousarray(np.radians(coords[:, 1]))
+        self.cos_lat = np.cos(self.lat_rad)
+        self.avg_speed_kmh = avg_speed_kmh
+        self.min_eta_minutes = min_eta_minutes
+
+    def __len__(self) -> int:
+        return len(self.hospitals)
+
+    def distances_km(self, lat: float, lon: float) -> np.ndarray:
+        """Haversine distance from one point to every hospital, shape (N,)."""
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+        a = (np.sin((self.lat_rad - lat_rad) / 2) ** 2
+             + np.cos(lat_rad) * self.cos_lat * np.sin((self.lon_rad - lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def batch_distances_km(self, points) -> np.ndarray:
+        """Haversine distance from M (lat, lon) points to every hospital, shape (M, N)."""
+        points = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        lat_rad = points[:, 0:1]
+        lon_rad = points[:, 1:2]
+        a = (np.sin((self.lat_rad - lat_rad) / 2) ** 2
+             + np.cos(lat_rad) * self.cos_lat * np.sin((self.lon_rad - lon_rad) / 2) ** 2)
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def eta_minutes(self, distances_km: np.ndarray) -> np.ndarray:
+        """Same rule as routes.calculate_eta: whole minutes at avg speed, floored at the minimum."""
+        minutes = (np.asarray(distances_km) / self.avg_speed_kmh * 60).astype(np.int64)
+        return np.maximum(minutes, self.min_eta_minutes)
+
+    @staticmethod
+    def _top_k(distances: np.ndarray, k: int) -> np.ndarray:
+        n = distances.shape[-1]
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(distances.shape[:-1] + (0,), dtype=np.int64)
+        if k < n:
+            idx = np.argpartition(distances, k - 1, axis=-1)[..., :k]
+        else:
+            idx = np.broadcast_to(np.arange(n), distances.shape).copy()
+        order = np.argsort(np.take_along_axis(distances, idx, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(idx, order, axis=-1)
+
+    def nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices of the k nearest hospitals (closest first) and their distances."""
+        distances = self.distances_km(lat, lon)
+        idx = self._top_k(distances, k)
+        return idx, distances[idx]
+
+    def batch_nearest(self, points, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-point k nearest hospitals: (M, k) indices and (M, k) distances."""
+        distances = self.batch_distances_km(points)
+        idx = self._top_k(distances, k)
+        return idx, np.take_along_axis(distances, idx, axis=-1)
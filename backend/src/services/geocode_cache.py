@@ -0,0 +1,159 @@
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import time
+from typing import Iterable, Optional
+
+from config import get_settings
+from src.services.cache import LRUTTLCache
+from src.services.geohash import encode_geohash
+
+settings = get_settings()
+
+
+class GeocodeCache:
+    """
+    Two-tier reverse-geocoding cache keyed by geohash cell.
+
+    The hot tier is a per-process LRU. The cold tier is a SQLite file in WAL
+    mode, so it survives restarts and every uvicorn worker on the host reads
+    and writes the same entries.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        precision: int = None,
+        memory_entries: int = None,
+        ttl_s: float = None,
+    ):
+        self.path = path or settings.geocode_cache_path
+        self.precision = precision or settings.geocode_cache_precision
+        self.ttl_s = ttl_s if ttl_s is not None else settings.geocode_cache_ttl_s
+        self.memory = LRUTTLCache(
+            max_entries=memory_entries or settings.geocode_cache_memory_entries
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def key(self, lat: float, lng: float) -> str:
+        return encode_geohash(lat, lng, self.precision)
+
+    # ---- SQLite tier (blocking; call through asyncio.to_thread) ----
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache ("
+                " geohash TEXT PRIMARY KEY,"
+                " address TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _db_get(self, geohash: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT address, updated_at FROM geocode_cache WHERE geohash = ?",
+                (geohash,),
+            ).fetchone()
+        if row is None:
+            return None
+        address, updated_at = row
+        if self.ttl_s and updated_at + self.ttl_s < time.time():
+            return None
+        return address
+
+    def _db_put_many(self, entries: Iterable[tuple]):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocode_cache (geohash, address, updated_at)"
+                " VALUES (?, ?, ?)",
+                [(geohash, address, now) for geohash, address in entries],
+            )
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---- Public API ----
+
+    async def get(self, lat: float, lng: float) -> Optional[str]:
+        geohash = self.key(lat, lng)
+        address = self.memory.get(geohash)
+        if address is not None:
+            return address
+
+        try:
+            address = await asyncio.to_thread(self._db_get, geohash)
+        except sqlite3.Error as e:
+            print(f"Geocode cache read failed: {e}")
+            return None
+
+        if address is not None:
+            self.memory.set(geohash, address)
+        return address
+
+    async def put(self, lat: float, lng: float, address: str):
+        geohash = self.key(lat, lng)
+        self.memory.set(geohash, address)
+        try:
+            await asyncio.to_thread(self._db_put_many, [(geohash, address)])
+        except sqlite3.Error as e:
+            print(f"Geocode cache write failed: {e}")
+
+    def preload(self, records: Iterable[dict]) -> int:
+        """
+        Bulk-load past lookups into the SQLite tier. Each record carries an
+        "address" plus either a "geohash" or "lat" and "lng"/"lon".
+        """
+        entries = []
+        for record in records:
+            address = record.get("address")
+            if not address:
+                continue
+            geohash = record.get("geohash")
+            if geohash:
+                geohash = geohash[:self.precision]
+            else:
+                lng = record.get("lng", record.get("lon"))
+                geohash = self.key(float(record["lat"]), float(lng))
+            entries.append((geohash, address))
+
+        if entries:
+            self._db_put_many(entries)
+        return len(entries)
+
+    def preload_file(self, dump_path: str) -> int:
+        """Load a JSON array or JSON-lines dump of past lookups."""
+        with open(dump_path, encoding="utf-8") as f:
+            text = f.read().strip()
+        if text.startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return self.preload(records)
+
+
+geocode_cache = GeocodeCache()
+
+
+if __name__ == "__main__":
+    # python -m src.services.geocode_cache <dump.jsonl>
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.services.geocode_cache <dump.json|dump.jsonl>")
+        sys.exit(1)
+    loaded = geocode_cache.preload_file(sys.argv[1])
+    print(f"✅ Loaded {loaded} addresses into {geocode_cache.path}")
@@ -0,0 +1,311 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from config import get_settings
+from src.database.db import AsyncSessionLocal, BedReservation, Hospital, MOCK_HOSPITALS
+from src.services.distance_engine import DistanceEngine
+from src.services.spatial_index import HospitalIndex, hospital_coords
+
+settings = get_settings()
+
+# Hospital capability flag -> (agent specialist code, display specialty)
+SPECIALIST_FLAGS = {
+    "has_cardiologist": ("cardiologist", "Cardiology"),
+    "has_trauma_center": ("trauma_surgeon", "Trauma"),
+    "has_neurosurgeon": ("neurosurgeon", "Neurosurgery"),
+}
+# Every listed hospital runs an emergency department
+BASE_SPECIALISTS = ("emergency_physician", "general_physician")
+BASE_SPECIALTIES = ("Emergency Medicine",)
+
+BED_COLUMNS = (
+    "icu_beds_available", "icu_beds_total",
+    "general_beds_available", "general_beds_total",
+)
+
+
+def _flag(value) -> bool:
+    return str(value).lower() in ("true", "1", "yes")
+
+
+def hospital_record(row) -> Mapping:
+    """
+    Read-only hospital record in the shape agents and endpoints expect.
+    `row` is a Hospital model or a seed-style dict.
+    """
+    if isinstance(row, dict):
+        get = row.get
+        lat, lon = hospital_coords(row)
+    else:
+        get = lambda key, default=None: getattr(row, key, default)
+        lat, lon = row.latitude, row.longitude
+
+    specialists = list(BASE_SPECIALISTS)
+    specialties = list(BASE_SPECIALTIES)
+    for flag, (specialist, specialty) in SPECIALIST_FLAGS.items():
+        if _flag(get(flag, "false")):
+            specialists.append(specialist)
+            specialties.append(specialty)
+    if (get("icu_beds_total") or 0) > 0:
+        specialties.append("ICU")
+
+    beds = {column: int(get(column) or 0) for column in BED_COLUMNS}
+    lat, lon = float(lat), float(lon)
+    return MappingProxyType({
+        "id": get("id"),
+        "name": get("name"),
+        "address": get("address"),
+        "latitude": lat,
+        "longitude": lon,
+        "coords": (lat, lon),
+        "phone": get("phone"),
+        "emergency_contact": get("emergency_contact"),
+        **beds,
+        # HospitalAgent screens YELLOW cases on emergency beds
+        "emergency_beds_available": beds["general_beds_available"],
+        "beds_available": beds["icu_beds_available"] + beds["general_beds_available"],
+        "specialists": tuple(specialists),
+        "specialties": tuple(specialties),
+        "last_updated": get("last_updated"),
+        "version": int(get("version") or 0),
+    })
+
+
+@dataclass(frozen=True)
+class HospitalSnapshot:
+    """
+    Immutable view of the hospital registry. A new snapshot (with a higher
+    version) replaces the old one whenever capacity changes; readers holding
+    the old one keep a consistent view.
+    """
+    version: int
+    hospitals: Tuple[Mapping, ...]
+    by_id: Mapping[str, Mapping]
+    index: HospitalIndex
+    distance_engine: DistanceEngine
+    last_updated: Optional[datetime]
+    row_count: int
+    loaded_at: float
+
+    @classmethod
+    def build(cls, version: int, records, last_updated=None, row_count=None) -> "HospitalSnapshot":
+        hospitals = tuple(records)
+        return cls(
+            version=version,
+            hospitals=hospitals,
+            by_id=MappingProxyType({h["id"]: h for h in hospitals}),
+            index=HospitalIndex(hospitals, cell_size_deg=settings.hospital_index_cell_deg),
+            distance_engine=DistanceEngine(hospitals),
+            last_updated=last_updated,
+            row_count=len(hospitals) if row_count is None else row_count,
+            loaded_at=time.monotonic(),
+        )
+
+    def get(self, hospital_id) -> Optional[Mapping]:
+        return self.by_id.get(hospital_id)
+
+
+class HospitalRegistry:
+    """
+    Single source of hospital data for endpoints and agents.
+
+    The `hospitals` table is loaded into a HospitalSnapshot that requests read
+    without touching the database. Bed changes made through this process are
+    written through (DB update + snapshot swap); changes made by other
+    workers are picked up by polling `last_updated`.
+
+    Bed reservations go straight to the database (optimistic compare-and-
+    decrement on `Hospital.version`), never through a process-wide lock; the
+    snapshot only mirrors the committed counts.
+    """
+
+    def __init__(self):
+        self._snapshot = HospitalSnapshot.build(0, [hospital_record(h) for h in MOCK_HOSPITALS])
+        self._write_lock = asyncio.Lock()
+        self._poll_task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._db_backed = False
+
+    @property
+    def snapshot(self) -> HospitalSnapshot:
+        return self._snapshot
+
+    @property
+    def tracks_capacity(self) -> bool:
+        """False while serving in-memory seed hospitals: there are no rows to reserve against."""
+        return self._db_backed
+
+    def _swap(self, records, last_updated, row_count) -> HospitalSnapshot:
+        snapshot = HospitalSnapshot.build(
+            self._snapshot.version + 1, records, last_updated, row_count
+        )
+        self._snapshot = snapshot  # single reference assignment: readers see old or new
+        return snapshot
+
+    async def _table_marker(self, db) -> tuple:
+        result = await db.execute(
+            select(func.max(Hospital.last_updated), func.count(Hospital.id))
+        )
+        return tuple(result.one())
+
+    async def load(self) -> HospitalSnapshot:
+        """Read the whole hospitals table into a fresh snapshot."""
+        async with self._write_lock:
+            async with AsyncSessionLocal() as db:
+                last_updated, row_count = await self._table_marker(db)
+                rows = (await db.execute(select(Hospital))).scalars().all()
+
+            if not rows:
+                print("⚠️  Hospital table is empty, serving seed hospitals from memory")
+                return self._snapshot
+
+            snapshot = self._swap([hospital_record(r) for r in rows], last_updated, row_count)
+            self._db_backed = True
+            print(f"🏥 Hospital registry v{snapshot.version}: {len(rows)} hospitals")
+            return snapshot
+
+    async def refresh_if_stale(self) -> bool:
+        """Reload when another process changed the table since our snapshot."""
+        async with AsyncSessionLocal() as db:
+            marker = await self._table_marker(db)
+        if marker[1] and marker != (self._snapshot.last_updated, self._snapshot.row_count):
+            await self.load()
+            return True
+        return False
+
+    async def update_beds(self, hospital_id: str, **counts) -> Optional[Mapping]:
+        """
+        Write-through bed update, e.g. update_beds("aiims", icu_beds_available=3).
+        Commits to the DB, then swaps in a snapshot carrying the new counts.
+        """
+        unknown = set(counts) - set(BED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown bed columns: {', '.join(sorted(unknown))}")
+
+        async with self._write_lock:
+            async with AsyncSessionLocal() as db:
+                hospital = await db.get(Hospital, hospital_id)
+                if hospital is None:
+                    return None
+                for column, value in counts.items():
+                    setattr(hospital, column, value)
+                hospital.version = Hospital.version + 1
+                hospital.last_updated = datetime.utcnow()
+                await db.commit()
+                await self._sync_hospitals(db, [hospital_id])
+        return self._snapshot.get(hospital_id)
+
+    def apply_update(self, hospitals, last_updated=None, row_count=None):
+        """Swap in a snapshot where the given hospitals' records are replaced."""
+        changed = {r["id"]: r for r in (hospital_record(h) for h in hospitals)}
+        current = self._snapshot
+        records = [changed.pop(h["id"], h) for h in current.hospitals]
+        records.extend(changed.values())
+        self._swap(
+            records,
+            last_updated if last_updated is not None else current.last_updated,
+            row_count if row_count is not None else len(records),
+        )
+
+    async def _sync_hospitals(self, db, hospital_ids):
+        """Write-through: re-read committed rows and swap them into the snapshot."""
+        if not hospital_ids:
+            return
+        rows = (await db.execute(
+            select(Hospital).where(Hospital.id.in_(hospital_ids))
+            .execution_options(populate_existing=True)
+        )).scalars().all()
+        last_updated, row_count = await self._table_marker(db)
+        self.apply_update(rows, last_updated, row_count)
+
+    # ------------------------------------------------------------------
+    # Bed reservations
+    # ------------------------------------------------------------------
+    async def reserve_bed(self, hospital_id: str, bed_type: str = "icu", emergency_id=None):
+        """Hold one bed; returns the BedReservation or None if none is free."""
+        async with AsyncSessionLocal() as db:
+            reservation = await db.run_sync(
+                lambda session: Hospital.reserve_bed(
+                    session, hospital_id, bed_type, emergency_id,
+                    ttl_s=settings.bed_reservation_ttl_s,
+                    max_retries=settings.bed_reservation_max_retries,
+                )
+            )
+            if reservation is None:
+                await db.rollback()
+                return None
+            await db.commit()
+            await self._sync_hospitals(db, [hospital_id])
+        print(f"🛏️  Reserved {bed_type} bed at {hospital_id} ({reservation.id})")
+        return reservation
+
+    async def release_reservation(self, reservation_id: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            released = await db.run_sync(
+                lambda session: Hospital.release_reservation(session, reservation_id)
+            )
+            await db.commit()
+            if released:
+                reservation = await db.get(BedReservation, reservation_id)
+                await self._sync_hospitals(db, [reservation.hospital_id])
+        return released
+
+    async def confirm_reservation(self, reservation_id: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            confirmed = await db.run_sync(
+                lambda session: Hospital.confirm_reservation(session, reservation_id)
+            )
+            await db.commit()
+        return confirmed
+
+    async def release_expired(self) -> list:
+        async with AsyncSessionLocal() as db:
+            hospital_ids = await db.run_sync(Hospital.release_expired_reservations)
+            await db.commit()
+            await self._sync_hospitals(db, hospital_ids)
+        if hospital_ids:
+            print(f"🛏️  Released expired bed holds at {', '.join(hospital_ids)}")
+        return hospital_ids
+
+    async def _every(self, interval_s: float, job, label: str):
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                await job()
+            except Exception as e:
+                print(f"Hospital registry {label} failed: {e}")
+
+    async def start(self):
+        """Initial load plus the staleness poller and expiry sweep (app lifespan)."""
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"⚠️  Could not load hospitals from the database: {e}")
+        if settings.hospital_registry_poll_s > 0 and self._poll_task is None:
+            self._poll_task = asyncio.create_task(
+                self._every(settings.hospital_registry_poll_s, self.refresh_if_stale, "refresh")
+            )
+        if settings.bed_reservation_sweep_s > 0 and self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(
+                self._every(settings.bed_reservation_sweep_s, self.release_expired, "expiry sweep")
+            )
+
+    async def stop(self):
+        for task in (self._poll_task, self._sweep_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._poll_task = self._sweep_task = None
+
+
+hospital_registry = HospitalRegistry()
@@ -0,0 +1,494 @@
+import bz2
+import gzip
+import heapq
+import os
+import pickle
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from src.services.spatial_index import SpatialGridIndex, haversine_km
+
+# Default car speeds (km/h) for OSM highway classes we route over
+ROAD_SPEEDS_KMH = {
+    "motorway": 90, "motorway_link": 45,
+    "trunk": 80, "trunk_link": 40,
+    "primary": 60, "primary_link": 30,
+    "secondary": 50, "secondary_link": 25,
+    "tertiary": 40, "tertiary_link": 20,
+    "unclassified": 30, "residential": 25,
+    "living_street": 10, "service": 15, "road": 25,
+}
+
+GRAPH_FORMAT_VERSION = 1
+INF = float("inf")
+
+
+def _open_extract(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def _parse_maxspeed(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip().lower()
+    try:
+        if value.endswith("mph"):
+            return float(value[:-3].strip()) * 1.609
+        return float(value.split()[0])
+    except ValueError:
+        return None
+
+
+class LocalRouter:
+    """
+    In-process road router built from an OpenStreetMap XML extract.
+
+    The road graph is preprocessed into a contraction hierarchy (CH): nodes
+    are contracted in order of importance and shortcut edges are added so
+    that every shortest path can be found by two small upward-only Dijkstra
+    searches. Point-to-point and one-to-many queries then settle a few
+    hundred nodes instead of the whole graph.
+
+    Edge weights are travel time in seconds; each edge also carries its
+    length in meters so distance can be reported alongside duration.
+    """
+
+    def __init__(self):
+        self.coords: List[Tuple[float, float]] = []     # node -> (lat, lon)
+        self.rank: List[int] = []
+        # Upward CH edges: fwd_up[u][v] for u->v, bwd_up[v][u] for u->v,
+        # where the far end always has the higher rank.
+        # Values are (seconds, meters, middle node of a shortcut or -1).
+        self.fwd_up: List[Dict[int, Tuple[float, float, int]]] = []
+        self.bwd_up: List[Dict[int, Tuple[float, float, int]]] = []
+        # Intermediate (lat, lon) shape points of original edges, by (u, v)
+        self.shapes: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+        self._snap_index: Optional[SpatialGridIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_osm(cls, osm_path: str) -> "LocalRouter":
+        """Parse an .osm / .osm.gz / .osm.bz2 extract and build the hierarchy."""
+        started = time.perf_counter()
+        node_coords: Dict[int, Tuple[float, float]] = {}
+        ways = []
+
+        with _open_extract(osm_path) as f:
+            for _, elem in ET.iterparse(f, events=("end",)):
+                if elem.tag == "node":
+                    node_coords[int(elem.get("id"))] = (
+                        float(elem.get("lat")), float(elem.get("lon"))
+                    )
+                    elem.clear()
+                elif elem.tag == "way":
+                    tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+                    highway = tags.get("highway")
+                    if highway in ROAD_SPEEDS_KMH and tags.get("access") not in ("no", "private"):
+                        refs = [int(nd.get("ref")) for nd in elem.iter("nd")]
+                        ways.append((refs, highway, tags))
+                    elem.clear()
+                elif elem.tag == "relation":
+                    elem.clear()
+
+        router = cls()
+        edges = router._edges_from_ways(ways, node_coords)
+        router._build_hierarchy(edges)
+        print(f"🗺️  Local router: {len(router)} nodes from {os.path.basename(osm_path)} "
+              f"in {time.perf_counter() - started:.1f}s")
+        return router
+
+    def _edges_from_ways(self, ways, node_coords) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        """
+        Map OSM node ids to dense indices and collect directed (u, v) -> (sec, m).
+
+        Only way endpoints and nodes shared by several ways become graph
+        nodes; the shape points in between are folded into the edge and kept
+        in `self.shapes` for geometry. Real extracts are mostly shape points,
+        so this shrinks the graph several times before contraction.
+        """
+        usage: Dict[int, int] = {}
+        for refs, _, _ in ways:
+            for ref in refs:
+                usage[ref] = usage.get(ref, 0) + 1
+
+        index: Dict[int, int] = {}
+        edges: Dict[Tuple[int, int], Tuple[float, float]] = {}
+
+        def node(osm_id: int) -> int:
+            i = index.get(osm_id)
+            if i is None:
+                i = index[osm_id] = len(self.coords)
+                self.coords.append(node_coords[osm_id])
+            return i
+
+        def add_edge(u: int, v: int, seconds: float, meters: float, shape: list):
+            if seconds < edges.get((u, v), (INF,))[0]:
+                edges[(u, v)] = (seconds, meters)
+                if shape:
+                    self.shapes[(u, v)] = shape
+                else:
+                    self.shapes.pop((u, v), None)
+
+        for refs, highway, tags in ways:
+            refs = [r for r in refs if r in node_coords]
+            if len(refs) < 2:
+                continue
+
+            speed = _parse_maxspeed(tags.get("maxspeed")) or ROAD_SPEEDS_KMH[highway]
+            oneway = tags.get("oneway", "").lower()
+            forward = True
+            backward = not (
+                oneway in ("yes", "1", "true")
+                or tags.get("junction") == "roundabout"
+                or (highway in ("motorway", "motorway_link") and oneway != "no")
+            )
+            if oneway == "-1":
+                forward, backward = False, True
+
+            start = 0
+            meters = 0.0
+            for i in range(1, len(refs)):
+                meters += haversine_km(*node_coords[refs[i - 1]], *node_coords[refs[i]]) * 1000
+                is_last = i == len(refs) - 1
+                if not is_last and usage[refs[i]] < 2:
+                    continue
+
+                a, b = node(refs[start]), node(refs[i])
+                shape = [node_coords[r] for r in refs[start + 1:i]]
+                if a != b:
+                    seconds = meters / (speed / 3.6)
+                    if forward:
+                        add_edge(a, b, seconds, meters, shape)
+                    if backward:
+                        add_edge(b, a, seconds, meters, shape[::-1])
+                start = i
+                meters = 0.0
+        return edges
+
+    def _build_hierarchy(self, edges: Dict[Tuple[int, int], Tuple[float, float]]):
+        n = len(self.coords)
+        out: List[Dict[int, Tuple[float, float, int]]] = [dict() for _ in range(n)]
+        inn: List[Dict[int, Tuple[float, float, int]]] = [dict() for _ in range(n)]
+        for (u, v), (seconds, meters) in edges.items():
+            out[u][v] = (seconds, meters, -1)
+            inn[v][u] = (seconds, meters, -1)
+
+        contracted = [False] * n
+        deleted_neighbors = [0] * n
+        self.rank = [0] * n
+        self.fwd_up = [dict() for _ in range(n)]
+        self.bwd_up = [dict() for _ in range(n)]
+
+        def witness_distances(source: int, skip: int, limit: float, max_settled: int = 60):
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap and settled < max_settled:
+                d, u = heapq.heappop(heap)
+                if d > limit:
+                    break
+                if d > dist[u]:
+                    continue
+                settled += 1
+                for v, (w, _, _) in out[u].items():
+                    if v == skip:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(v, INF):
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+            return dist
+
+        def shortcuts_for(v: int):
+            needed = []
+            if not out[v]:
+                return needed
+            max_out = max(w for w, _, _ in out[v].values())
+            for u, (w_in, m_in, _) in inn[v].items():
+                dist = witness_distances(u, v, w_in + max_out)
+                for x, (w_out, m_out, _) in out[v].items():
+                    if x == u:
+                        continue
+                    via = w_in + w_out
+                    if dist.get(x, INF) > via:
+                        needed.append((u, x, via, m_in + m_out))
+            return needed
+
+        def priority(v: int, shortcuts: list) -> int:
+            # Edge difference plus a term that spreads contraction evenly
+            return len(shortcuts) - len(inn[v]) - len(out[v]) + deleted_neighbors[v]
+
+        heap = [(priority(v, shortcuts_for(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if contracted[v]:
+                continue
+            # Lazy update: re-evaluate and defer if it is no longer the cheapest.
+            shortcuts = shortcuts_for(v)
+            current = priority(v, shortcuts)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            for u, x, seconds, meters in shortcuts:
+                if seconds < out[u].get(x, (INF,))[0]:
+                    out[u][x] = (seconds, meters, v)
+                    inn[x][u] = (seconds, meters, v)
+
+            # Every remaining neighbour ranks higher than v: these are v's upward edges.
+            self.fwd_up[v] = dict(out[v])
+            self.bwd_up[v] = dict(inn[v])
+            for u in inn[v]:
+                del out[u][v]
+                deleted_neighbors[u] += 1
+            for x in out[v]:
+                del inn[x][v]
+                deleted_neighbors[x] += 1
+            out[v].clear()
+            inn[v].clear()
+
+            contracted[v] = True
+            self.rank[v] = order
+            order += 1
+
+        self._snap_index = None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            pickle.dump(
+                {
+                    "version": GRAPH_FORMAT_VERSION,
+                    "coords": self.coords,
+                    "rank": self.rank,
+                    "fwd_up": self.fwd_up,
+                    "bwd_up": self.bwd_up,
+                    "shapes": self.shapes,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalRouter":
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != GRAPH_FORMAT_VERSION:
+            raise ValueError(f"Unsupported routing graph version in {path}")
+        router = cls()
+        router.coords = data["coords"]
+        router.rank = data["rank"]
+        router.fwd_up = data["fwd_up"]
+        router.bwd_up = data["bwd_up"]
+        router.shapes = data["shapes"]
+        return router
+
+    @classmethod
+    def from_config(cls, osm_path: str, graph_cache_path: str = "") -> "LocalRouter":
+        """
+        Load the preprocessed graph from `graph_cache_path` when it is newer
+        than the extract, otherwise build it from `osm_path` and save it there.
+        """
+        if (graph_cache_path and os.path.exists(graph_cache_path)
+                and (not os.path.exists(osm_path)
+                     or os.path.getmtime(graph_cache_path) >= os.path.getmtime(osm_path))):
+            return cls.load(graph_cache_path)
+
+        router = cls.from_osm(osm_path)
+        if graph_cache_path:
+            router.save(graph_cache_path)
+        return router
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def snap(self, coords: tuple) -> Optional[int]:
+        """Nearest graph node to a (lat, lon) point."""
+        if self._snap_index is None:
+            index = SpatialGridIndex(cell_size_deg=0.01)
+            for node, (lat, lon) in enumerate(self.coords):
+                index.insert(node, lat, lon)
+            self._snap_index = index
+        hits = self._snap_index.nearest(coords[0], coords[1], k=1)
+        return hits[0][1] if hits else None
+
+    def _upward_search(self, source: int, graph):
+        dist = {source: 0.0}
+        parent = {source: -1}
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for v, (w, _, _) in graph[u].items():
+                nd = d + w
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+        return dist, parent
+
+    def _query(self, source: int, target: int):
+        """Bidirectional upward Dijkstra; returns (seconds, meeting node, parents)."""
+        if source == target:
+            return 0.0, source, {source: -1}, {target: -1}
+
+        dist_f, dist_b = {source: 0.0}, {target: 0.0}
+        parent_f, parent_b = {source: -1}, {target: -1}
+        heap_f, heap_b = [(0.0, source)], [(0.0, target)]
+        best, meet = INF, -1
+
+        while heap_f or heap_b:
+            forward = bool(heap_f) and (not heap_b or heap_f[0][0] <= heap_b[0][0])
+            heap, dist, parent, other, graph = (
+                (heap_f, dist_f, parent_f, dist_b, self.fwd_up) if forward
+                else (heap_b, dist_b, parent_b, dist_f, self.bwd_up)
+            )
+            d, u = heapq.heappop(heap)
+            if d >= best:
+                # Nothing left on this side can improve the meeting point.
+                heap.clear()
+                continue
+            if d > dist[u]:
+                continue
+            if u in other and d + other[u] < best:
+                best, meet = d + other[u], u
+            for v, (w, _, _) in graph[u].items():
+                nd = d + w
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return best, meet, parent_f, parent_b
+
+    def _edge(self, u: int, v: int) -> Tuple[float, float, int]:
+        if self.rank[u] < self.rank[v]:
+            return self.fwd_up[u][v]
+        return self.bwd_up[v][u]
+
+    def _unpack(self, u: int, v: int) -> List[int]:
+        """Original-edge node sequence for edge u->v (shortcut or not), excluding u."""
+        nodes = []
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            mid = self._edge(a, b)[2]
+            if mid < 0:
+                nodes.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return nodes
+
+    def route(self, start_coords: tuple, end_coords: tuple) -> Optional[dict]:
+        """Shortest path between two (lat, lon) points in the MapsService route shape."""
+        source, target = self.snap(start_coords), self.snap(end_coords)
+        if source is None or target is None:
+            return None
+
+        seconds, meet, parent_f, parent_b = self._query(source, target)
+        if seconds == INF:
+            return None
+
+        up_path = [meet]
+        while parent_f[up_path[-1]] != -1:
+            up_path.append(parent_f[up_path[-1]])
+        up_path.reverse()
+        down_path = [meet]
+        while parent_b[down_path[-1]] != -1:
+            down_path.append(parent_b[down_path[-1]])
+
+        ch_path = up_path + down_path[1:]
+        nodes = [ch_path[0]]
+        meters = 0.0
+        for a, b in zip(ch_path, ch_path[1:]):
+            meters += self._edge(a, b)[1]
+            nodes.extend(self._unpack(a, b))
+
+        points = [self.coords[nodes[0]]]
+        for a, b in zip(nodes, nodes[1:]):
+            points.extend(self.shapes.get((a, b), ()))
+            points.append(self.coords[b])
+
+        return {
+            "distance_km": round(meters / 1000, 2),
+            "duration_min": round(seconds / 60, 0),
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [[lon, lat] for lat, lon in points],
+            },
+        }
+
+    def table(self, start_coords: tuple, destinations: list) -> List[Optional[dict]]:
+        """
+        One-to-many distance/duration. The forward upward search space from
+        the origin is computed once and each destination only needs its own
+        (small) backward upward search.
+        """
+        source = self.snap(start_coords)
+        if source is None:
+            return [None] * len(destinations)
+
+        dist_f, parent_f = self._upward_search(source, self.fwd_up)
+        results: List[Optional[dict]] = []
+        for end_coords in destinations:
+            target = self.snap(end_coords)
+            if target is None:
+                results.append(None)
+                continue
+            dist_b, parent_b = self._upward_search(target, self.bwd_up)
+            best, meet = INF, -1
+            for node, d in dist_b.items():
+                total = dist_f.get(node, INF) + d
+                if total < best:
+                    best, meet = total, node
+            if best == INF:
+                results.append(None)
+                continue
+
+            meters = 0.0
+            node = meet
+            while parent_f[node] != -1:
+                meters += self._edge(parent_f[node], node)[1]
+                node = parent_f[node]
+            node = meet
+            while parent_b[node] != -1:
+                meters += self._edge(node, parent_b[node])[1]
+                node = parent_b[node]
+
+            results.append({
+                "distance_km": round(meters / 1000, 2),
+                "duration_min": round(best / 60, 0),
+            })
+        return results
+
+
+if __name__ == "__main__":
+    # python -m src.services.local_router <extract.osm[.gz|.bz2]> <graph.pickle>
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.services.local_router <extract.osm> <graph.pickle>")
+        sys.exit(1)
+    built = LocalRouter.from_osm(sys.argv[1])
+    built.save(sys.argv[2])
+    print(f"✅ Saved routing graph to {sys.argv[2]}")
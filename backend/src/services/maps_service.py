@@ -1,17 +1,135 @@
+import asyncio
+
 import httpx
 from config import get_settings
+from src.services.cache import LRUTTLCache
+from src.services.concurrency import gather_bounded
+from src.services.geocode_cache import geocode_cache
+from src.services.local_router import LocalRouter
+from src.services.metrics import track_external
+from src.zynd.context import current_context
 
 settings = get_settings()
 
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/reverse"
+
+
 class MapsService:
     def __init__(self):
         self.base_url = settings.osrm_server
+        self._client: httpx.AsyncClient | None = None
+        self._osrm_timeout = httpx.Timeout(
+            settings.osrm_timeout_s, connect=settings.http_connect_timeout_s
+        )
+        self._nominatim_timeout = httpx.Timeout(
+            settings.nominatim_timeout_s, connect=settings.http_connect_timeout_s
+        )
+        self.routing_backend = settings.routing_backend
+        self.local_router: LocalRouter | None = None
+        self._local_router_lock = asyncio.Lock()
+        self.route_cache = LRUTTLCache(
+            max_entries=settings.route_cache_max_entries,
+            ttl_s=settings.route_cache_ttl_s,
+        )
+
+    def _route_key(self, kind: str, start_coords: tuple, end_coords: tuple):
+        """
+        Origins are snapped to a `route_cache_grid_deg` grid so nearby
+        emergencies share entries; destinations (hospitals) are kept exact.
+        """
+        grid = settings.route_cache_grid_deg
+        return (
+            kind,
+            round(start_coords[0] / grid),
+            round(start_coords[1] / grid),
+            round(end_coords[0], 5),
+            round(end_coords[1], 5),
+        )
+
+    async def startup(self):
+        """
+        Open the shared, pooled HTTP client (called from the app lifespan) and,
+        for routing_backend="local", load the offline road graph.
+        """
+        if self.routing_backend == "local" and self.local_router is None:
+            await self._get_local_router()
+
+        if self._client is not None:
+            return
+
+        http2 = settings.http2_enabled
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️  http2_enabled is set but the `h2` package is missing, using HTTP/1.1")
+                http2 = False
+
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_s,
+            ),
+            timeout=self._osrm_timeout,
+        )
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        geocode_cache.close()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Scripts and workers that never ran the app lifespan get a lazy client.
+        if self._client is None:
+            await self.startup()
+        return self._client
+
+    async def _get_local_router(self) -> LocalRouter:
+        async with self._local_router_lock:
+            if self.local_router is None:
+                # Parsing/contracting an extract is CPU-heavy; keep it off the loop.
+                self.local_router = await asyncio.to_thread(
+                    LocalRouter.from_config,
+                    settings.local_osm_path,
+                    settings.local_graph_path,
+                )
+        return self.local_router
 
     async def get_route_details(self, start_coords: tuple, end_coords: tuple):
         """
-        Get route data from OSRM.
+        Get route data from OSRM (or the offline router when routing_backend="local").
         Args: start_coords (lat, lon), end_coords (lat, lon)
         """
+        context = current_context()
+        if context is not None:
+            memoized = context.get_route("route", start_coords, end_coords)
+            if memoized is not None:
+                return memoized
+
+        cache_key = None
+        if settings.route_cache_enabled:
+            cache_key = self._route_key("route", start_coords, end_coords)
+            cached = self.route_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if self.routing_backend == "local":
+            router = await self._get_local_router()
+            route_info = await asyncio.to_thread(router.route, start_coords, end_coords)
+        else:
+            route_info = await self._osrm_route(start_coords, end_coords)
+
+        if route_info is not None:
+            if cache_key is not None:
+                self.route_cache.set(cache_key, route_info)
+            if context is not None:
+                context.remember_route("route", start_coords, end_coords, route_info)
+        return route_info
+
+    async def _osrm_route(self, start_coords: tuple, end_coords: tuple):
         # OSRM expects: longitude,latitude
         start_str = f"{start_coords[1]},{start_coords[0]}"
         end_str = f"{end_coords[1]},{end_coords[0]}"
@@ -20,32 +138,150 @@ class MapsService:
         params = {"overview": "full", "geometries": "geojson"}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("code") == "Ok" and data.get("routes"):
-                        route = data["routes"][0]
-                        return {
-                            "distance_km": round(route["distance"] / 1000, 2),
-                            "duration_min": round(route["duration"] / 60, 0),
-                            "geometry": route["geometry"]
-                        }
+            client = await self._get_client()
+            with track_external("osrm", "route") as call:
+                response = await client.get(url, params=params, timeout=self._osrm_timeout)
+                if response.status_code != 200:
+                    call.outcome = f"http_{response.status_code}"
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("code") == "Ok" and data.get("routes"):
+                    route = data["routes"][0]
+                    return {
+                        "distance_km": round(route["distance"] / 1000, 2),
+                        "duration_min": round(route["duration"] / 60, 0),
+                        "geometry": route["geometry"]
+                    }
         except Exception as e:
             print(f"Error fetching route: {e}")
         return None
 
+    async def get_route_matrix(self, start_coords: tuple, destinations: list):
+        """
+        Distance and duration from one origin to many destinations in a single
+        OSRM /table request or one local one-to-many search (no geometry).
+        Args: start_coords (lat, lon), destinations [(lat, lon), ...]
+        Returns a list aligned with `destinations`; unreachable entries are None.
+        If the table request itself fails, falls back to concurrent per-pair
+        route requests (bounded, with a per-call timeout).
+        """
+        context = current_context()
+        results = [None] * len(destinations)
+        missing = []
+
+        # Request-scoped memo first, then the process-wide cache.
+        for i, end_coords in enumerate(destinations):
+            if context is not None:
+                results[i] = context.get_route("table", start_coords, end_coords)
+            if results[i] is None and settings.route_cache_enabled:
+                results[i] = self.route_cache.get(
+                    self._route_key("table", start_coords, end_coords)
+                )
+                if results[i] is not None and context is not None:
+                    context.remember_route("table", start_coords, end_coords, results[i])
+            if results[i] is None:
+                missing.append(i)
+
+        if not missing:
+            return results
+
+        pending = [destinations[i] for i in missing]
+        if self.routing_backend == "local":
+            router = await self._get_local_router()
+            table = await asyncio.to_thread(router.table, start_coords, pending)
+        else:
+            table = await self._osrm_table(start_coords, pending)
+
+        table_ok = table is not None
+        for i, route_info in zip(missing, table or ()):
+            if route_info is None:
+                continue
+            results[i] = route_info
+            if settings.route_cache_enabled:
+                self.route_cache.set(
+                    self._route_key("table", start_coords, destinations[i]), route_info
+                )
+            if context is not None:
+                context.remember_route("table", start_coords, destinations[i], route_info)
+
+        if not table_ok:
+            routes = await gather_bounded(
+                [
+                    lambda end=destinations[i]: self.get_route_details(start_coords, end)
+                    for i in missing
+                ],
+                limit=settings.route_fanout_concurrency,
+                timeout_s=settings.route_call_timeout_s,
+            )
+            for i, route_info in zip(missing, routes):
+                results[i] = route_info
+        return results
+
+    async def _osrm_table(self, start_coords: tuple, destinations: list):
+        """One OSRM /table request; None if the request itself failed."""
+        coords = ";".join(
+            f"{lon},{lat}" for lat, lon in [start_coords, *destinations]
+        )
+        url = f"{self.base_url}/table/v1/driving/{coords}"
+        params = {
+            "sources": "0",
+            "destinations": ";".join(str(n) for n in range(1, len(destinations) + 1)),
+            "annotations": "distance,duration",
+        }
+
+        try:
+            client = await self._get_client()
+            with track_external("osrm", "table") as call:
+                response = await client.get(url, params=params, timeout=self._osrm_timeout)
+                if response.status_code != 200:
+                    call.outcome = f"http_{response.status_code}"
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("code") == "Ok":
+                    return [
+                        None if duration is None or distance is None else {
+                            "distance_km": round(distance / 1000, 2),
+                            "duration_min": round(duration / 60, 0),
+                        }
+                        for duration, distance in zip(data["durations"][0], data["distances"][0])
+                    ]
+        except Exception as e:
+            print(f"Error fetching route matrix: {e}")
+        return None
+
     async def get_location_address(self, lat: float, lng: float):
-        """Reverse geocoding using Nominatim"""
-        url = "https://nominatim.openstreetmap.org/reverse"
+        """Reverse geocoding using Nominatim, behind the geohash-keyed cache"""
+        context = current_context()
+        if context is not None and context.address is not None:
+            return context.address
+
+        if settings.geocode_cache_enabled:
+            cached = await geocode_cache.get(lat, lng)
+            if cached is not None:
+                if context is not None:
+                    context.address = cached
+                return cached
+
         params = {"lat": lat, "lon": lng, "format": "json", "zoom": 18, "addressdetails": 1}
         headers = {"User-Agent": "GoldenHourResponse/1.0"}
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, headers=headers)
-                if response.status_code == 200:
-                    return response.json().get("display_name", "Unknown Location")
+            client = await self._get_client()
+            with track_external("nominatim", "reverse") as call:
+                response = await client.get(
+                    NOMINATIM_URL, params=params, headers=headers,
+                    timeout=self._nominatim_timeout,
+                )
+                if response.status_code != 200:
+                    call.outcome = f"http_{response.status_code}"
+            if response.status_code == 200:
+                address = response.json().get("display_name")
+                if address:
+                    if settings.geocode_cache_enabled:
+                        await geocode_cache.put(lat, lng, address)
+                    if context is not None:
+                        context.address = address
+                    return address
         except Exception as e:
             print(f"Error resolving address: {e}")
         return "Unknown Location"
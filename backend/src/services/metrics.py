@@ -0,0 +1,286 @@
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+# Seconds; covers sub-millisecond agent calls up to slow external requests
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter; label values are passed positionally in `labelnames` order."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Gauge:
+    """Value that goes up and down (connections, queue depth)."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, *labelvalues):
+        self._values[labelvalues] = value
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues, amount: float = 1):
+        self._values[labelvalues] = self._values.get(labelvalues, 0) - amount
+
+    def value(self, *labelvalues) -> float:
+        return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. `observe` is a dict lookup, one bisect and two
+    additions; buckets are stored per-bucket and made cumulative at render.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> [count per bucket (+Inf last)..., sum]
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues):
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def count(self, *labelvalues) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[:-1]) if series else 0
+
+    def quantile(self, q: float, *labelvalues) -> float:
+        """Bucket upper bound containing the q-quantile (what Prometheus would interpolate)."""
+        series = self._series.get(labelvalues)
+        if not series:
+            return math.nan
+        counts = series[:-1]
+        rank = q * sum(counts)
+        seen = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            seen += n
+            if seen >= rank and n:
+                return bound
+        return math.inf
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = self.buckets + (math.inf,)
+        for labelvalues, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip(bounds, series[:-1]):
+                cumulative += n
+                labels = _labels(self.labelnames + ("le",), labelvalues + (_number(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """In-process metric store rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, tuple(labelnames), **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} already registered with a different type or labels")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# HTTP API
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+HTTP_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+
+# Agents (one series per DID)
+AGENT_CALLS = metrics.counter(
+    "agent_calls_total", "Agent registry calls by outcome", ("did", "outcome")
+)
+AGENT_LATENCY = metrics.histogram(
+    "agent_call_duration_seconds", "Agent call latency", ("did",)
+)
+
+# Emergency pipeline stages
+STAGE_RUNS = metrics.counter(
+    "pipeline_stage_runs_total", "Pipeline stage runs by outcome", ("pipeline", "stage", "outcome")
+)
+STAGE_LATENCY = metrics.histogram(
+    "pipeline_stage_duration_seconds", "Pipeline stage latency", ("pipeline", "stage")
+)
+
+# Outbound services (OSRM, Nominatim, SMTP)
+EXTERNAL_CALLS = metrics.counter(
+    "external_calls_total", "Outbound service calls by outcome", ("service", "operation", "outcome")
+)
+EXTERNAL_LATENCY = metrics.histogram(
+    "external_call_duration_seconds", "Outbound service call latency", ("service", "operation")
+)
+
+# Database
+DB_COMMITS = metrics.counter(
+    "db_commits_total", "ORM session commits by outcome", ("outcome",)
+)
+DB_COMMIT_LATENCY = metrics.histogram(
+    "db_commit_duration_seconds", "ORM session commit latency (flush + COMMIT)"
+)
+
+# WebSocket hub
+WS_CONNECTIONS = metrics.gauge(
+    "ws_connections", "Open WebSocket connections by channel kind", ("channel",)
+)
+WS_MESSAGES = metrics.counter(
+    "ws_messages_total", "WebSocket messages by outcome (sent, dropped, failed)", ("outcome",)
+)
+WS_EVICTIONS = metrics.counter(
+    "ws_evictions_total", "WebSocket connections closed by the hub", ("reason",)
+)
+WS_QUEUE_DEPTH = metrics.histogram(
+    "ws_send_queue_depth", "Per-connection send queue depth seen at enqueue",
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 1000),
+)
+WS_SEND_LATENCY = metrics.histogram(
+    "ws_send_duration_seconds", "Publish-to-socket latency (queue wait + send)"
+)
+
+
+class ExternalCall:
+    """Handle yielded by track_external; set `outcome` for soft failures (e.g. HTTP 5xx)."""
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome = "ok"
+
+
+@contextmanager
+def track_external(service: str, operation: str):
+    """Time one outbound call; exceptions count as outcome="error"."""
+    call = ExternalCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call.outcome = "error"
+        raise
+    finally:
+        EXTERNAL_LATENCY.observe(time.perf_counter() - started, service, operation)
+        EXTERNAL_CALLS.inc(service, operation, call.outcome)
+
+
+def install_db_commit_metrics():
+    """Time every ORM commit (sync and async sessions share the Session events)."""
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if event.contains(Session, "before_commit", _before_commit):
+        return
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+
+
+def _before_commit(session):
+    session.info["_commit_started"] = time.perf_counter()
+
+
+def _after_commit(session):
+    started = session.info.pop("_commit_started", None)
+    if started is not None:
+        DB_COMMIT_LATENCY.observe(time.perf_counter() - started)
+        DB_COMMITS.inc("ok")
+
+
+def _after_rollback(session):
+    if session.info.pop("_commit_started", None) is not None:
+        DB_COMMITS.inc("error")
@@ -1,6 +1,7 @@
 from aiosmtplib import send
 from email.message import EmailMessage
 from config import get_settings
+from src.services.metrics import track_external
 
 settings = get_settings()
 
@@ -13,14 +14,15 @@ class NotificationService:
         message.set_content(body)
 
         try:
-            await send(
-                message,
-                hostname=settings.smtp_server,
-                port=settings.smtp_port,
-                username=settings.smtp_username,
-                password=settings.smtp_password,
-                start_tls=True
-            )
+            with track_external("smtp", "send"):
+                await send(
+                    message,
+                    hostname=settings.smtp_server,
+                    port=settings.smtp_port,
+                    username=settings.smtp_username,
+                    password=settings.smtp_password,
+                    start_tls=True
+                )
             return True
         except Exception as e:
             print(f"Failed to send email: {e}")
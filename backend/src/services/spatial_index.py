@@ -0,0 +1,201 @@
+import math
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two (lat, lon) points in kilometers."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (math.sin(delta_lat / 2) ** 2
+         + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def hospital_coords(hospital: dict) -> Tuple[float, float]:
+    """
+    (lat, lon) of a hospital record.
+    Accepts the agent shape ({"coords": (lat, lon)}), the DB/seed shape
+    ({"latitude": ..., "longitude": ...}) and the API shape ({"lat", "lng"}).
+    """
+    if "coords" in hospital:
+        lat, lon = hospital["coords"]
+        return float(lat), float(lon)
+    if "latitude" in hospital:
+        return float(hospital["latitude"]), float(hospital["longitude"])
+    return float(hospital["lat"]), float(hospital["lng"])
+
+
+class SpatialGridIndex:
+    """
+    Uniform lat/lon grid for k-nearest-neighbour lookups.
+
+    Items are bucketed into square cells of `cell_size_deg` degrees. A query
+    scans rings of cells around the query point and stops as soon as no
+    unscanned cell can hold anything closer than the current k-th best, so
+    cost depends on local density rather than on the total number of items.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.05):
+        if cell_size_deg <= 0:
+            raise ValueError("cell_size_deg must be positive")
+        self.cell_size_deg = cell_size_deg
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float, Any]]] = {}
+        self._positions: Dict[Hashable, Tuple[int, int]] = {}
+        self._bounds: Optional[List[int]] = None  # [min_row, max_row, min_col, max_col]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size_deg),
+                math.floor(lon / self.cell_size_deg))
+
+    def insert(self, key: Hashable, lat: float, lon: float, item: Any = None):
+        """Add an item, replacing any existing entry with the same key."""
+        if key in self._positions:
+            self.remove(key)
+
+        cell = self._cell(lat, lon)
+        self._cells.setdefault(cell, {})[key] = (lat, lon, item)
+        self._positions[key] = cell
+
+        row, col = cell
+        if self._bounds is None:
+            self._bounds = [row, row, col, col]
+        else:
+            b = self._bounds
+            b[0], b[1] = min(b[0], row), max(b[1], row)
+            b[2], b[3] = min(b[2], col), max(b[3], col)
+
+    def remove(self, key: Hashable) -> bool:
+        cell = self._positions.pop(key, None)
+        if cell is None:
+            return False
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+        # Bounds are only a search limit, so leaving them wide is harmless.
+        if not self._positions:
+            self._bounds = None
+        return True
+
+    def get(self, key: Hashable) -> Any:
+        cell = self._positions.get(key)
+        if cell is None:
+            return None
+        return self._cells[cell][key][2]
+
+    def clear(self):
+        self._cells.clear()
+        self._positions.clear()
+        self._bounds = None
+
+    def _ring(self, row: int, col: int, radius: int) -> Iterable[Tuple[int, int]]:
+        if radius == 0:
+            yield (row, col)
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield (row - radius, c)
+            yield (row + radius, c)
+        for r in range(row - radius + 1, row + radius):
+            yield (r, col - radius)
+            yield (r, col + radius)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        predicate: Optional[Callable[[Any], bool]] = None,
+        max_distance_km: Optional[float] = None,
+    ) -> List[Tuple[float, Hashable, Any]]:
+        """
+        Return up to k (distance_km, key, item) tuples ordered by straight-line
+        distance. Items for which `predicate(item)` is False are skipped.
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+
+        row, col = self._cell(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_radius = max(row - min_row, max_row - row, col - min_col, max_col - col, 0)
+
+        # Narrowest a cell gets in km, taken at the highest latitude the grid spans.
+        widest_row = max(abs(min_row), abs(max_row + 1), abs(row), abs(row + 1))
+        widest_lat = min(widest_row * self.cell_size_deg, 89.9)
+        cell_km = self.cell_size_deg * KM_PER_DEGREE * math.cos(math.radians(widest_lat))
+
+        found: List[Tuple[float, Hashable, Any]] = []
+        for radius in range(max_radius + 1):
+            for cell in self._ring(row, col, radius):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                for key, (item_lat, item_lon, item) in bucket.items():
+                    if predicate is not None and not predicate(item):
+                        continue
+                    dist = haversine_km(lat, lon, item_lat, item_lon)
+                    if max_distance_km is not None and dist > max_distance_km:
+                        continue
+                    found.append((dist, key, item))
+
+            # Anything in ring radius+1 or beyond is at least radius cells away.
+            lower_bound = radius * cell_km
+            if max_distance_km is not None and lower_bound > max_distance_km:
+                break
+            if len(found) >= k:
+                found.sort(key=lambda entry: entry[0])
+                del found[k:]
+                if found[-1][0] <= lower_bound:
+                    break
+
+        found.sort(key=lambda entry: entry[0])
+        return found[:k]
+
+
+class HospitalIndex:
+    """Spatial index over hospital records, keyed by hospital id."""
+
+    def __init__(self, hospitals: Iterable[dict] = (), cell_size_deg: float = 0.05):
+        self._grid = SpatialGridIndex(cell_size_deg)
+        self.load(hospitals)
+
+    def __len__(self) -> int:
+        return len(self._grid)
+
+    def load(self, hospitals: Iterable[dict]):
+        """Replace the whole index with `hospitals`."""
+        self._grid.clear()
+        for hospital in hospitals:
+            self.upsert(hospital)
+
+    def upsert(self, hospital: dict):
+        lat, lon = hospital_coords(hospital)
+        self._grid.insert(hospital["id"], lat, lon, hospital)
+
+    def remove(self, hospital_id: Hashable) -> bool:
+        return self._grid.remove(hospital_id)
+
+    def get(self, hospital_id: Hashable) -> Optional[dict]:
+        return self._grid.get(hospital_id)
+
+    def nearest(
+        self,
+        location: tuple,
+        k: int = 5,
+        predicate: Optional[Callable[[dict], bool]] = None,
+        max_distance_km: Optional[float] = None,
+    ) -> List[Tuple[float, dict]]:
+        """k nearest hospitals to (lat, lon) as (straight_line_km, hospital) pairs."""
+        hits = self._grid.nearest(location[0], location[1], k, predicate, max_distance_km)
+        return [(dist, hospital) for dist, _, hospital in hits]
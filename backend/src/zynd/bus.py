@@ -0,0 +1,411 @@
+"""
+Local agent bus: a broker process standing in for the Zynd network, agent
+workers that register their DIDs with it, and the client the registry uses
+to call them.
+
+    python -m src.zynd.bus broker
+    python -m src.zynd.bus worker --agents routing,hospital
+    python -m src.zynd.bus stats
+
+Frames are a 4-byte big-endian length followed by a UTF-8 JSON object.
+Calls are spread over the healthy replicas of a DID (fewest in-flight calls
+first); a worker that misses heartbeats is dropped and its in-flight calls
+fail with BusError.
+"""
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import struct
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from config import get_settings
+from src.zynd.context import EmergencyContext, use_context
+
+settings = get_settings()
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+
+# worker --agents name -> (module, singleton attribute); importing the module registers the handler
+AGENT_MODULES = {
+    "triage": ("src.agents.triage_agent", "triage_agent"),
+    "hospital": ("src.agents.hospital_agent", "hospital_agent"),
+    "routing": ("src.agents.routing_agent", "routing_agent"),
+    "notification": ("src.agents.notification_agent", "notification_agent"),
+}
+
+
+class BusError(Exception):
+    """A bus call failed: no replica, worker lost, timeout or a remote exception."""
+
+
+def _json_default(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """Next message, or None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        (size,) = _HEADER.unpack(header)
+        if size > MAX_FRAME_BYTES:
+            raise BusError(f"Frame of {size} bytes exceeds {MAX_FRAME_BYTES}")
+        return json.loads(await reader.readexactly(size))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def write_frame(writer: asyncio.StreamWriter, message: dict):
+    body = json.dumps(message, default=_json_default, separators=(",", ":")).encode()
+    writer.write(_HEADER.pack(len(body)) + body)
+
+
+# ---------------------------------------------------------------- broker
+
+class _WorkerConn:
+    def __init__(self, worker_id: str, dids: List[str], writer: asyncio.StreamWriter):
+        self.worker_id = worker_id
+        self.dids = dids
+        self.writer = writer
+        self.last_seen = time.monotonic()
+        self.inflight: Dict[str, tuple] = {}   # broker call id -> (client writer, client call id)
+        self.calls = 0
+        self.dropped = False
+
+
+class Broker:
+    """Routes call frames from clients to worker replicas and results back."""
+
+    def __init__(self, socket_path: str, worker_timeout_s: float):
+        self.socket_path = socket_path
+        self.worker_timeout_s = worker_timeout_s
+        self._replicas: Dict[str, List[_WorkerConn]] = {}
+        self._rotation = itertools.count()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        print(f"🛰️  Zynd bus broker listening on {self.socket_path}")
+        async with self._server:
+            await asyncio.gather(self._server.serve_forever(), self._reap_dead_workers())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        worker: Optional[_WorkerConn] = None
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                op = message.get("op")
+                if op == "register":
+                    worker = _WorkerConn(message["worker"], list(message["dids"]), writer)
+                    for did in worker.dids:
+                        self._replicas.setdefault(did, []).append(worker)
+                    print(f"🛰️  Worker {worker.worker_id} registered {worker.dids}")
+                elif op == "heartbeat" and worker is not None:
+                    worker.last_seen = time.monotonic()
+                elif op == "result" and worker is not None:
+                    worker.last_seen = time.monotonic()
+                    self._relay_result(worker, message)
+                elif op == "call":
+                    self._route_call(writer, message)
+                elif op == "stats":
+                    write_frame(writer, {"op": "stats", "id": message.get("id"), "replicas": self.stats()})
+                await writer.drain()
+        finally:
+            if worker is not None:
+                self._drop_worker(worker, "disconnected")
+            writer.close()
+
+    def _pick(self, did: str) -> Optional[_WorkerConn]:
+        replicas = self._replicas.get(did)
+        if not replicas:
+            return None
+        offset = next(self._rotation) % len(replicas)
+        rotated = replicas[offset:] + replicas[:offset]
+        return min(rotated, key=lambda w: len(w.inflight))
+
+    def _route_call(self, client: asyncio.StreamWriter, message: dict):
+        worker = self._pick(message["did"])
+        if worker is None:
+            write_frame(client, {
+                "op": "result", "id": message["id"], "ok": False,
+                "error": f"No healthy replica for {message['did']}",
+            })
+            return
+        call_id = uuid.uuid4().hex
+        worker.inflight[call_id] = (client, message["id"])
+        worker.calls += 1
+        write_frame(worker.writer, {
+            "op": "call", "id": call_id, "did": message["did"], "payload": message.get("payload"),
+            "emergency_id": message.get("emergency_id"),
+        })
+
+    def _relay_result(self, worker: _WorkerConn, message: dict):
+        client_ref = worker.inflight.pop(message["id"], None)
+        if client_ref is None:
+            return
+        client, client_id = client_ref
+        if not client.is_closing():
+            write_frame(client, {**message, "id": client_id})
+
+    def _drop_worker(self, worker: _WorkerConn, reason: str):
+        if worker.dropped:
+            return
+        worker.dropped = True
+        for did in worker.dids:
+            replicas = self._replicas.get(did, [])
+            if worker in replicas:
+                replicas.remove(worker)
+            if not replicas:
+                self._replicas.pop(did, None)
+        for client, client_id in worker.inflight.values():
+            if not client.is_closing():
+                write_frame(client, {
+                    "op": "result", "id": client_id, "ok": False,
+                    "error": f"Worker {worker.worker_id} {reason}",
+                })
+        worker.inflight.clear()
+        print(f"⚠️  Worker {worker.worker_id} {reason}")
+
+    async def _reap_dead_workers(self):
+        while True:
+            await asyncio.sleep(self.worker_timeout_s / 2)
+            cutoff = time.monotonic() - self.worker_timeout_s
+            stale = {w for ws in self._replicas.values() for w in ws if w.last_seen < cutoff}
+            for worker in stale:
+                self._drop_worker(worker, "missed heartbeats")
+                worker.writer.close()
+
+    def stats(self) -> Dict[str, list]:
+        return {
+            did: [
+                {"worker": w.worker_id, "inflight": len(w.inflight), "calls": w.calls}
+                for w in replicas
+            ]
+            for did, replicas in self._replicas.items()
+        }
+
+
+# ---------------------------------------------------------------- worker
+
+class AgentWorker:
+    """Serves agent handlers to the broker; reconnects if the broker restarts."""
+
+    def __init__(self, socket_path: str, handlers: Dict[str, Callable[[dict], Any]], heartbeat_s: float):
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self.heartbeat_s = heartbeat_s
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+    async def run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            except (FileNotFoundError, ConnectionError):
+                await asyncio.sleep(1)
+                continue
+            await self._serve(reader, writer)
+            print("⚠️  Lost connection to Zynd bus broker, reconnecting")
+            await asyncio.sleep(1)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_frame(writer, {"op": "register", "worker": self.worker_id, "dids": list(self.handlers)})
+        await writer.drain()
+        print(f"🛰️  Worker {self.worker_id} serving {list(self.handlers)}")
+        heartbeat = asyncio.create_task(self._heartbeat(writer))
+        tasks = set()
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    return
+                if message.get("op") == "call":
+                    task = asyncio.create_task(self._execute(writer, message))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+        finally:
+            heartbeat.cancel()
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _heartbeat(self, writer: asyncio.StreamWriter):
+        while True:
+            await asyncio.sleep(self.heartbeat_s)
+            write_frame(writer, {"op": "heartbeat"})
+            await writer.drain()
+
+    async def _execute(self, writer: asyncio.StreamWriter, message: dict):
+        started_ns = time.monotonic_ns()
+        reply = {"op": "result", "id": message["id"]}
+        # A fresh context per call: the caller's memo (routes, address) stays
+        # in the API process, only the emergency id comes across.
+        context = EmergencyContext(emergency_id=message.get("emergency_id"))
+        try:
+            with use_context(context):
+                result = self.handlers[message["did"]](message.get("payload"))
+                if hasattr(result, "__await__"):
+                    result = await result
+            reply.update(ok=True, result=result)
+        except Exception as e:
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+        reply["exec_ns"] = time.monotonic_ns() - started_ns
+        if not writer.is_closing():
+            write_frame(writer, reply)
+            await writer.drain()
+
+
+# ---------------------------------------------------------------- client
+
+class BusClient:
+    """One multiplexed connection to the broker, opened on first use."""
+
+    def __init__(self, socket_path: str, call_timeout_s: float):
+        self.socket_path = socket_path
+        self.call_timeout_s = call_timeout_s
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                try:
+                    reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+                except (FileNotFoundError, ConnectionError) as e:
+                    raise BusError(f"Zynd bus broker unavailable at {self.socket_path}: {e}") from e
+                self._reader_task = asyncio.create_task(self._read_replies(reader))
+        return self._writer
+
+    async def _read_replies(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message is None:
+                    break
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        finally:
+            self._fail_pending("connection to broker lost")
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _fail_pending(self, reason: str):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(BusError(reason))
+
+    async def request(self, message: dict) -> dict:
+        writer = await self._connection()
+        message_id = str(next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        write_frame(writer, {**message, "id": message_id})
+        try:
+            await writer.drain()
+            return await asyncio.wait_for(future, self.call_timeout_s)
+        except asyncio.TimeoutError:
+            raise BusError(f"Bus call timed out after {self.call_timeout_s}s") from None
+        finally:
+            self._pending.pop(message_id, None)
+
+    async def call(self, did: str, payload: Any, emergency_id: Any = None) -> tuple:
+        """(result, worker execution ns); raises BusError on any failure."""
+        reply = await self.request({"op": "call", "did": did, "payload": payload, "emergency_id": emergency_id})
+        if not reply.get("ok"):
+            raise BusError(reply.get("error") or "Bus call failed")
+        return reply.get("result"), reply.get("exec_ns", 0)
+
+    async def stats(self) -> dict:
+        return (await self.request({"op": "stats"}))["replicas"]
+
+    def close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# ---------------------------------------------------------------- CLI
+
+def load_agent_handlers(names: List[str]) -> Dict[str, Callable[[dict], Any]]:
+    from src.zynd.mock_zynd import zynd_registry
+
+    handlers = {}
+    for name in names:
+        if name not in AGENT_MODULES:
+            raise SystemExit(f"Unknown agent {name!r}; choose from {sorted(AGENT_MODULES)}")
+        module_name, attr = AGENT_MODULES[name]
+        did = getattr(importlib.import_module(module_name), attr).did
+        handlers[did] = zynd_registry.handler_for(did)
+    return handlers
+
+
+async def _run_worker(names: List[str]):
+    from src.services.hospital_registry import hospital_registry
+    from src.services.maps_service import maps_service
+
+    handlers = load_agent_handlers(names)
+    await maps_service.startup()
+    await hospital_registry.start()
+    try:
+        await AgentWorker(settings.zynd_bus_socket, handlers, settings.zynd_bus_heartbeat_s).run()
+    finally:
+        await hospital_registry.stop()
+        await maps_service.shutdown()
+
+
+async def _print_stats():
+    client = BusClient(settings.zynd_bus_socket, settings.zynd_bus_call_timeout_s)
+    try:
+        print(json.dumps(await client.stats(), indent=2))
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Zynd agent bus")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("broker", help="run the broker")
+    worker = sub.add_parser("worker", help="serve agents to the broker")
+    worker.add_argument("--agents", required=True, help=f"comma-separated, from {sorted(AGENT_MODULES)}")
+    sub.add_parser("stats", help="print registered replicas")
+    args = parser.parse_args()
+
+    if args.command == "broker":
+        broker = Broker(settings.zynd_bus_socket, settings.zynd_bus_worker_timeout_s)
+        asyncio.run(broker.serve_forever())
+    elif args.command == "worker":
+        asyncio.run(_run_worker([name.strip() for name in args.agents.split(",") if name.strip()]))
+    else:
+        asyncio.run(_print_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class EmergencyContext:
+    """
+    Per-emergency scratchpad shared by every agent call for one emergency.
+
+    The orchestrator creates one and passes it to `zynd_registry.call`, which
+    makes it the current context while the handler runs. Services read it
+    through `current_context()` to reuse results already fetched for this
+    emergency (routes, address, triage) instead of calling out again.
+    """
+    emergency_id: Optional[Any] = None
+    triage: Optional[dict] = None
+    address: Optional[str] = None
+    routes: Dict[tuple, dict] = field(default_factory=dict)
+
+    def get_route(self, kind: str, start_coords: tuple, end_coords: tuple) -> Optional[dict]:
+        """
+        Memoized route for this origin/destination pair. A full "route" entry
+        also satisfies a "table" (distance/duration only) lookup.
+        """
+        key = (tuple(start_coords), tuple(end_coords))
+        route = self.routes.get(("route", *key))
+        if route is None and kind == "table":
+            route = self.routes.get(("table", *key))
+        return route
+
+    def remember_route(self, kind: str, start_coords: tuple, end_coords: tuple, route: dict):
+        self.routes[(kind, tuple(start_coords), tuple(end_coords))] = route
+
+
+_current_context: ContextVar[Optional[EmergencyContext]] = ContextVar(
+    "emergency_context", default=None
+)
+
+
+def current_context() -> Optional[EmergencyContext]:
+    return _current_context.get()
+
+
+@contextmanager
+def use_context(context: Optional[EmergencyContext]):
+    """Make `context` current for the enclosed block (no-op for None)."""
+    if context is None:
+        yield None
+        return
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
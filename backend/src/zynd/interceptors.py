@@ -0,0 +1,114 @@
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional
+
+from src.services.metrics import AGENT_CALLS, AGENT_LATENCY
+from src.zynd.context import EmergencyContext
+
+_AGENT_TYPE = re.compile(r"agent_([a-z]+)_")
+
+
+def agent_type_from_did(did: str) -> str:
+    """"did:zynd:agent_triage_abc123" -> "triage"."""
+    match = _AGENT_TYPE.search(did)
+    return match.group(1) if match else "unknown"
+
+
+@dataclass
+class AgentCall:
+    """One registry call as seen by the interceptor chain."""
+    did: str
+    payload: Any
+    context: Optional[EmergencyContext] = None
+    name: Optional[str] = None
+    action: str = "execute"
+
+
+@dataclass
+class AgentCallRecord:
+    """Structured outcome of one agent call, handed to every sink."""
+    did: str
+    agent_type: str
+    agent_name: Optional[str]
+    emergency_id: Any
+    action: str
+    input_data: Any
+    output_data: Any
+    processing_time_ms: float
+    success: bool
+    error_message: Optional[str] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+
+# interceptor(call, call_next) -> result; call_next(call) runs the rest of the chain
+CallNext = Callable[[AgentCall], Awaitable[Any]]
+Interceptor = Callable[[AgentCall, CallNext], Awaitable[Any]]
+
+
+class MetricsInterceptor:
+    """Per-DID latency histogram and outcome counter for /metrics."""
+
+    async def __call__(self, call: AgentCall, call_next: CallNext):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call_next(call)
+            outcome = "ok"
+            return result
+        finally:
+            AGENT_LATENCY.observe(time.perf_counter() - started, call.did)
+            AGENT_CALLS.inc(call.did, outcome)
+
+
+class TimingInterceptor:
+    """
+    Measures every agent call with a monotonic clock and reports an
+    AgentCallRecord to its sinks, success or failure. Exceptions from the
+    agent are re-raised unchanged; sink errors never reach the caller.
+
+    A sink is any object with `async def emit(record)`.
+    """
+
+    def __init__(self, sinks=()):
+        self.sinks: List[Any] = list(sinks)
+
+    def add_sink(self, sink):
+        if sink not in self.sinks:
+            self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    async def __call__(self, call: AgentCall, call_next: CallNext):
+        started = time.perf_counter_ns()
+        try:
+            result = await call_next(call)
+        except Exception as e:
+            await self._emit(call, started, None, e)
+            raise
+        await self._emit(call, started, result, None)
+        return result
+
+    async def _emit(self, call: AgentCall, started_ns: int, result, error: Optional[Exception]):
+        if not self.sinks:
+            return
+        record = AgentCallRecord(
+            did=call.did,
+            agent_type=agent_type_from_did(call.did),
+            agent_name=call.name,
+            emergency_id=call.context.emergency_id if call.context else None,
+            action=call.action,
+            input_data=call.payload,
+            output_data=result,
+            processing_time_ms=(time.perf_counter_ns() - started_ns) / 1e6,
+            success=error is None,
+            error_message=None if error is None else f"{type(error).__name__}: {error}",
+        )
+        for sink in self.sinks:
+            try:
+                await sink.emit(record)
+            except Exception as e:
+                print(f"Agent log sink {type(sink).__name__} failed: {e}")
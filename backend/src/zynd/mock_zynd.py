@@ -1,25 +1,105 @@
 # src/mock_zynd.py
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Optional
+
+from config import get_settings
+from src.zynd.context import EmergencyContext, use_context
+from src.zynd.interceptors import AgentCall, Interceptor, MetricsInterceptor, TimingInterceptor
+from src.zynd.transports import (
+    BusTransport,
+    InlineTransport,
+    ProcessTransport,
+    ThreadTransport,
+    Transport,
+)
+
+settings = get_settings()
 
 class MockZyndRegistry:
     """
     Minimal in-process stand‑in for Zynd Protocol.
     You can later swap this for the real Zynd SDK client.
+
+    Every call passes through the interceptor chain (outermost first)
+    before reaching the agent handler, which runs on the transport chosen
+    for its DID: "inline" (event loop), "thread", "process" or "bus"
+    (out-of-process workers behind the local broker in src/zynd/bus.py).
     """
-    def __init__(self):
+    def __init__(self, interceptors: Optional[List[Interceptor]] = None):
         self._agents: Dict[str, Callable[[dict], Any]] = {}
+        self._names: Dict[str, str] = {}
+        self._agent_transports: Dict[str, Transport] = {}
+        self.interceptors: List[Interceptor] = list(interceptors or [])
+        self.transports: Dict[str, Transport] = {
+            "inline": InlineTransport(),
+            "thread": ThreadTransport(settings.agent_thread_workers),
+            "process": ProcessTransport(settings.agent_process_workers),
+            "bus": BusTransport(settings.zynd_bus_socket, settings.zynd_bus_call_timeout_s),
+        }
 
-    def register_agent(self, did: str, handler: Callable[[dict], Any]):
+    def register_agent(
+        self,
+        did: str,
+        handler: Callable[[dict], Any],
+        name: Optional[str] = None,
+        transport: str = "inline",
+    ):
+        """`settings.agent_transports` ({did: transport}) overrides the code default."""
+        transport = settings.agent_transports.get(did, transport)
+        if transport not in self.transports:
+            raise ValueError(f"Unknown transport {transport!r} for {did}")
+        self.transports[transport].check_handler(handler)
         self._agents[did] = handler
+        self._agent_transports[did] = self.transports[transport]
+        if name:
+            self._names[did] = name
+
+    def handler_for(self, did: str) -> Callable[[dict], Any]:
+        return self._agents[did]
+
+    def transport_for(self, did: str) -> str:
+        return self._agent_transports[did].name
 
-    async def call(self, did: str, payload: dict):
+    def shutdown(self):
+        for transport in self.transports.values():
+            transport.shutdown()
+
+    def add_interceptor(self, interceptor: Interceptor):
+        self.interceptors.append(interceptor)
+
+    async def call(
+        self,
+        did: str,
+        payload: dict,
+        context: Optional[EmergencyContext] = None,
+        action: str = "execute",
+    ):
+        """
+        Invoke the agent registered under `did`. When a context is given it is
+        the current EmergencyContext for the duration of the handler.
+        `action` only labels the call for interceptors (e.g. agent_logs).
+        """
         if did not in self._agents:
             raise ValueError(f"Agent with DID {did} not registered")
-        handler = self._agents[did]
-        result = handler(payload)
-        if hasattr(result, "__await__"):
-            return await result
-        return result
+        agent_call = AgentCall(
+            did=did, payload=payload, context=context, name=self._names.get(did), action=action
+        )
+        with use_context(context):
+            return await self._dispatch(agent_call, 0)
+
+    async def _dispatch(self, agent_call: AgentCall, index: int):
+        if index == len(self.interceptors):
+            return await self._invoke(agent_call)
+        return await self.interceptors[index](
+            agent_call, lambda next_call: self._dispatch(next_call, index + 1)
+        )
+
+    async def _invoke(self, agent_call: AgentCall):
+        return await self._agent_transports[agent_call.did].invoke(
+            agent_call.did, self._agents[agent_call.did], agent_call.payload
+        )
+
 
+# Per-DID latency/outcome records; sinks (e.g. agent_logs) attach at startup
+timing_interceptor = TimingInterceptor()
 
-zynd_registry = MockZyndRegistry()
+zynd_registry = MockZyndRegistry(interceptors=[MetricsInterceptor(), timing_interceptor])
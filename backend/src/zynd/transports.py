@@ -0,0 +1,154 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.services.metrics import metrics
+from src.zynd.context import current_context
+
+TRANSPORT_QUEUE = metrics.histogram(
+    "agent_transport_queue_seconds",
+    "Time an agent call waited for a free worker in its transport",
+    ("transport", "did"),
+)
+TRANSPORT_EXEC = metrics.histogram(
+    "agent_transport_exec_seconds",
+    "Time an agent handler ran inside its transport",
+    ("transport", "did"),
+)
+
+
+def _timed_call(handler: Callable[[dict], Any], payload: Any, submitted_ns: int):
+    """
+    Runs inside the worker thread/process. CLOCK_MONOTONIC is system-wide,
+    so the parent's submit timestamp is comparable here.
+    """
+    started_ns = time.monotonic_ns()
+    result = handler(payload)
+    return result, started_ns - submitted_ns, time.monotonic_ns() - started_ns
+
+
+class Transport:
+    """Where an agent handler runs. Subclasses implement `_submit`."""
+    name = "base"
+
+    async def invoke(self, did: str, handler: Callable[[dict], Any], payload: Any):
+        result, queue_ns, exec_ns = await self._submit(handler, payload, time.monotonic_ns())
+        TRANSPORT_QUEUE.observe(queue_ns / 1e9, self.name, did)
+        TRANSPORT_EXEC.observe(exec_ns / 1e9, self.name, did)
+        return result
+
+    async def _submit(self, handler, payload, submitted_ns):
+        raise NotImplementedError
+
+    def check_handler(self, handler: Callable[[dict], Any]):
+        """Worker transports run plain functions; coroutines belong on the event loop."""
+        if asyncio.iscoroutinefunction(handler):
+            raise ValueError(f"{self.name} transport needs a synchronous handler")
+
+    def shutdown(self):
+        pass
+
+
+class InlineTransport(Transport):
+    """Runs on the event loop (default). Async handlers must use this transport."""
+    name = "inline"
+
+    def check_handler(self, handler):
+        pass
+
+    async def _submit(self, handler, payload, submitted_ns):
+        started_ns = time.monotonic_ns()
+        result = handler(payload)
+        if hasattr(result, "__await__"):
+            result = await result
+        return result, started_ns - submitted_ns, time.monotonic_ns() - started_ns
+
+
+class ThreadTransport(Transport):
+    """
+    Thread pool for blocking handlers (I/O-bound or C extensions that release
+    the GIL). The current EmergencyContext is carried into the thread.
+    """
+    name = "thread"
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _submit(self, handler, payload, submitted_ns):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="agent")
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, ctx.run, _timed_call, handler, payload, submitted_ns
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class ProcessTransport(Transport):
+    """
+    Process pool for CPU-bound handlers (rule scoring, NLP, ML models) so
+    they never hold the GIL the event loop needs. Handler, payload and
+    result cross the process boundary with pickle (highest protocol), so the
+    handler must be a module-level function or a method of a picklable
+    object. The EmergencyContext is not available in the worker.
+    """
+    name = "process"
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def _submit(self, handler, payload, submitted_ns):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, _timed_call, handler, payload, submitted_ns
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class BusTransport(Transport):
+    """
+    Calls go to out-of-process agent workers through the local Zynd bus
+    (src/zynd/bus.py); the locally registered handler is not used. Payloads
+    and results travel as JSON, so tuples arrive as lists and datetimes as
+    ISO strings. Queue time here includes the IPC round trip.
+
+    Like ProcessTransport, the EmergencyContext does not cross: only its
+    emergency_id is sent, and the worker runs the handler under a fresh
+    context with that id. Routes and the address memoized for the
+    emergency are not visible there, so a bus agent fetches its own.
+    """
+    name = "bus"
+
+    def __init__(self, socket_path: str, call_timeout_s: float):
+        from src.zynd.bus import BusClient
+
+        self.client = BusClient(socket_path, call_timeout_s)
+
+    def check_handler(self, handler):
+        pass
+
+    async def invoke(self, did: str, handler: Callable[[dict], Any], payload: Any):
+        submitted_ns = time.monotonic_ns()
+        context = current_context()
+        result, exec_ns = await self.client.call(
+            did, payload, emergency_id=context.emergency_id if context else None
+        )
+        TRANSPORT_QUEUE.observe(max(time.monotonic_ns() - submitted_ns - exec_ns, 0) / 1e9, self.name, did)
+        TRANSPORT_EXEC.observe(exec_ns / 1e9, self.name, did)
+        return result
+
+    def shutdown(self):
+        self.client.close()
@@ -0,0 +1,76 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from src.services.assignment_solver import greedy_assignment, min_cost_assignment, plan_assignments
+
+
+def brute_force(cost: np.ndarray, capacity) -> tuple:
+    """(most rows placed, least total cost among those) over every assignment."""
+    n_rows, n_cols = cost.shape
+    best = (0, 0.0)
+    for choice in itertools.product(range(-1, n_cols), repeat=n_rows):
+        load = np.zeros(n_cols, dtype=int)
+        total, placed = 0.0, 0
+        for i, j in enumerate(choice):
+            if j < 0:
+                continue
+            if not np.isfinite(cost[i, j]):
+                break
+            load[j] += 1
+            total += cost[i, j]
+            placed += 1
+        else:
+            if (load <= capacity).all() and (placed, -total) > (best[0], -best[1]):
+                best = (placed, total)
+    return best
+
+
+def evaluate(cost: np.ndarray, capacity, assigned: np.ndarray) -> tuple:
+    placed = assigned >= 0
+    assert (np.bincount(assigned[placed], minlength=cost.shape[1]) <= capacity).all()
+    assert np.isfinite(cost[np.flatnonzero(placed), assigned[placed]]).all()
+    return int(placed.sum()), float(cost[np.flatnonzero(placed), assigned[placed]].sum())
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_min_cost_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n_rows, n_cols = rng.randint(1, 5), rng.randint(1, 3)
+    cost = np.array([[rng.choice([rng.uniform(1, 30), rng.uniform(1, 30), np.inf])
+                      for _ in range(n_cols)] for _ in range(n_rows)])
+    capacity = np.array([rng.randint(0, 2) for _ in range(n_cols)])
+
+    placed, total = evaluate(cost, capacity, min_cost_assignment(cost, capacity))
+    best_placed, best_total = brute_force(cost, capacity)
+    assert placed == best_placed
+    assert total == pytest.approx(best_total)
+
+
+def test_min_cost_beats_greedy_when_order_matters():
+    # Greedy gives row 0 its nearest column, leaving row 1 the far one
+    cost = np.array([[1.0, 2.0], [1.0, 50.0]])
+    capacity = [1, 1]
+    assert list(greedy_assignment(cost, capacity)) == [0, 1]
+    assert list(min_cost_assignment(cost, capacity)) == [1, 0]
+
+
+def test_plan_respects_specialists_and_bed_pools():
+    hospitals = [
+        {"id": "a", "specialists": ["general_physician"], "icu_beds_available": 5, "emergency_beds_available": 5},
+        {"id": "b", "specialists": ["cardiologist"], "icu_beds_available": 1, "emergency_beds_available": 0},
+    ]
+    patients = [
+        {"severity": "RED", "recommended_specialists": ["cardiologist"]},
+        {"severity": "RED", "recommended_specialists": ["cardiologist"]},
+        {"severity": "YELLOW", "recommended_specialists": ["general_physician"]},
+        {"severity": "GREEN", "recommended_specialists": []},
+    ]
+    eta = np.array([[5.0, 9.0], [6.0, 8.0], [4.0, 1.0], [7.0, 2.0]])
+    plan = plan_assignments(patients, hospitals, eta)
+    # one cardiology ICU bed for two RED patients; GREEN needs no bed and goes to the nearest
+    assert sorted(plan.hospital_index[:2].tolist()) == [-1, 1]
+    assert plan.hospital_index[2:].tolist() == [0, 1]
+    assert plan.unassigned == 1
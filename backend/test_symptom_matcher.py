@@ -0,0 +1,99 @@
+import pytest
+
+from src.agents.symptom_matcher import SymptomLexicon, SymptomMatcher, symptom_code
+from src.agents.triage_rules import DEFAULT_LEXICON_PATH, DEFAULT_RULES_PATH, TriageRuleEngine
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SymptomMatcher.from_file(DEFAULT_LEXICON_PATH)
+
+
+def codes(matcher, text):
+    result = matcher.match(text)
+    return set(result.codes), set(result.negated)
+
+
+def test_symptom_code():
+    assert symptom_code("Chest-Pain") == symptom_code("chest pain") == "chest_pain"
+
+
+def test_synonyms_and_leftmost_longest(matcher):
+    assert codes(matcher, "Crushing chest pain, radiating") == ({"chest_pain"}, set())
+    # "stomach pain" beats the shorter "pain" inside it
+    assert codes(matcher, "stomach pain") == ({"abdominal_pain"}, set())
+    assert codes(matcher, "Chest-Pain") == ({"chest_pain"}, set())
+    assert codes(matcher, "moderate pain, sore knee") == ({"moderate_pain", "pain"}, set())
+
+
+def test_list_input_is_one_clause_per_item(matcher):
+    assert codes(matcher, ["chest_pain"]) == ({"chest_pain"}, set())
+    assert codes(matcher, ["no fever", "chest pain"]) == ({"chest_pain"}, {"fever"})
+    assert codes(matcher, None) == (set(), set())
+
+
+@pytest.mark.parametrize("text, present, absent", [
+    ("no chest pain", set(), {"chest_pain"}),
+    ("patient denies shortness of breath", set(), {"shortness_of_breath"}),
+    ("negative for fever", set(), {"fever"}),
+    # the window is five words
+    ("no problems until the ambulance arrived, then chest pain", {"chest_pain"}, set()),
+    ("no problems until the ambulance arrived then chest pain", {"chest_pain"}, set()),
+])
+def test_pre_triggers(matcher, text, present, absent):
+    assert codes(matcher, text) == (present, absent)
+
+
+@pytest.mark.parametrize("text, present, absent", [
+    ("fracture ruled out", set(), {"fracture"}),
+    ("chest pain denied", set(), {"chest_pain"}),
+    ("denied chest pain", set(), {"chest_pain"}),
+    ("seizure was absent", set(), {"seizure"}),
+])
+def test_post_triggers(matcher, text, present, absent):
+    assert codes(matcher, text) == (present, absent)
+
+
+@pytest.mark.parametrize("text, present, absent", [
+    ("no fever but chest pain", {"chest_pain"}, {"fever"}),
+    ("no fever. chest pain", {"chest_pain"}, {"fever"}),
+    ("no fever; chest pain", {"chest_pain"}, {"fever"}),
+    ("no fever, chest pain", {"chest_pain"}, {"fever"}),
+    ("no fever and vomiting", {"vomiting"}, {"fever"}),
+    ("no vomiting or chest pain", {"chest_pain"}, {"vomiting"}),
+    ("vomiting and chest pain ruled out", {"vomiting"}, {"chest_pain"}),
+])
+def test_scope_ends_at_breaks_and_terminators(matcher, text, present, absent):
+    assert codes(matcher, text) == (present, absent)
+
+
+@pytest.mark.parametrize("text, present", [
+    ("no idea what happened, chest pain", {"chest_pain"}),
+    ("no idea what happened chest pain", {"chest_pain"}),
+    ("no pulse, unresponsive", {"unconscious"}),
+    ("without warning collapsed, unconscious", {"unconscious"}),
+    ("he is not sure, chest pain", {"chest_pain"}),
+    ("he is not sure chest pain", {"chest_pain"}),
+    ("chest pain unlikely to be cardiac", {"chest_pain"}),
+])
+def test_pseudo_triggers_negate_nothing(matcher, text, present):
+    assert codes(matcher, text) == (present, set())
+
+
+def test_mentioned_both_ways_counts_as_present(matcher):
+    assert codes(matcher, "no fever yesterday. fever today") == ({"fever"}, set())
+
+
+def test_trigger_on_same_span_as_another_kind():
+    lexicon = SymptomLexicon.model_validate({
+        "negation": {"pre": ["denied"], "post": ["denied"]},
+        "symptoms": {"fever": ["fever"], "cough": ["cough"]},
+    })
+    result = SymptomMatcher(lexicon).match("cough denied fever")
+    assert result.codes == frozenset() and result.negated == {"cough", "fever"}
+
+
+def test_pseudo_negation_keeps_triage_red():
+    engine = TriageRuleEngine(DEFAULT_RULES_PATH, DEFAULT_LEXICON_PATH, reload_s=0)
+    result = engine.classify({"symptoms": "no idea what happened, chest pain", "age": 70})
+    assert result["severity"] == "RED"
@@ -0,0 +1,91 @@
+import textwrap
+
+import pytest
+
+from src.agents.triage_rules import (
+    DEFAULT_LEXICON_PATH,
+    DEFAULT_RULES_PATH,
+    TriageRuleEngine,
+    parse_age,
+    parse_vitals,
+)
+
+# Exercises vital predicates without putting clinical rules in the shipped file
+VITALS_RULES = textwrap.dedent("""
+    version: 7
+    default: {severity: GREEN, priority: 3, risk: Routine issue, specialists: [general_physician]}
+    rules:
+      - id: tachycardic_hypotensive
+        vitals:
+          - {vital: heart_rate, op: ">=", value: 130}
+          - {vital: systolic_bp, op: "<", value: 90}
+        severity: RED
+        priority: 1
+        risk: Shock
+        specialists: [emergency_physician]
+      - id: low_spo2_adult
+        min_age: 18
+        vitals:
+          - {vital: oxygen_level, op: "<", value: 92}
+        severity: YELLOW
+        priority: 2
+        risk: Low oxygen
+        specialists: [general_physician]
+""")
+
+
+@pytest.fixture
+def shipped():
+    return TriageRuleEngine(DEFAULT_RULES_PATH, DEFAULT_LEXICON_PATH, reload_s=0)
+
+
+@pytest.fixture
+def vitals_engine(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text(VITALS_RULES)
+    return TriageRuleEngine(str(path), DEFAULT_LEXICON_PATH, reload_s=0)
+
+
+@pytest.mark.parametrize("symptoms, age, vitals, severity, risk", [
+    (["chest_pain"], 65, {}, "RED", "CRITICAL - Possible cardiac event"),
+    (["chest_pain"], "60+", {}, "RED", "CRITICAL - Possible cardiac event"),
+    (["chest_pain"], 40, {}, "GREEN", "Routine issue"),
+    (["fracture"], 30, {}, "RED", "CRITICAL - Trauma"),
+    (["chest_pain", "fever"], 40, {}, "YELLOW", "Urgent but stable"),
+    (["moderate_pain"], 30, {}, "YELLOW", "Urgent but stable"),
+    ("moderate pain in the leg", 30, {}, "YELLOW", "Urgent but stable"),
+    # Pain without a stated intensity is recorded as `pain`, which no rule escalates
+    ("sore throat", 30, {}, "GREEN", "Routine issue"),
+    ("mild back pain", 30, {}, "GREEN", "Routine issue"),
+    ("knee hurts", 30, {}, "GREEN", "Routine issue"),
+    # The shipped file mirrors the old if/elif chain: vitals alone never escalate
+    ([], 70, {"oxygenLevel": 80, "heartRate": 150}, "GREEN", "Routine issue"),
+])
+def test_shipped_rules_match_legacy_chain(shipped, symptoms, age, vitals, severity, risk):
+    result = shipped.classify({"symptoms": symptoms, "age": age, "vitals": vitals})
+    assert (result["severity"], result["estimated_risk"]) == (severity, risk)
+
+
+def test_all_vital_conditions_must_hold(vitals_engine):
+    shock = {"heartRate": 140, "bloodPressure": "80/50"}
+    assert vitals_engine.classify({"age": 50, "vitals": shock})["estimated_risk"] == "Shock"
+    assert vitals_engine.classify({"age": 50, "vitals": {**shock, "bloodPressure": "120/80"}})["severity"] == "GREEN"
+    assert vitals_engine.rules.version == 7
+
+
+def test_missing_vital_fails_condition(vitals_engine):
+    assert vitals_engine.classify({"age": 50, "vitals": {"heartRate": 140}})["severity"] == "GREEN"
+    assert vitals_engine.classify({"age": 50, "vitals": {}})["severity"] == "GREEN"
+
+
+def test_vital_rule_respects_age_bounds(vitals_engine):
+    assert vitals_engine.classify({"age": 30, "vitals": {"spo2": 88}})["severity"] == "YELLOW"
+    assert vitals_engine.classify({"age": 10, "vitals": {"spo2": 88}})["severity"] == "GREEN"
+    assert vitals_engine.classify({"age": None, "vitals": {"spo2": 88}})["severity"] == "GREEN"
+
+
+def test_parse_age_and_vitals():
+    assert [parse_age(a) for a in (65, "40-45", "60+", "", None)] == [65, 40, 60, None, None]
+    assert parse_vitals({"heartRate": "110", "bp": "140/90", "oxygenLevel": None, "junk": 1}) == {
+        "heart_rate": 110.0, "systolic_bp": 140.0, "diastolic_bp": 90.0,
+    }
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from src.api.websocket import WebSocketHub
+
+
+class FakeSocket:
+    """Records sent texts; a stalled socket never finishes a send."""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(text)
+
+    async def close(self, code: int):
+        self.closed = code
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def connect(hub: WebSocketHub, socket: FakeSocket):
+    return await hub.connect(socket, "t", channel="dispatcher")
+
+
+def test_burst_below_hard_limit_is_queued_in_full():
+    async def scenario():
+        hub = WebSocketHub(max_queue=10, send_timeout_s=60, hard_limit=100)
+        fast, stalled = FakeSocket(), FakeSocket(stalled=True)
+        await connect(hub, fast)
+        slow = await connect(hub, stalled)
+        for n in range(90):
+            hub.publish("t", {"n": n})
+        await asyncio.sleep(0.01)
+        assert len(fast.sent) == 90
+        # the first message is stuck in send_text, the rest wait in the queue
+        assert len(slow.pending) == 89 and stalled.closed is None
+        await hub.shutdown()
+
+    run(scenario())
+
+
+def test_hard_limit_evicts_however_fresh():
+    async def scenario():
+        hub = WebSocketHub(max_queue=10, send_timeout_s=60, hard_limit=50)
+        fast, stalled = FakeSocket(), FakeSocket(stalled=True)
+        await connect(hub, fast)
+        await connect(hub, stalled)
+        # Published over time: the fast client keeps up, the stalled one piles up
+        for n in range(60):
+            hub.publish("t", {"n": n})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        assert stalled.closed == 1013
+        assert hub.stats()["connections"] == 1
+        assert len(fast.sent) == 60 and fast.closed is None
+        await hub.shutdown()
+
+    run(scenario())
+
+
+def test_hard_limit_drop_oldest_trims_to_cap():
+    async def scenario():
+        hub = WebSocketHub(max_queue=10, send_timeout_s=60, slow_consumer="drop_oldest", hard_limit=50)
+        stalled = FakeSocket(stalled=True)
+        slow = await connect(hub, stalled)
+        hub.publish("t", {"n": 0})
+        await asyncio.sleep(0)
+        for n in range(1, 80):
+            hub.publish("t", {"n": n})
+        assert len(slow.pending) == 50 and slow.dropped == 29
+        assert slow.pending[0][1] == hub.encode({"n": 30})
+        assert stalled.closed is None
+        await hub.shutdown()
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("policy", ["evict", "drop_oldest"])
+def test_soft_limit_applies_once_oldest_is_stale(policy):
+    async def scenario():
+        hub = WebSocketHub(max_queue=10, send_timeout_s=0.05, slow_consumer=policy, hard_limit=1000)
+        socket = FakeSocket()
+        slow = await connect(hub, socket)
+        # Nothing drains the queue, so only its size and age decide
+        slow.sender.cancel()
+        for n in range(20):
+            hub.publish("t", {"n": n})
+        assert len(slow.pending) == 20                # a fresh burst past max_queue is kept
+        await asyncio.sleep(0.06)
+        hub.publish("t", {"n": 20})
+        if policy == "evict":
+            await asyncio.sleep(0)
+            assert socket.closed == 1013 and hub.stats()["connections"] == 0
+        else:
+            assert len(slow.pending) == 20 and slow.dropped == 1
+            assert slow.pending[-1][1] == hub.encode({"n": 20})
+        await hub.shutdown()
+
+    run(scenario())
+
+
+def test_hard_limit_defaults_to_ten_times_max_queue():
+    assert WebSocketHub(max_queue=10, send_timeout_s=1).hard_limit == 100
+    assert WebSocketHub(max_queue=10, send_timeout_s=1, hard_limit=5).hard_limit == 10
+    with pytest.raises(ValueError):
+        WebSocketHub(max_queue=10, send_timeout_s=1, slow_consumer="block")